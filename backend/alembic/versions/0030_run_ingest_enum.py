@@ -0,0 +1,21 @@
+"""
+Add fused ingest run type
+
+Revision ID: 0030_run_ingest_enum
+Revises: 0029_underwriting_tables
+Create Date: 2025-01-01 00:00:30
+"""
+from alembic import op
+
+revision = "0030_run_ingest_enum"
+down_revision = "0029_underwriting_tables"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("ALTER TYPE runtype ADD VALUE IF NOT EXISTS 'INGEST'")
+
+
+def downgrade():
+    pass
@@ -0,0 +1,35 @@
+"""
+Add resumable upload session state to exposure_upload
+
+Revision ID: 0031_upload_sessions
+Revises: 0030_run_ingest_enum
+Create Date: 2025-01-01 00:00:31
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0031_upload_sessions"
+down_revision = "0030_run_ingest_enum"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "exposure_upload",
+        sa.Column("status", sa.String(), nullable=False, server_default="COMPLETE"),
+    )
+    op.add_column("exposure_upload", sa.Column("multipart_upload_id", sa.String(), nullable=True))
+    op.add_column("exposure_upload", sa.Column("part_size", sa.Integer(), nullable=True))
+    op.add_column("exposure_upload", sa.Column("parts_json", sa.JSON(), nullable=True))
+    op.add_column("exposure_upload", sa.Column("size_bytes", sa.BigInteger(), nullable=True))
+    op.alter_column("exposure_upload", "checksum", existing_type=sa.String(), nullable=True)
+
+
+def downgrade():
+    op.alter_column("exposure_upload", "checksum", existing_type=sa.String(), nullable=False)
+    op.drop_column("exposure_upload", "size_bytes")
+    op.drop_column("exposure_upload", "parts_json")
+    op.drop_column("exposure_upload", "part_size")
+    op.drop_column("exposure_upload", "multipart_upload_id")
+    op.drop_column("exposure_upload", "status")
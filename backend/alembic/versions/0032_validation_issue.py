@@ -0,0 +1,45 @@
+"""
+Add pageable validation_issue table
+
+Revision ID: 0032_validation_issue
+Revises: 0031_upload_sessions
+Create Date: 2025-01-01 00:00:32
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0032_validation_issue"
+down_revision = "0031_upload_sessions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("validation_result", sa.Column("issue_count", sa.Integer(), nullable=True))
+    op.create_table(
+        "validation_issue",
+        sa.Column(
+            "validation_result_id",
+            sa.Integer(),
+            sa.ForeignKey("validation_result.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("seq", sa.BigInteger(), primary_key=True),
+        sa.Column("tenant_id", sa.String(), sa.ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("row_number", sa.Integer(), nullable=False),
+        sa.Column("severity", sa.String(), nullable=False),
+        sa.Column("field", sa.String(), nullable=False),
+        sa.Column("code", sa.String(), nullable=False),
+        sa.Column("message", sa.String(), nullable=False),
+    )
+    op.create_index(
+        "ix_validation_issue_severity", "validation_issue", ["validation_result_id", "severity", "seq"]
+    )
+    op.create_index("ix_validation_issue_code", "validation_issue", ["validation_result_id", "code", "seq"])
+
+
+def downgrade():
+    op.drop_index("ix_validation_issue_code", table_name="validation_issue")
+    op.drop_index("ix_validation_issue_severity", table_name="validation_issue")
+    op.drop_table("validation_issue")
+    op.drop_column("validation_result", "issue_count")
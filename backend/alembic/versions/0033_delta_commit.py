@@ -0,0 +1,40 @@
+"""
+Add copy-on-write lineage columns for delta commits
+
+Revision ID: 0033_delta_commit
+Revises: 0032_validation_issue
+Create Date: 2025-01-01 00:00:33
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0033_delta_commit"
+down_revision = "0032_validation_issue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "exposure_version",
+        sa.Column(
+            "base_exposure_version_id",
+            sa.Integer(),
+            sa.ForeignKey("exposure_version.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+    op.add_column("location", sa.Column("row_hash", sa.String(), nullable=True))
+    op.add_column(
+        "location",
+        sa.Column("source_location_id", sa.Integer(), sa.ForeignKey("location.id", ondelete="SET NULL"), nullable=True),
+    )
+    # Deleting a base version nulls source_location_id in derived versions; index the FK for that.
+    op.create_index("ix_location_source_location", "location", ["source_location_id"])
+
+
+def downgrade():
+    op.drop_index("ix_location_source_location", table_name="location")
+    op.drop_column("location", "source_location_id")
+    op.drop_column("location", "row_hash")
+    op.drop_column("exposure_version", "base_exposure_version_id")
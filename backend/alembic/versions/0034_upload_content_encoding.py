@@ -0,0 +1,22 @@
+"""
+Record the content encoding of compressed uploads
+
+Revision ID: 0034_upload_content_encoding
+Revises: 0033_delta_commit
+Create Date: 2025-01-01 00:00:34
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0034_upload_content_encoding"
+down_revision = "0033_delta_commit"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("exposure_upload", sa.Column("content_encoding", sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("exposure_upload", "content_encoding")
@@ -0,0 +1,50 @@
+"""
+Add content-addressed dedup keys for uploads, validations and exposure versions
+
+Revision ID: 0035_content_dedup
+Revises: 0034_upload_content_encoding
+Create Date: 2025-01-01 00:00:35
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0035_content_dedup"
+down_revision = "0034_upload_content_encoding"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "exposure_upload",
+        sa.Column(
+            "duplicate_of_upload_id",
+            sa.String(),
+            sa.ForeignKey("exposure_upload.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_upload_tenant_checksum", "exposure_upload", ["tenant_id", "checksum"])
+    op.add_column("validation_result", sa.Column("content_key", sa.String(), nullable=True))
+    op.add_column(
+        "validation_result",
+        sa.Column(
+            "source_validation_result_id",
+            sa.Integer(),
+            sa.ForeignKey("validation_result.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_validation_tenant_content_key", "validation_result", ["tenant_id", "content_key"])
+    op.add_column("exposure_version", sa.Column("content_key", sa.String(), nullable=True))
+    op.create_index("ix_exposure_version_tenant_content_key", "exposure_version", ["tenant_id", "content_key"])
+
+
+def downgrade():
+    op.drop_index("ix_exposure_version_tenant_content_key", table_name="exposure_version")
+    op.drop_column("exposure_version", "content_key")
+    op.drop_index("ix_validation_tenant_content_key", table_name="validation_result")
+    op.drop_column("validation_result", "source_validation_result_id")
+    op.drop_column("validation_result", "content_key")
+    op.drop_index("ix_upload_tenant_checksum", table_name="exposure_upload")
+    op.drop_column("exposure_upload", "duplicate_of_upload_id")
@@ -0,0 +1,33 @@
+"""
+Add tenant-scoped geocode cache
+
+Revision ID: 0036_geocode_cache
+Revises: 0035_content_dedup
+Create Date: 2025-01-01 00:00:36
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0036_geocode_cache"
+down_revision = "0035_content_dedup"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "geocode_cache",
+        sa.Column("tenant_id", sa.String(), sa.ForeignKey("tenant.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("provider", sa.String(), primary_key=True),
+        sa.Column("provider_version", sa.String(), primary_key=True),
+        sa.Column("address_fingerprint", sa.String(), primary_key=True),
+        sa.Column("result_json", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_geocode_cache_expires", "geocode_cache", ["expires_at"])
+
+
+def downgrade():
+    op.drop_index("ix_geocode_cache_expires", table_name="geocode_cache")
+    op.drop_table("geocode_cache")
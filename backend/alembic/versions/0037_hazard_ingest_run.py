@@ -0,0 +1,28 @@
+"""
+Add hazard ingest run type and hazard version feature count
+
+Revision ID: 0037_hazard_ingest_run
+Revises: 0036_geocode_cache
+Create Date: 2025-01-01 00:00:37
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0037_hazard_ingest_run"
+down_revision = "0036_geocode_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("ALTER TYPE runtype ADD VALUE IF NOT EXISTS 'HAZARD_INGEST'")
+    op.add_column("hazard_dataset_version", sa.Column("feature_count", sa.Integer(), nullable=True))
+    # Versions loaded synchronously before this revision are complete; NULL now means "still ingesting".
+    op.execute(
+        "UPDATE hazard_dataset_version AS v SET feature_count = "
+        "(SELECT count(*) FROM hazard_feature_polygon AS f WHERE f.hazard_dataset_version_id = v.id)"
+    )
+
+
+def downgrade():
+    op.drop_column("hazard_dataset_version", "feature_count")
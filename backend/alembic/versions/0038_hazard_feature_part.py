@@ -0,0 +1,49 @@
+"""
+Add subdivided hazard feature parts for point lookups
+
+Revision ID: 0038_hazard_feature_part
+Revises: 0037_hazard_ingest_run
+Create Date: 2025-01-01 00:00:38
+"""
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geometry
+
+revision = "0038_hazard_feature_part"
+down_revision = "0037_hazard_ingest_run"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "hazard_feature_part",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("tenant_id", sa.String(), nullable=False),
+        sa.Column("hazard_dataset_version_id", sa.Integer(), nullable=False),
+        sa.Column("hazard_feature_polygon_id", sa.Integer(), nullable=False),
+        sa.Column("geom", Geometry("GEOMETRY", srid=4326, spatial_index=False), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenant.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["hazard_dataset_version_id"], ["hazard_dataset_version.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["hazard_feature_polygon_id"], ["hazard_feature_polygon.id"], ondelete="CASCADE"),
+    )
+    # Existing versions are split with the default vertex cap so lookups keep finding their features.
+    op.execute(
+        "INSERT INTO hazard_feature_part (tenant_id, hazard_dataset_version_id, hazard_feature_polygon_id, geom) "
+        "SELECT tenant_id, hazard_dataset_version_id, id, ST_Subdivide(geom, 256) "
+        "FROM hazard_feature_polygon WHERE geom IS NOT NULL"
+    )
+    op.create_index("ix_hazard_feature_part_geom_gist", "hazard_feature_part", ["geom"], postgresql_using="gist")
+    op.create_index(
+        "ix_hazard_feature_part_tenant_version",
+        "hazard_feature_part",
+        ["tenant_id", "hazard_dataset_version_id"],
+    )
+    op.create_index("ix_hazard_feature_part_feature", "hazard_feature_part", ["hazard_feature_polygon_id"])
+
+
+def downgrade():
+    op.drop_index("ix_hazard_feature_part_feature", table_name="hazard_feature_part")
+    op.drop_index("ix_hazard_feature_part_tenant_version", table_name="hazard_feature_part")
+    op.drop_index("ix_hazard_feature_part_geom_gist", table_name="hazard_feature_part")
+    op.drop_table("hazard_feature_part")
@@ -0,0 +1,27 @@
+"""
+Add raster hazard datasets
+
+Revision ID: 0039_hazard_raster
+Revises: 0038_hazard_feature_part
+Create Date: 2025-01-01 00:00:39
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0039_hazard_raster"
+down_revision = "0038_hazard_feature_part"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "hazard_dataset",
+        sa.Column("data_format", sa.String(), nullable=False, server_default="vector"),
+    )
+    op.add_column("hazard_dataset_version", sa.Column("raster_json", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("hazard_dataset_version", "raster_json")
+    op.drop_column("hazard_dataset", "data_format")
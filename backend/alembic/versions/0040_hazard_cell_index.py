@@ -0,0 +1,34 @@
+"""
+Add per-version hazard grid cell lookup index
+
+Revision ID: 0040_hazard_cell_index
+Revises: 0039_hazard_raster
+Create Date: 2025-01-01 00:00:40
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0040_hazard_cell_index"
+down_revision = "0039_hazard_raster"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("hazard_dataset_version", sa.Column("cell_index_zoom", sa.Integer(), nullable=True))
+    op.create_table(
+        "hazard_cell_index",
+        sa.Column("hazard_dataset_version_id", sa.Integer(), primary_key=True),
+        sa.Column("cell_x", sa.Integer(), primary_key=True),
+        sa.Column("cell_y", sa.Integer(), primary_key=True),
+        sa.Column("tenant_id", sa.String(), nullable=False),
+        sa.Column("covered_feature_ids_json", sa.JSON(), nullable=False),
+        sa.Column("boundary_feature_ids_json", sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenant.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["hazard_dataset_version_id"], ["hazard_dataset_version.id"], ondelete="CASCADE"),
+    )
+
+
+def downgrade():
+    op.drop_table("hazard_cell_index")
+    op.drop_column("hazard_dataset_version", "cell_index_zoom")
@@ -0,0 +1,83 @@
+"""
+Promote hazard feature peril, score, band and percentile to typed columns
+
+Revision ID: 0041_hazard_feature_columns
+Revises: 0040_hazard_cell_index
+Create Date: 2025-01-01 00:00:41
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0041_hazard_feature_columns"
+down_revision = "0040_hazard_cell_index"
+branch_labels = None
+depends_on = None
+
+_NUMBER = r"'^\s*[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?\s*$'"
+
+
+def _key(name: str) -> str:
+    return f"(f.properties_json -> '{name}')"
+
+
+def _text(value: str) -> str:
+    return f"({value} #>> '{{}}')"
+
+
+def _first_present(first: str, second: str) -> str:
+    # props.get(first) if it is not None else props.get(second)
+    return f"(CASE WHEN COALESCE(json_typeof({first}), 'null') <> 'null' THEN {first} ELSE {second} END)"
+
+
+def _truthy(value: str) -> str:
+    return (
+        f"CASE json_typeof({value}) "
+        f"WHEN 'string' THEN {_text(value)} <> '' "
+        f"WHEN 'number' THEN {_text(value)}::double precision <> 0 "
+        f"WHEN 'boolean' THEN {_text(value)}::boolean "
+        f"WHEN 'array' THEN json_array_length({value}) > 0 "
+        f"WHEN 'object' THEN EXISTS (SELECT 1 FROM json_object_keys({value})) "
+        f"ELSE false END"
+    )
+
+
+def _float(value: str) -> str:
+    # coerce_float: numbers and numeric strings convert, booleans become 0/1, anything else is NULL.
+    return (
+        f"CASE json_typeof({value}) "
+        f"WHEN 'number' THEN {_text(value)}::double precision "
+        f"WHEN 'boolean' THEN {_text(value)}::boolean::int::double precision "
+        f"WHEN 'string' THEN CASE WHEN {_text(value)} ~ {_NUMBER} THEN {_text(value)}::double precision END "
+        f"END"
+    )
+
+
+def upgrade():
+    op.add_column("hazard_feature_polygon", sa.Column("peril", sa.String(), nullable=True))
+    op.add_column("hazard_feature_polygon", sa.Column("score", sa.Float(), nullable=True))
+    op.add_column("hazard_feature_polygon", sa.Column("band", sa.String(), nullable=True))
+    op.add_column("hazard_feature_polygon", sa.Column("percentile", sa.Float(), nullable=True))
+    # Mirrors hazard_query.hazard_columns for features ingested before the columns existed.
+    band = f"(CASE WHEN {_truthy(_key('band'))} THEN {_key('band')} ELSE {_key('Band')} END)"
+    op.execute(
+        "UPDATE hazard_feature_polygon AS f SET "
+        "peril = NULLIF(lower(btrim(COALESCE(f.properties_json ->> 'hazard_category', d.peril), E' \\t\\r\\n')), ''), "
+        f"score = {_float(_first_present(_key('score'), _key('Score')))}, "
+        f"band = CASE WHEN {_truthy(band)} THEN {_text(band)} END, "
+        f"percentile = {_float(_key('percentile'))} "
+        "FROM hazard_dataset_version AS v JOIN hazard_dataset AS d ON d.id = v.hazard_dataset_id "
+        "WHERE v.id = f.hazard_dataset_version_id"
+    )
+    op.create_index(
+        "ix_hazard_feature_polygon_version_peril_score",
+        "hazard_feature_polygon",
+        ["hazard_dataset_version_id", "peril", "score"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_hazard_feature_polygon_version_peril_score", table_name="hazard_feature_polygon")
+    op.drop_column("hazard_feature_polygon", "percentile")
+    op.drop_column("hazard_feature_polygon", "band")
+    op.drop_column("hazard_feature_polygon", "score")
+    op.drop_column("hazard_feature_polygon", "peril")
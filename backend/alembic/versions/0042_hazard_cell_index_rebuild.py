@@ -0,0 +1,25 @@
+"""
+Drop hazard cell indexes built with boundary-inclusive covered cells
+
+Revision ID: 0042_hazard_cell_index_rebuild
+Revises: 0041_hazard_feature_columns
+Create Date: 2025-01-01 00:00:42
+"""
+from alembic import op
+
+revision = "0042_hazard_cell_index_rebuild"
+down_revision = "0041_hazard_feature_columns"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Cells marked covered with ST_Covers can include points on a feature's edge. Without an index,
+    # versions fall back to the exact check until their ingest run is retried.
+    op.execute("DELETE FROM hazard_cell_index")
+    op.execute("UPDATE hazard_dataset_version SET cell_index_zoom = NULL WHERE cell_index_zoom IS NOT NULL")
+
+
+def downgrade():
+    # Dropped indexes are rebuilt by retrying ingest; nothing to restore.
+    pass
@@ -5,12 +5,13 @@ import base64
 import time
 import hashlib
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import BaseModel
 
 import jwt
-from fastapi import APIRouter, Body, Depends, File, HTTPException, UploadFile, status, Header
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Request, UploadFile, status, Header
 from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy import case, func, select, or_, and_, Float
 from sqlalchemy.orm import Session
 
@@ -21,8 +22,10 @@ from app.db import get_db
 from app.jobs.celery_app import celery_app
 from app.jobs.celery_app import commit_upload as commit_task
 from app.jobs.celery_app import validate_upload as validate_task
+from app.jobs.celery_app import ingest_upload as ingest_task
 from app.jobs.celery_app import geocode_and_score as geocode_task
 from app.jobs.celery_app import drift_compare as drift_task
+from app.jobs.celery_app import ingest_hazard_version as hazard_ingest_task
 from app.models import (
     AuditEvent,
     DriftDetail,
@@ -30,6 +33,7 @@ from app.models import (
     ExposureUpload,
     ExposureVersion,
     Location,
+    GeocodeCacheEntry,
     MappingTemplate,
     Run,
     RunStatus,
@@ -37,10 +41,10 @@ from app.models import (
     Tenant,
     User,
     UserRole,
+    ValidationIssue,
     ValidationResult,
     HazardDataset,
     HazardDatasetVersion,
-    HazardFeaturePolygon,
     HazardOverlayResult,
     LocationHazardAttribute,
     RollupConfig,
@@ -59,9 +63,22 @@ from app.models import (
     PolicyPack,
     PolicyPackVersion,
 )
-from app.services.geocode import geocode_address
+from app.services.geocode_cache import cached_forward_geocode, get_geocode_cache
+from app.services.providers.base import ProviderError
+from app.services.providers.circuit_breaker import circuit_breaker_snapshots
 from app.services.geoapify import geoapify_autocomplete
-from app.services.hazard_query import extract_hazard_entry, merge_worst_in_peril
+from app.services.hazard_lookup import lookup_feature_ids, worst_hazard_entries
+from app.services.hazard_query import merge_worst_in_peril
+from app.services.hazard_raster import (
+    DATA_FORMAT_RASTER,
+    DATA_FORMAT_VECTOR,
+    DATA_FORMATS,
+    RASTER_WARM_RETRY_SECONDS,
+    load_cached_hazard_rasters,
+    parse_transform,
+    sample_hazard_entries,
+    warm_hazard_raster_in_background,
+)
 from app.services.lineage import build_lineage
 from app.services.pagination import resolve_keyset_pagination
 from app.services.quality_metrics import compute_bucket_percentages
@@ -84,7 +101,40 @@ from app.services.property_enrichment import (
 )
 from app.services.underwriting_decision import evaluate_underwriting_decision
 from app.services.uw_decision import prepare_decision_payload
-from app.storage.s3 import compute_checksum, put_object, get_object
+from app.services.content_dedup import content_key, reuse_refs
+from app.services.compression import MAGIC_BYTES, declared_encoding, sniff_encoding
+from app.services.validation_issues import filter_issues, issue_payload, iter_issue_artifact
+from app.services.upload_sessions import (
+    MAX_PART_NUMBER,
+    MIN_PART_BYTES,
+    UPLOAD_STATUS_ABORTED,
+    UPLOAD_STATUS_COMPLETE,
+    UPLOAD_STATUS_FINALIZING,
+    UPLOAD_STATUS_UPLOADING,
+    UploadSessionError,
+    completion_parts,
+    expected_total_parts,
+    missing_parts,
+    parts_checksum,
+    received_parts,
+    received_ranges,
+    record_part,
+    validate_part,
+)
+from app.storage.s3 import (
+    abort_multipart_upload,
+    complete_multipart_upload,
+    compute_checksum,
+    create_multipart_upload,
+    delete_object,
+    iter_object_chunks,
+    key_from_uri,
+    object_checksum,
+    object_uri,
+    read_object_head,
+    upload_part,
+    upload_stream,
+)
 from app.jobs.celery_app import overlay_hazard as overlay_task
 from app.jobs.celery_app import rollup_execute as rollup_task
 from app.jobs.celery_app import breach_evaluate as breach_task
@@ -248,6 +298,7 @@ class HazardDatasetCreate(BaseModel):
     vendor: Optional[str] = None
     coverage_geo: Optional[str] = None
     license_ref: Optional[str] = None
+    data_format: str = DATA_FORMAT_VECTOR
 
 
 class HazardOverlayRequest(BaseModel):
@@ -380,6 +431,22 @@ class ExceptionUpdate(BaseModel):
 
 class CommitRequest(BaseModel):
     name: Optional[str] = None
+    base_exposure_version_id: Optional[int] = None
+    reuse_existing: bool = False
+
+
+class IngestRequest(BaseModel):
+    name: Optional[str] = None
+    require_clean: bool = True
+    base_exposure_version_id: Optional[int] = None
+
+
+class UploadSessionRequest(BaseModel):
+    filename: str
+    content_type: Optional[str] = None
+    content_encoding: Optional[str] = None
+    part_size: Optional[int] = None
+    total_size: Optional[int] = None
 
 
 @router.post("/auth/login")
@@ -428,11 +495,14 @@ def create_upload(
     if existing:
         return {"upload_id": existing.id, "object_uri": existing.object_uri}
 
-    content = file.file.read()
-    checksum = compute_checksum(content)
     upload_id = str(uuid.uuid4())
     key = f"uploads/{user.tenant_id}/{upload_id}/{file.filename}"
-    uri = put_object(key, content, content_type=file.content_type or "text/csv")
+    # Compressed files are stored as sent and decompressed as a stream by validate/commit.
+    content_encoding = declared_encoding(file.headers.get("content-encoding"), file.content_type)
+    if not content_encoding:
+        content_encoding = sniff_encoding(file.file.read(MAGIC_BYTES))
+        file.file.seek(0)
+    uri, checksum, size = upload_stream(key, file.file, content_type=file.content_type or "text/csv")
     upload = ExposureUpload(
         id=upload_id,
         tenant_id=user.tenant_id,
@@ -441,11 +511,250 @@ def create_upload(
         checksum=checksum,
         idempotency_key=idempotency_key,
         created_by=user.user_id,
+        size_bytes=size,
+        content_encoding=content_encoding,
     )
+    duplicate_key = _dedupe_upload_object(db, upload)
     db.add(upload)
     db.commit()
+    if duplicate_key:
+        delete_object(duplicate_key)
     emit_audit(db, user.tenant_id, user.user_id, "upload_created", {"upload_id": upload_id})
-    return {"upload_id": upload_id, "object_uri": uri}
+    return {
+        "upload_id": upload_id,
+        "object_uri": upload.object_uri,
+        "content_encoding": upload.content_encoding,
+        "duplicate_of_upload_id": upload.duplicate_of_upload_id,
+    }
+
+
+def _dedupe_upload_object(db: Session, upload: ExposureUpload) -> Optional[str]:
+    # Identical bytes already stored for this tenant: point at the original object. The caller deletes
+    # the returned copy only after committing, so a failed commit never loses the upload's bytes.
+    if not upload.checksum:
+        return None
+    original = db.execute(
+        select(ExposureUpload)
+        .where(
+            ExposureUpload.tenant_id == upload.tenant_id,
+            ExposureUpload.checksum == upload.checksum,
+            ExposureUpload.status == UPLOAD_STATUS_COMPLETE,
+            ExposureUpload.duplicate_of_upload_id.is_(None),
+            ExposureUpload.id != upload.id,
+        )
+        .order_by(ExposureUpload.created_at.asc())
+        .limit(1)
+    ).scalar_one_or_none()
+    if not original or original.object_uri == upload.object_uri:
+        return None
+    duplicate_key = key_from_uri(upload.object_uri)
+    upload.object_uri = original.object_uri
+    upload.content_encoding = original.content_encoding
+    upload.duplicate_of_upload_id = original.id
+    return duplicate_key
+
+
+def _get_upload_session(db: Session, upload_id: str, tenant_id: str, for_update: bool = False) -> ExposureUpload:
+    stmt = select(ExposureUpload).where(ExposureUpload.id == upload_id)
+    if for_update:
+        stmt = stmt.with_for_update()
+    upload = db.execute(stmt).scalar_one_or_none()
+    if not upload or upload.tenant_id != tenant_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    if not upload.multipart_upload_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload is not a resumable session")
+    return upload
+
+
+def _upload_session_payload(upload: ExposureUpload) -> Dict[str, Any]:
+    part_size = upload.part_size or settings.s3_part_size_bytes
+    assembled = upload.status in (UPLOAD_STATUS_COMPLETE, UPLOAD_STATUS_FINALIZING)
+    total_parts = None if assembled else expected_total_parts(upload.size_bytes, part_size)
+    return {
+        "upload_id": upload.id,
+        "status": upload.status,
+        "object_uri": upload.object_uri,
+        "checksum": upload.checksum,
+        "part_size": part_size,
+        "size_bytes": upload.size_bytes,
+        "content_encoding": upload.content_encoding,
+        "duplicate_of_upload_id": upload.duplicate_of_upload_id,
+        "parts": received_parts(upload.parts_json),
+        "parts_checksum": parts_checksum(upload.parts_json) if upload.parts_json else None,
+        "received_ranges": [list(r) for r in received_ranges(upload.parts_json, part_size)],
+        "missing_parts": missing_parts(upload.parts_json, total_parts),
+    }
+
+
+@router.post("/uploads/sessions")
+def create_upload_session(
+    payload: UploadSessionRequest,
+    user: TokenData = Depends(require_role(UserRole.ADMIN.value, UserRole.OPS.value)),
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+) -> Dict[str, Any]:
+    if idempotency_key:
+        existing = db.execute(
+            select(ExposureUpload).where(
+                ExposureUpload.tenant_id == user.tenant_id,
+                ExposureUpload.idempotency_key == idempotency_key,
+            )
+        ).scalar_one_or_none()
+        if existing:
+            if existing.multipart_upload_id:
+                return _upload_session_payload(existing)
+            return {"upload_id": existing.id, "object_uri": existing.object_uri}
+    part_size = payload.part_size or settings.s3_part_size_bytes
+    if part_size < MIN_PART_BYTES or part_size > settings.upload_max_part_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"part_size must be between {MIN_PART_BYTES} and {settings.upload_max_part_bytes} bytes",
+        )
+    total_parts = expected_total_parts(payload.total_size, part_size)
+    if total_parts and total_parts > MAX_PART_NUMBER:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="part_size too small for total_size")
+    content_encoding = declared_encoding(payload.content_encoding, payload.content_type)
+    if payload.content_encoding and payload.content_encoding.lower() != "identity" and not content_encoding:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported content_encoding")
+    upload_id = str(uuid.uuid4())
+    key = f"uploads/{user.tenant_id}/{upload_id}/{payload.filename}"
+    multipart_upload_id = create_multipart_upload(key, content_type=payload.content_type or "text/csv")
+    upload = ExposureUpload(
+        id=upload_id,
+        tenant_id=user.tenant_id,
+        filename=payload.filename,
+        object_uri=object_uri(key),
+        checksum=None,
+        idempotency_key=idempotency_key,
+        created_by=user.user_id,
+        status=UPLOAD_STATUS_UPLOADING,
+        multipart_upload_id=multipart_upload_id,
+        content_encoding=content_encoding,
+        part_size=part_size,
+        parts_json={},
+        size_bytes=payload.total_size,
+    )
+    db.add(upload)
+    db.commit()
+    emit_audit(db, user.tenant_id, user.user_id, "upload_session_created", {"upload_id": upload_id})
+    return _upload_session_payload(upload)
+
+
+def _store_upload_part(
+    db: Session,
+    upload_id: str,
+    tenant_id: str,
+    part_number: int,
+    data: bytes,
+    expected_sha256: Optional[str],
+) -> Dict[str, Any]:
+    upload = _get_upload_session(db, upload_id, tenant_id)
+    if upload.status != UPLOAD_STATUS_UPLOADING:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload session is already finalized")
+    try:
+        validate_part(part_number, len(data), upload.part_size, settings.upload_max_part_bytes)
+    except UploadSessionError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    sha256 = compute_checksum(data)
+    if expected_sha256 and expected_sha256.lower() != sha256:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Part checksum mismatch")
+    key = key_from_uri(upload.object_uri)
+    etag = upload_part(key, upload.multipart_upload_id, part_number, data)
+    # Lock the row so concurrent part uploads do not overwrite each other's parts_json.
+    db.rollback()
+    upload = _get_upload_session(db, upload_id, tenant_id, for_update=True)
+    upload.parts_json = record_part(upload.parts_json, part_number, etag, len(data), sha256)
+    db.commit()
+    return {"upload_id": upload_id, "part_number": part_number, "size": len(data), "sha256": sha256}
+
+
+@router.put("/uploads/{upload_id}/parts/{part_number}")
+async def put_upload_part(
+    upload_id: str,
+    part_number: int,
+    request: Request,
+    part_sha256: Optional[str] = Header(default=None, alias="X-Part-SHA256"),
+    user: TokenData = Depends(require_role(UserRole.ADMIN.value, UserRole.OPS.value)),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.upload_max_part_bytes:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Part exceeds maximum part size")
+    data = await request.body()
+    return await run_in_threadpool(_store_upload_part, db, upload_id, user.tenant_id, part_number, data, part_sha256)
+
+
+@router.get("/uploads/{upload_id}/parts")
+def get_upload_parts(
+    upload_id: str,
+    user: TokenData = Depends(require_role(UserRole.ADMIN.value, UserRole.OPS.value)),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    return _upload_session_payload(_get_upload_session(db, upload_id, user.tenant_id))
+
+
+@router.post("/uploads/{upload_id}/finalize")
+def finalize_upload_session(
+    upload_id: str,
+    user: TokenData = Depends(require_role(UserRole.ADMIN.value, UserRole.OPS.value)),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    upload = _get_upload_session(db, upload_id, user.tenant_id, for_update=True)
+    if upload.status == UPLOAD_STATUS_COMPLETE:
+        return _upload_session_payload(upload)
+    if upload.status not in (UPLOAD_STATUS_UPLOADING, UPLOAD_STATUS_FINALIZING):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload session was aborted")
+    key = key_from_uri(upload.object_uri)
+    if upload.status == UPLOAD_STATUS_UPLOADING:
+        try:
+            parts = completion_parts(upload.parts_json, upload.part_size)
+        except UploadSessionError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        received_size = sum(part["size"] for part in received_parts(upload.parts_json))
+        if upload.size_bytes and upload.size_bytes != received_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"received {received_size} bytes, expected {upload.size_bytes}",
+            )
+        complete_multipart_upload(key, upload.multipart_upload_id, parts)
+        upload.size_bytes = received_size
+        if not upload.content_encoding:
+            upload.content_encoding = sniff_encoding(read_object_head(key, MAGIC_BYTES))
+        upload.status = UPLOAD_STATUS_FINALIZING
+    db.commit()
+    # The checksum is the sha256 of the file bytes, as for POST /uploads, so it is hashed from the
+    # assembled object with the row lock released. FINALIZING keeps parts and abort out meanwhile,
+    # and a finalize retried after a crash resumes here.
+    checksum = object_checksum(key)
+    upload = _get_upload_session(db, upload_id, user.tenant_id, for_update=True)
+    if upload.status != UPLOAD_STATUS_FINALIZING:
+        return _upload_session_payload(upload)
+    upload.checksum = checksum
+    duplicate_key = _dedupe_upload_object(db, upload)
+    upload.status = UPLOAD_STATUS_COMPLETE
+    db.commit()
+    if duplicate_key:
+        delete_object(duplicate_key)
+    emit_audit(db, user.tenant_id, user.user_id, "upload_created", {"upload_id": upload_id})
+    return _upload_session_payload(upload)
+
+
+@router.post("/uploads/{upload_id}/abort")
+def abort_upload_session(
+    upload_id: str,
+    user: TokenData = Depends(require_role(UserRole.ADMIN.value, UserRole.OPS.value)),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    upload = _get_upload_session(db, upload_id, user.tenant_id, for_update=True)
+    if upload.status in (UPLOAD_STATUS_COMPLETE, UPLOAD_STATUS_FINALIZING):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload session is already finalized")
+    if upload.status == UPLOAD_STATUS_UPLOADING:
+        # Frees the stored parts; S3 otherwise keeps (and bills) them until a lifecycle rule runs.
+        abort_multipart_upload(key_from_uri(upload.object_uri), upload.multipart_upload_id)
+        upload.status = UPLOAD_STATUS_ABORTED
+        db.commit()
+        emit_audit(db, user.tenant_id, user.user_id, "upload_session_aborted", {"upload_id": upload_id})
+    return _upload_session_payload(upload)
 
 
 @router.post("/uploads/{upload_id}/mapping")
@@ -629,12 +938,19 @@ def set_tenant_default_policy(
 @router.post("/uploads/{upload_id}/validate")
 def trigger_validate(
     upload_id: str,
+    force: bool = False,
     user: TokenData = Depends(require_role(UserRole.ADMIN.value, UserRole.OPS.value)),
     db: Session = Depends(get_db),
 ) -> Dict[str, Any]:
     upload = db.get(ExposureUpload, upload_id)
     if not upload or upload.tenant_id != user.tenant_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    if upload.status != UPLOAD_STATUS_COMPLETE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload is not finalized")
+    key = None if force else _upload_content_key(db, upload)
+    source = _find_by_content_key(db, ValidationResult, user.tenant_id, key)
+    if source:
+        return _reuse_validation_result(db, user, upload, source, key)
     run = Run(
         tenant_id=user.tenant_id,
         run_type=RunType.VALIDATION,
@@ -654,11 +970,127 @@ def trigger_validate(
     return {"run_id": run.id, "status": run.status}
 
 
+def _upload_content_key(db: Session, upload: ExposureUpload) -> Optional[str]:
+    template = db.get(MappingTemplate, upload.mapping_template_id) if upload.mapping_template_id else None
+    return content_key(upload.checksum, template.template_json if template else None, settings.code_version)
+
+
+def _find_by_content_key(db: Session, model, tenant_id: str, key: Optional[str]):
+    if not key:
+        return None
+    return db.execute(
+        select(model)
+        .where(model.tenant_id == tenant_id, model.content_key == key)
+        .order_by(model.created_at.asc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def _completed_reuse_run(
+    db: Session, user: TokenData, run_type: RunType, input_refs: Dict[str, Any], output_refs: Dict[str, Any]
+) -> Run:
+    now = datetime.utcnow()
+    run = Run(
+        tenant_id=user.tenant_id,
+        run_type=run_type,
+        status=RunStatus.SUCCEEDED,
+        input_refs_json=input_refs,
+        output_refs_json=output_refs,
+        created_by=user.user_id,
+        code_version=settings.code_version,
+        started_at=now,
+        completed_at=now,
+    )
+    apply_request_id(run)
+    db.add(run)
+    return run
+
+
+def _reuse_validation_result(
+    db: Session, user: TokenData, upload: ExposureUpload, source: ValidationResult, key: str
+) -> Dict[str, Any]:
+    origin_id = source.source_validation_result_id or source.id
+    vr = ValidationResult(
+        tenant_id=user.tenant_id,
+        upload_id=upload.id,
+        mapping_template_id=upload.mapping_template_id,
+        summary_json=source.summary_json,
+        row_errors_uri=source.row_errors_uri,
+        checksum=source.checksum,
+        issue_count=source.issue_count,
+        content_key=key,
+        source_validation_result_id=origin_id,
+    )
+    db.add(vr)
+    db.flush()
+    output_refs = reuse_refs("validation_result", origin_id, source.upload_id, key)
+    output_refs["validation_result_id"] = vr.id
+    run = _completed_reuse_run(db, user, RunType.VALIDATION, {"upload_id": upload.id}, output_refs)
+    run.config_refs_json = {"mapping_template_id": upload.mapping_template_id}
+    run.artifact_checksums_json = {"row_errors": source.checksum}
+    db.commit()
+    emit_audit(
+        db, user.tenant_id, user.user_id, "validation_reused", {"upload_id": upload.id, "validation_result_id": vr.id}
+    )
+    return {"run_id": run.id, "status": run.status, "validation_result_id": vr.id, "note": "validation_result_reused"}
+
+
+def _validation_issue_page(
+    db: Session,
+    vr: ValidationResult,
+    severity: Optional[str] = None,
+    code: Optional[str] = None,
+    after_seq: Optional[int] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> List[Tuple[int, Dict[str, Any]]]:
+    if vr.issue_count is None:
+        if not vr.row_errors_uri:
+            return []
+        issues = iter_issue_artifact(iter_object_chunks(key_from_uri(vr.row_errors_uri)))
+        return filter_issues(issues, severity, code, after_seq, offset, limit)
+    query = select(ValidationIssue).where(
+        ValidationIssue.validation_result_id == (vr.source_validation_result_id or vr.id)
+    )
+    if severity:
+        query = query.where(ValidationIssue.severity == severity)
+    if code:
+        query = query.where(ValidationIssue.code == code)
+    if after_seq is not None:
+        query = query.where(ValidationIssue.seq > after_seq)
+    elif offset:
+        query = query.offset(offset)
+    query = query.order_by(ValidationIssue.seq.asc())
+    if limit:
+        query = query.limit(limit)
+    return [(row.seq, issue_payload(row)) for row in db.execute(query).scalars()]
+
+
+def _validation_issue_total(
+    db: Session, vr: ValidationResult, severity: Optional[str] = None, code: Optional[str] = None
+) -> int:
+    if vr.issue_count is not None and not severity and not code:
+        return vr.issue_count
+    if vr.issue_count is None:
+        return len(_validation_issue_page(db, vr, severity, code))
+    query = select(func.count()).select_from(ValidationIssue).where(
+        ValidationIssue.validation_result_id == (vr.source_validation_result_id or vr.id)
+    )
+    if severity:
+        query = query.where(ValidationIssue.severity == severity)
+    if code:
+        query = query.where(ValidationIssue.code == code)
+    return db.execute(query).scalar_one()
+
+
 @router.get("/validation-results/{validation_result_id}")
 def get_validation_result(
     validation_result_id: int,
     limit: int = 200,
     offset: int = 0,
+    after_seq: Optional[int] = None,
+    severity: Optional[str] = None,
+    code: Optional[str] = None,
     user: TokenData = Depends(require_role(
         UserRole.ADMIN.value,
         UserRole.OPS.value,
@@ -671,25 +1103,31 @@ def get_validation_result(
     vr = db.get(ValidationResult, validation_result_id)
     if not vr or vr.tenant_id != user.tenant_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
-    issues: List[Dict[str, Any]] = []
-    if vr.row_errors_uri:
-        key = vr.row_errors_uri.split(f"s3://{settings.minio_bucket}/", 1)[1]
-        issues = json.loads(get_object(key).decode())
-    total = len(issues)
-    sliced = issues[offset : offset + limit] if limit else issues[offset:]
+    page = _validation_issue_page(db, vr, severity, code, after_seq, max(offset, 0), limit or None)
     return {
         "id": vr.id,
         "summary": vr.summary_json,
-        "issues": sliced,
-        "total_issues": total,
+        "issues": [issue for _, issue in page],
+        "total_issues": _validation_issue_total(db, vr, severity, code),
+        "next_after_seq": page[-1][0] if limit and len(page) == limit else None,
         "row_errors_uri": vr.row_errors_uri,
         "checksum": vr.checksum,
         "created_at": vr.created_at.isoformat(),
         "mapping_template_id": vr.mapping_template_id,
         "upload_id": vr.upload_id,
+        "source_validation_result_id": vr.source_validation_result_id,
     }
 
 
+def _delta_base_id(db: Session, tenant_id: str, base_exposure_version_id: Optional[int]) -> Optional[int]:
+    if base_exposure_version_id is None:
+        return None
+    base = db.get(ExposureVersion, base_exposure_version_id)
+    if not base or base.tenant_id != tenant_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Base exposure version not found")
+    return base.id
+
+
 @router.post("/uploads/{upload_id}/commit")
 def trigger_commit(
     upload_id: str,
@@ -702,6 +1140,8 @@ def trigger_commit(
     upload = db.get(ExposureUpload, upload_id)
     if not upload or upload.tenant_id != user.tenant_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    if upload.status != UPLOAD_STATUS_COMPLETE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload is not finalized")
     existing = db.execute(
         select(ExposureVersion).where(
             ExposureVersion.tenant_id == user.tenant_id,
@@ -736,11 +1176,41 @@ def trigger_commit(
             detail="Validation must match current mapping template",
         )
     commit_name = payload.name if payload and payload.name else name
+    if payload and payload.reuse_existing:
+        key = _upload_content_key(db, upload)
+        source = _find_by_content_key(db, ExposureVersion, user.tenant_id, key)
+        if source:
+            run = _completed_reuse_run(
+                db,
+                user,
+                RunType.COMMIT,
+                {"upload_id": upload_id, "name": commit_name or f"Exposure {upload_id}"},
+                reuse_refs("exposure_version", source.id, source.upload_id, key),
+            )
+            run.config_refs_json = {
+                "mapping_template_id": upload.mapping_template_id,
+                "idempotency_key": idempotency_key,
+            }
+            db.commit()
+            emit_audit(
+                db, user.tenant_id, user.user_id, "commit_reused", {"upload_id": upload_id, "exposure_version_id": source.id}
+            )
+            return {
+                "run_id": run.id,
+                "status": run.status,
+                "exposure_version_id": source.id,
+                "note": "exposure_version_reused",
+            }
+    base_exposure_version_id = _delta_base_id(db, user.tenant_id, payload.base_exposure_version_id if payload else None)
     run = Run(
         tenant_id=user.tenant_id,
         run_type=RunType.COMMIT,
         status=RunStatus.QUEUED,
-        input_refs_json={"upload_id": upload_id, "name": commit_name or f"Exposure {upload_id}"},
+        input_refs_json={
+            "upload_id": upload_id,
+            "name": commit_name or f"Exposure {upload_id}",
+            "base_exposure_version_id": base_exposure_version_id,
+        },
         config_refs_json={"mapping_template_id": upload.mapping_template_id, "idempotency_key": idempotency_key},
         created_by=user.user_id,
         code_version=settings.code_version,
@@ -754,6 +1224,7 @@ def trigger_commit(
         user.tenant_id,
         commit_name or f"Exposure {upload_id}",
         run.request_id,
+        base_exposure_version_id=base_exposure_version_id,
     )
     run.celery_task_id = async_result.id
     db.commit()
@@ -761,6 +1232,76 @@ def trigger_commit(
     return {"run_id": run.id, "status": run.status}
 
 
+@router.post("/uploads/{upload_id}/ingest")
+def trigger_ingest(
+    upload_id: str,
+    payload: IngestRequest | None = Body(default=None),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+    user: TokenData = Depends(require_role(UserRole.ADMIN.value, UserRole.OPS.value)),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    upload = db.get(ExposureUpload, upload_id)
+    if not upload or upload.tenant_id != user.tenant_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    if upload.status != UPLOAD_STATUS_COMPLETE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload is not finalized")
+    existing = db.execute(
+        select(ExposureVersion).where(
+            ExposureVersion.tenant_id == user.tenant_id,
+            ExposureVersion.upload_id == upload_id,
+            ExposureVersion.mapping_template_id == upload.mapping_template_id,
+        )
+    ).scalar_one_or_none()
+    if existing:
+        return {"exposure_version_id": existing.id, "note": "existing_exposure_version_returned"}
+    if idempotency_key:
+        existing_key = db.execute(
+            select(ExposureVersion).where(
+                ExposureVersion.tenant_id == user.tenant_id,
+                ExposureVersion.upload_id == upload_id,
+                ExposureVersion.idempotency_key == idempotency_key,
+            )
+        ).scalar_one_or_none()
+        if existing_key:
+            return {"exposure_version_id": existing_key.id, "note": "existing_exposure_version_returned"}
+    ingest_name = (payload.name if payload and payload.name else None) or f"Exposure {upload_id}"
+    require_clean = payload.require_clean if payload else True
+    base_exposure_version_id = _delta_base_id(db, user.tenant_id, payload.base_exposure_version_id if payload else None)
+    run = Run(
+        tenant_id=user.tenant_id,
+        run_type=RunType.INGEST,
+        status=RunStatus.QUEUED,
+        input_refs_json={
+            "upload_id": upload_id,
+            "name": ingest_name,
+            "base_exposure_version_id": base_exposure_version_id,
+        },
+        config_refs_json={
+            "mapping_template_id": upload.mapping_template_id,
+            "idempotency_key": idempotency_key,
+            "require_clean": require_clean,
+        },
+        created_by=user.user_id,
+        code_version=settings.code_version,
+    )
+    apply_request_id(run)
+    db.add(run)
+    db.commit()
+    async_result = ingest_task.delay(
+        run.id,
+        upload_id,
+        user.tenant_id,
+        ingest_name,
+        require_clean,
+        run.request_id,
+        base_exposure_version_id=base_exposure_version_id,
+    )
+    run.celery_task_id = async_result.id
+    db.commit()
+    emit_audit(db, user.tenant_id, user.user_id, "ingest_requested", {"upload_id": upload_id})
+    return {"run_id": run.id, "status": run.status}
+
+
 @router.get("/exposure-versions")
 def list_exposure_versions(user: TokenData = Depends(require_role(
     UserRole.ADMIN.value,
@@ -826,6 +1367,7 @@ def get_exposure_version(exposure_version_id: int, user: TokenData = Depends(req
         "id": ev.id,
         "name": ev.name,
         "upload_id": ev.upload_id,
+        "base_exposure_version_id": ev.base_exposure_version_id,
         "created_at": ev.created_at.isoformat(),
         "location_count": location_count or 0,
         "tiv_sum": float(tiv_sum or 0),
@@ -1188,9 +1730,41 @@ def retry_run(
         if not upload_id:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing upload_id for retry")
         name = (run.input_refs_json or {}).get("name") or f"Exposure {upload_id}"
-        async_result = commit_task.delay(new_run.id, upload_id, user.tenant_id, name, new_run.request_id)
+        async_result = commit_task.delay(
+            new_run.id,
+            upload_id,
+            user.tenant_id,
+            name,
+            new_run.request_id,
+            base_exposure_version_id=(run.input_refs_json or {}).get("base_exposure_version_id"),
+        )
+        new_run.celery_task_id = async_result.id
+        db.commit()
+    elif run.run_type == RunType.INGEST:
+        upload_id = (run.input_refs_json or {}).get("upload_id")
+        if not upload_id:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing upload_id for retry")
+        name = (run.input_refs_json or {}).get("name") or f"Exposure {upload_id}"
+        require_clean = (run.config_refs_json or {}).get("require_clean", True)
+        async_result = ingest_task.delay(
+            new_run.id,
+            upload_id,
+            user.tenant_id,
+            name,
+            require_clean,
+            new_run.request_id,
+            base_exposure_version_id=(run.input_refs_json or {}).get("base_exposure_version_id"),
+        )
+        new_run.celery_task_id = async_result.id
+        db.commit()
+    elif run.run_type == RunType.HAZARD_INGEST:
+        hazard_dataset_version_id = (run.input_refs_json or {}).get("hazard_dataset_version_id")
+        if hazard_dataset_version_id is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing hazard_dataset_version_id for retry")
+        async_result = hazard_ingest_task.delay(new_run.id, hazard_dataset_version_id, user.tenant_id, new_run.request_id)
         new_run.celery_task_id = async_result.id
         db.commit()
+        response.update({"hazard_dataset_version_id": hazard_dataset_version_id})
     elif run.run_type == RunType.GEOCODE:
         exposure_version_id = (run.input_refs_json or {}).get("exposure_version_id")
         if exposure_version_id is None:
@@ -1307,42 +1881,62 @@ def retry_run(
 
 
 @router.get("/exposure-versions/{exposure_version_id}/exceptions")
-def exposure_exceptions(exposure_version_id: int, user: TokenData = Depends(require_role(
-    UserRole.ADMIN.value,
-    UserRole.OPS.value,
-    UserRole.ANALYST.value,
-    UserRole.AUDITOR.value,
-    UserRole.READ_ONLY.value,
-)), db: Session = Depends(get_db)) -> Dict[str, Any]:
+def exposure_exceptions(
+    exposure_version_id: int,
+    severity: Optional[str] = None,
+    code: Optional[str] = None,
+    limit: Optional[int] = None,
+    after_seq: Optional[int] = None,
+    user: TokenData = Depends(require_role(
+        UserRole.ADMIN.value,
+        UserRole.OPS.value,
+        UserRole.ANALYST.value,
+        UserRole.AUDITOR.value,
+        UserRole.READ_ONLY.value,
+    )),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
     ev = db.get(ExposureVersion, exposure_version_id)
     if not ev or ev.tenant_id != user.tenant_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    if limit is not None:
+        limit = min(max(limit, 1), 1000)
     vr = db.execute(
         select(ValidationResult)
         .where(ValidationResult.upload_id == ev.upload_id, ValidationResult.tenant_id == user.tenant_id)
         .order_by(ValidationResult.created_at.desc())
+        .limit(1)
     ).scalar_one_or_none()
-    if not vr:
-        issues = []
-    else:
-        issues = json.loads(get_object(vr.row_errors_uri.split(f"s3://{settings.minio_bucket}/", 1)[1]).decode())
-    quality_rows = db.execute(
-        select(Location).where(
-            Location.exposure_version_id == ev.id,
-            Location.tenant_id == user.tenant_id,
-            or_(
-                Location.quality_tier == "C",
-                and_(Location.geocode_confidence.isnot(None), Location.geocode_confidence < 0.6),
-            ),
+    page = _validation_issue_page(db, vr, severity, code, after_seq, limit=limit) if vr else []
+    # Quality exceptions have no severity/code and are not paged; they come with the first page only.
+    quality_rows = []
+    if after_seq is None and not severity and not code:
+        quality_rows = db.execute(
+            select(Location).where(
+                Location.exposure_version_id == ev.id,
+                Location.tenant_id == user.tenant_id,
+                or_(
+                    Location.quality_tier == "C",
+                    and_(Location.geocode_confidence.isnot(None), Location.geocode_confidence < 0.6),
+                ),
+            )
+        ).scalars().all()
+    keys = [
+        exception_key(
+            exposure_version_id,
+            "QUALITY_TIER_C" if loc.quality_tier == "C" else "LOW_GEO_CONFIDENCE",
+            {"location_id": loc.id},
         )
-    ).scalars().all()
+        for loc in quality_rows
+    ] + [exception_key(exposure_version_id, "VALIDATION_ISSUE", issue) for _, issue in page]
     triage_rows = db.execute(
         select(ExceptionTriage)
         .where(
             ExceptionTriage.tenant_id == user.tenant_id,
             ExceptionTriage.exposure_version_id == exposure_version_id,
+            ExceptionTriage.exception_key.in_(keys),
         )
-    ).scalars().all()
+    ).scalars().all() if keys else []
     triage_by_key = {row.exception_key: row for row in triage_rows}
 
     items = []
@@ -1368,7 +1962,7 @@ def exposure_exceptions(exposure_version_id: int, user: TokenData = Depends(requ
                 "recommended_action": action,
             }
         )
-    for issue in issues:
+    for _, issue in page:
         payload = {"type": "VALIDATION_ISSUE", **issue}
         key = exception_key(exposure_version_id, "VALIDATION_ISSUE", payload)
         impact, action = exception_impact_and_action("VALIDATION_ISSUE", payload)
@@ -1382,7 +1976,7 @@ def exposure_exceptions(exposure_version_id: int, user: TokenData = Depends(requ
                 "recommended_action": action,
             }
         )
-    return {"items": items}
+    return {"items": items, "next_after_seq": page[-1][0] if limit and len(page) == limit else None}
 
 
 @router.patch("/exceptions/{exception_key_value}")
@@ -1450,11 +2044,35 @@ def geocode_autocomplete(
         suggestions = geoapify_autocomplete(text, limit=limit, country_code=country_code)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+    except ProviderError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=exc.to_dict()) from exc
     except Exception as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Autocomplete request failed") from exc
     return {"suggestions": suggestions}
 
 
+@router.get("/providers/circuit-breakers")
+def provider_circuit_breakers(
+    user: TokenData = Depends(require_role(UserRole.ADMIN.value, UserRole.OPS.value)),
+) -> Dict[str, Any]:
+    # Per API process; workers keep their own breakers.
+    return {"items": list(circuit_breaker_snapshots().values())}
+
+
+@router.get("/geocode/cache/stats")
+def geocode_cache_stats(
+    user: TokenData = Depends(require_role(UserRole.ADMIN.value, UserRole.OPS.value)),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    stored = db.execute(
+        select(func.count())
+        .select_from(GeocodeCacheEntry)
+        .where(GeocodeCacheEntry.tenant_id == user.tenant_id, GeocodeCacheEntry.expires_at > datetime.utcnow())
+    ).scalar_one()
+    # Hit/miss counters are per process (this API worker), the stored count is the tenant's live rows.
+    return {"process": get_geocode_cache().stats(), "tenant_entries": stored}
+
+
 @router.post("/exposure-versions/{exposure_version_id}/geocode")
 def trigger_geocode(
     exposure_version_id: int,
@@ -1488,6 +2106,8 @@ def create_hazard_dataset(
     user: TokenData = Depends(require_role(UserRole.ADMIN.value, UserRole.OPS.value)),
     db: Session = Depends(get_db),
 ) -> Dict[str, Any]:
+    if payload.data_format not in DATA_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="data_format must be vector or raster")
     dataset = HazardDataset(
         tenant_id=user.tenant_id,
         name=payload.name,
@@ -1495,6 +2115,7 @@ def create_hazard_dataset(
         vendor=payload.vendor,
         coverage_geo=payload.coverage_geo,
         license_ref=payload.license_ref,
+        data_format=payload.data_format,
     )
     db.add(dataset)
     db.commit()
@@ -1506,6 +2127,7 @@ def create_hazard_dataset(
         "vendor": dataset.vendor,
         "coverage_geo": dataset.coverage_geo,
         "license_ref": dataset.license_ref,
+        "data_format": dataset.data_format,
         "created_at": dataset.created_at.isoformat(),
     }
 
@@ -1531,6 +2153,7 @@ def list_hazard_datasets(user: TokenData = Depends(require_role(
             "vendor": r.vendor,
             "coverage_geo": r.coverage_geo,
             "license_ref": r.license_ref,
+            "data_format": r.data_format,
             "created_at": r.created_at.isoformat(),
         }
         for r in rows
@@ -1543,17 +2166,33 @@ def upload_hazard_dataset_version(
     version_label: Optional[str] = None,
     file: UploadFile = File(...),
     effective_date: Optional[str] = None,
+    transform: Optional[str] = None,
+    nodata: Optional[float] = None,
+    value_property: Optional[str] = None,
     user: TokenData = Depends(require_role(UserRole.ADMIN.value, UserRole.OPS.value)),
     db: Session = Depends(get_db),
 ) -> Dict[str, Any]:
     dataset = db.get(HazardDataset, hazard_dataset_id)
     if not dataset or dataset.tenant_id != user.tenant_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
-    payload = file.file.read()
-    checksum = compute_checksum(payload)
+    raster_json = None
+    if dataset.data_format == DATA_FORMAT_RASTER:
+        # Raster versions are a 2-D .npy grid georeferenced by a north-up GDAL geotransform.
+        if not transform:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="transform required for raster datasets")
+        try:
+            raster_json = {
+                "transform": parse_transform(transform),
+                "nodata": nodata,
+                "value_property": value_property or "score",
+            }
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     label = version_label or f"v{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
     key = f"hazards/{user.tenant_id}/{hazard_dataset_id}/{label}/{file.filename}"
-    uri = put_object(key, payload, content_type=file.content_type or "application/json")
+    # Stored as sent (gzip/zstd included); parsing, the PostGIS load and raster tiling run in the hazard ingest task.
+    default_type = "application/octet-stream" if raster_json is not None else "application/json"
+    uri, checksum, _ = upload_stream(key, file.file, content_type=file.content_type or default_type)
     eff = datetime.fromisoformat(effective_date) if effective_date else None
     version = HazardDatasetVersion(
         tenant_id=user.tenant_id,
@@ -1562,31 +2201,24 @@ def upload_hazard_dataset_version(
         storage_uri=uri,
         checksum=checksum,
         effective_date=eff,
+        raster_json=raster_json,
     )
     db.add(version)
     db.commit()
-    try:
-        geojson = json.loads(payload.decode())
-    except json.JSONDecodeError as exc:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid GeoJSON") from exc
-    features = geojson.get("features") or []
-    rows = []
-    for feature in features:
-        geom = feature.get("geometry")
-        if not geom:
-            continue
-        geom_json = json.dumps(geom)
-        rows.append(
-            HazardFeaturePolygon(
-                tenant_id=user.tenant_id,
-                hazard_dataset_version_id=version.id,
-                geom=func.ST_Multi(func.ST_SetSRID(func.ST_GeomFromGeoJSON(geom_json), 4326)),
-                properties_json=feature.get("properties") or {},
-            )
-        )
-    if rows:
-        db.add_all(rows)
-        db.commit()
+    run = Run(
+        tenant_id=user.tenant_id,
+        run_type=RunType.HAZARD_INGEST,
+        status=RunStatus.QUEUED,
+        input_refs_json={"hazard_dataset_id": hazard_dataset_id, "hazard_dataset_version_id": version.id},
+        created_by=user.user_id,
+        code_version=settings.code_version,
+    )
+    apply_request_id(run)
+    db.add(run)
+    db.commit()
+    async_result = hazard_ingest_task.delay(run.id, version.id, user.tenant_id, run.request_id)
+    run.celery_task_id = async_result.id
+    db.commit()
     emit_audit(db, user.tenant_id, user.user_id, "hazard_dataset_version_created", {"hazard_dataset_version_id": version.id})
     return {
         "id": version.id,
@@ -1594,6 +2226,8 @@ def upload_hazard_dataset_version(
         "checksum": version.checksum,
         "created_at": version.created_at.isoformat(),
         "effective_date": version.effective_date.isoformat() if version.effective_date else None,
+        "run_id": run.id,
+        "status": run.status,
     }
 
 
@@ -1623,6 +2257,7 @@ def list_hazard_dataset_versions(hazard_dataset_id: int, user: TokenData = Depen
             "checksum": r.checksum,
             "created_at": r.created_at.isoformat(),
             "effective_date": r.effective_date.isoformat() if r.effective_date else None,
+            "feature_count": r.feature_count,
         }
         for r in rows
     ]}
@@ -1670,13 +2305,22 @@ def score_resilience(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="location_id missing coordinates and address",
                 )
-            lat, lon, geocode_confidence, geocode_method = geocode_address(
-                location.address_line1,
-                location.city,
-                location.country,
-                postal_code=location.postal_code or "",
-                state_region=location.state_region or "",
-            )
+            address = normalize_address({
+                "address_line1": location.address_line1,
+                "city": location.city,
+                "state_region": location.state_region,
+                "postal_code": location.postal_code,
+                "country": location.country,
+            })
+            try:
+                geocoded = cached_forward_geocode(address, address_fingerprint(address), user.tenant_id, db)
+            except ProviderError as exc:
+                code = status.HTTP_503_SERVICE_UNAVAILABLE if exc.code == "circuit_open" else status.HTTP_502_BAD_GATEWAY
+                raise HTTPException(status_code=code, detail=exc.to_dict()) from exc
+            lat = geocoded.get("lat")
+            lon = geocoded.get("lon")
+            geocode_confidence = geocoded.get("confidence")
+            geocode_method = geocoded.get("method") or geocoded.get("provider")
         else:
             geocode_method = "PROVIDED"
             geocode_confidence = 1.0
@@ -1823,7 +2467,7 @@ def score_resilience(
                         if not enrichment_failed:
                             enrichment_status = decision["enrichment_status"]
                 else:
-                    payload_profile = run_enrichment_pipeline(address_json)
+                    payload_profile = run_enrichment_pipeline(address_json, user.tenant_id, db)
                     profile = PropertyProfile(
                         tenant_id=user.tenant_id,
                         address_fingerprint=payload_profile["address_fingerprint"],
@@ -1900,6 +2544,7 @@ def score_resilience(
                 .where(
                     HazardDatasetVersion.tenant_id == user.tenant_id,
                     HazardDatasetVersion.hazard_dataset_id == dataset.id,
+                    HazardDatasetVersion.feature_count.isnot(None),
                 )
                 .order_by(
                     HazardDatasetVersion.effective_date.desc().nullslast(),
@@ -1913,27 +2558,29 @@ def score_resilience(
     hazard_versions_used = build_hazard_versions(db, user.tenant_id, version_ids)
     hazards: Dict[str, Dict[str, Any]] = {}
     if version_ids and lat is not None and lon is not None:
-        point = func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)
-        rows = db.execute(
-            select(HazardFeaturePolygon, HazardDatasetVersion, HazardDataset)
-            .join(HazardDatasetVersion, HazardFeaturePolygon.hazard_dataset_version_id == HazardDatasetVersion.id)
-            .join(HazardDataset, HazardDatasetVersion.hazard_dataset_id == HazardDataset.id)
-            .where(
-                HazardFeaturePolygon.tenant_id == user.tenant_id,
-                HazardDatasetVersion.tenant_id == user.tenant_id,
-                HazardDataset.tenant_id == user.tenant_id,
-                HazardFeaturePolygon.hazard_dataset_version_id.in_(version_ids),
-                func.ST_Contains(HazardFeaturePolygon.geom, point),
-            )
-        ).all()
-        for feature, version, dataset in rows:
-            entry = extract_hazard_entry(
-                feature.properties_json or {},
-                dataset.peril,
-                dataset.name,
-                version.version_label,
+        # Scoring without a requested raster would silently change the result, so a raster that is not
+        # yet in this process's cache is fetched in the background and the caller is asked to retry.
+        rasters, pending = load_cached_hazard_rasters(db, user.tenant_id, version_ids)
+        if pending:
+            for raster_json in pending.values():
+                warm_hazard_raster_in_background(raster_json)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={
+                    "code": "hazard_raster_warming",
+                    "message": "Hazard raster tiles are loading; retry shortly",
+                    "hazard_dataset_version_ids": sorted(pending),
+                },
+                headers={"Retry-After": str(RASTER_WARM_RETRY_SECONDS)},
             )
+        raster_ids = {raster.version_id for raster, _, _, _ in rasters}
+        vector_ids = [version_id for version_id in version_ids if version_id not in raster_ids]
+        ids_per_point = lookup_feature_ids(db, user.tenant_id, vector_ids, [(lon, lat)])
+        for entry, _ in worst_hazard_entries(db, user.tenant_id, ids_per_point)[0]:
             merge_worst_in_peril(hazards, entry)
+        for entries in sample_hazard_entries(rasters, [lon], [lat]):
+            for entry in entries:
+                merge_worst_in_peril(hazards, entry)
 
     result = compute_resilience_score(hazards, structural_used, scoring_config)
     hazard_response = {
@@ -1995,7 +2642,7 @@ def underwriting_packet(
     user: TokenData = Depends(require_role(UserRole.ADMIN.value, UserRole.OPS.value, UserRole.ANALYST.value)),
     db: Session = Depends(get_db),
 ) -> Dict[str, Any]:
-    response = score_resilience(payload, user, db)
+    response = score_resilience(payload=payload, user=user, db=db)
     if isinstance(response, JSONResponse):
         return response
     try:
@@ -2124,6 +2771,7 @@ def create_resilience_scores(
                 .where(
                     HazardDatasetVersion.tenant_id == user.tenant_id,
                     HazardDatasetVersion.hazard_dataset_id == dataset.id,
+                    HazardDatasetVersion.feature_count.isnot(None),
                 )
                 .order_by(
                     HazardDatasetVersion.effective_date.desc().nullslast(),
@@ -2625,6 +3273,10 @@ def trigger_hazard_overlays(
     hdv = db.get(HazardDatasetVersion, hazard_dataset_version_id)
     if not hdv or hdv.tenant_id != user.tenant_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hazard dataset version not found")
+    if hdv.feature_count is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Hazard dataset version is still ingesting")
+    hazard_dataset = db.get(HazardDataset, hdv.hazard_dataset_id)
+    raster = hazard_dataset is not None and hazard_dataset.data_format == DATA_FORMAT_RASTER
     run = Run(
         tenant_id=user.tenant_id,
         run_type=RunType.OVERLAY,
@@ -2641,7 +3293,7 @@ def trigger_hazard_overlays(
         tenant_id=user.tenant_id,
         exposure_version_id=payload.exposure_version_id,
         hazard_dataset_version_id=hazard_dataset_version_id,
-        method="POSTGIS_SPATIAL_JOIN",
+        method="RASTER_SAMPLE" if raster else "POSTGIS_SPATIAL_JOIN",
         params_json=payload.params or {},
         run_id=run.id,
     )
@@ -18,6 +18,25 @@ class Settings(BaseSettings):
     minio_access_key: str = "minioadmin"
     minio_secret_key: str = "minioadmin"
     minio_bucket: str = "aegis-data"
+    s3_part_size_bytes: int = 8 * 1024 * 1024
+    upload_max_part_bytes: int = 64 * 1024 * 1024
+
+    validation_streaming: bool = True
+    validation_engine: str = "columnar"
+    validation_workers: int = 1
+    validation_shard_min_bytes: int = 64 * 1024 * 1024
+    validation_issue_store: bool = True
+    commit_engine: str = "copy"
+    commit_copy_batch_rows: int = 50000
+    commit_sort_buffer_rows: int = 250000
+    commit_sort_tmp_dir: Optional[str] = None
+    geocode_chunk_rows: int = 5000
+    hazard_subdivide_max_vertices: int = 256
+    hazard_cell_index_zoom: int = 12
+    hazard_raster_tile_size: int = 256
+    hazard_raster_cache_dir: str = "/tmp/aegis-rasters"
+    exposure_snapshots: bool = True
+    snapshot_cache_dir: str = "/tmp/aegis-snapshots"
 
     code_version: str = "dev"
     geocoder_provider: str = "stub"
@@ -28,20 +47,46 @@ class Settings(BaseSettings):
     geocoder_http_api_key: Optional[str] = None
     geocoder_http_api_key_header: str = "Authorization"
     geocoder_http_mapping_json: Optional[dict] = None
+    geocoder_http_batch_size: int = 0
+    geocoder_http_batch_mapping_json: Optional[dict] = None
 
     parcel_http_base_url: Optional[str] = None
     parcel_http_api_key: Optional[str] = None
     parcel_http_api_key_header: str = "Authorization"
     parcel_http_mapping_json: Optional[dict] = None
+    parcel_http_batch_size: int = 0
+    parcel_http_batch_mapping_json: Optional[dict] = None
 
     characteristics_http_base_url: Optional[str] = None
     characteristics_http_api_key: Optional[str] = None
     characteristics_http_api_key_header: str = "Authorization"
     characteristics_http_mapping_json: Optional[dict] = None
+    characteristics_http_batch_size: int = 0
+    characteristics_http_batch_mapping_json: Optional[dict] = None
 
     provider_timeout_seconds: float = 7.0
     provider_connect_timeout_seconds: float = 3.0
     provider_max_retries: int = 2
+    provider_max_connections: int = 20
+    provider_max_keepalive_connections: int = 10
+    provider_keepalive_expiry_seconds: float = 30.0
+    provider_http2: bool = False
+    provider_backoff_base_seconds: float = 0.5
+    provider_backoff_max_seconds: float = 10.0
+    provider_circuit_enabled: bool = True
+    provider_circuit_failure_rate: float = 0.5
+    provider_circuit_minimum_calls: int = 10
+    provider_circuit_window_seconds: float = 60.0
+    provider_circuit_open_seconds: float = 30.0
+    geocoder_rate_per_second: float = 0.0
+    parcel_rate_per_second: float = 0.0
+    characteristics_rate_per_second: float = 0.0
+    geocode_concurrency: int = 8
+
+    geocode_cache_enabled: bool = True
+    geocode_cache_ttl_seconds: int = 30 * 24 * 3600
+    geocode_cache_memory_entries: int = 10000
+    geocode_cache_version: str = "1"
 
     geoapify_api_key: Optional[str] = None
     geoapify_autocomplete_url: str = "https://api.geoapify.com/v1/geocode/autocomplete"
@@ -1,20 +1,25 @@
 import json
 import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from celery import Celery
-from sqlalchemy import select
+from celery.signals import worker_process_shutdown, worker_shutdown
+from sqlalchemy import select, text
 
 from app.core.config import get_settings
-from app.db import SessionLocal
-from sqlalchemy import func
+from app.db import SessionLocal, engine
+from sqlalchemy import and_, func, not_, or_
 from app.models import (
     Breach,
     DriftDetail,
     DriftRun,
     ExposureUpload,
     ExposureVersion,
+    HazardCellIndex,
     HazardDataset,
     HazardDatasetVersion,
     HazardFeaturePolygon,
@@ -38,11 +43,57 @@ from app.models import (
     UWFinding,
     ValidationResult,
 )
-from app.services.validation import read_csv_bytes, validate_rows
-from app.services.commit import canonicalize_rows, to_location_dict
-from app.services.geocode import geocode_address
-from app.services.hazard_query import extract_hazard_entry, merge_worst_in_peril
-from app.services.quality import quality_scores
+from app.services.validation import (
+    iter_csv_rows,
+    iter_text_lines,
+    read_csv_bytes,
+    validate_rows,
+    validate_rows_streaming,
+)
+from app.services.validation_columnar import validate_csv_streaming
+from app.services.validation_shards import validate_file_sharded
+from app.services.bulk_load import copy_locations
+from app.services.compression import MAGIC_BYTES, decompress_bytes, iter_decompressed, sniff_encoding
+from app.services.content_dedup import content_key
+from app.services.delta_commit import (
+    DELTA_COPY_COLUMNS,
+    BaseIndex,
+    annotate_delta,
+    carry_forward_sql,
+    copy_overlay_attributes_sql,
+    new_delta_stats,
+)
+from app.services.validation_issues import copy_validation_issues, iter_issue_artifact
+from app.services.ingest_plan import get_ingest_plan, iter_location_records, record_sorter
+from app.services.exposure_snapshot import (
+    SNAPSHOT_COLUMNS,
+    ExposureSnapshot,
+    open_exposure_snapshot,
+    write_exposure_snapshot,
+)
+from app.services.location_geocode import (
+    GEOCODE_SOURCE_COLUMNS,
+    bulk_update_params,
+    bulk_update_sql,
+    geocode_location,
+    location_address,
+    needs_geocode,
+)
+from app.services.geocode_batch import geocode_many
+from app.services.providers import get_geocoder
+from app.services.providers.clients import close_http_clients
+from app.services.providers.base import ProviderError
+from app.services.hazard_ingest import copy_hazard_features, feature_rows, iter_geojson_features
+from app.services.hazard_lookup import iter_location_hazard_entries
+from app.services.hazard_raster import (
+    DATA_FORMAT_RASTER,
+    TILES_NAME,
+    cache_hazard_raster,
+    load_hazard_rasters,
+    raster_key,
+    write_tiled_raster,
+)
+from app.services.hazard_query import merge_worst_in_peril
 from app.services.quality_metrics import init_peril_coverage, update_peril_coverage
 from app.services.resilience import DEFAULT_WEIGHTS, compute_resilience_score
 from app.services.property_enrichment import (
@@ -63,16 +114,34 @@ from app.services.uw_rules import (
     canonical_json,
     evaluate_rule,
 )
-from app.storage.s3 import compute_checksum, get_object, put_object
+from app.storage.s3 import (
+    MultipartUploadWriter,
+    compute_checksum,
+    get_object,
+    iter_object_chunks,
+    key_from_uri,
+    object_size,
+    put_object,
+    read_object_head,
+    upload_stream,
+)
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+READ_CHUNK_BYTES = 1024 * 1024
+
 celery_app = Celery(
     "aegis", broker=settings.redis_url, backend=settings.redis_url
 )
 
 
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_provider_clients(**_kwargs) -> None:
+    close_http_clients()
+
+
 def _attach_request_id(run: Run, request_id: Optional[str]) -> None:
     if request_id and not run.request_id:
         run.request_id = request_id
@@ -132,6 +201,10 @@ def _build_uw_explanation(rule: UWRule, record: Dict[str, Any], eval_explanation
     }
 
 
+def _upload_chunks(upload: ExposureUpload, key: str) -> Iterator[bytes]:
+    return iter_decompressed(iter_object_chunks(key), upload.content_encoding)
+
+
 @celery_app.task
 def validate_upload(run_id: int, upload_id: str, tenant_id: str, request_id: Optional[str] = None):
     session = SessionLocal()
@@ -150,24 +223,74 @@ def validate_upload(run_id: int, upload_id: str, tenant_id: str, request_id: Opt
         if not upload:
             raise ValueError("upload not found")
         mapping = session.get(MappingTemplate, upload.mapping_template_id) if upload.mapping_template_id else None
+        mapping_json = mapping.template_json if mapping else {}
+        plan = get_ingest_plan(upload.mapping_template_id, mapping_json)
         key = upload.object_uri.split(f"s3://{settings.minio_bucket}/", 1)[1]
-        raw_bytes = get_object(key)
-        rows = read_csv_bytes(raw_bytes)
-        total_rows = len(rows) if hasattr(rows, "__len__") else None
-        _update_progress(session, run, processed=0, total=total_rows)
-        summary, issues, artifact_bytes, checksum = validate_rows(rows, mapping.template_json if mapping else {})
         key_errs = f"validations/{tenant_id}/{upload_id}/row_errors.json"
-        uri = put_object(key_errs, artifact_bytes, content_type="application/json")
-        validation = ValidationResult(
-            tenant_id=tenant_id,
-            upload_id=upload_id,
-            mapping_template_id=upload.mapping_template_id,
-            summary_json=summary,
-            row_errors_uri=uri,
-            checksum=checksum,
-        )
-        session.add(validation)
-        session.commit()
+        workers = max(1, settings.validation_workers)
+        with tempfile.TemporaryFile(prefix="aegis-issues-") as spool:
+            issues: Optional[Iterable[Dict[str, Any]]] = None
+            on_progress = lambda processed: _update_progress(session, run, processed=processed, total=None)
+            sharded = workers > 1 and settings.validation_streaming
+            if sharded and object_size(key) >= settings.validation_shard_min_bytes:
+                _update_progress(session, run, processed=0, total=None)
+                with tempfile.NamedTemporaryFile(prefix="aegis-upload-", suffix=".csv") as local:
+                    for chunk in _upload_chunks(upload, key):
+                        local.write(chunk)
+                    local.flush()
+                    with MultipartUploadWriter(key_errs, content_type="application/json") as writer:
+                        summary, checksum = validate_file_sharded(
+                            local.name,
+                            mapping_json,
+                            _tee(writer.write, spool.write),
+                            workers,
+                            on_progress=on_progress,
+                            engine=settings.validation_engine,
+                        )
+                uri = writer.uri
+                total_rows = summary["total_rows"]
+            elif settings.validation_streaming:
+                _update_progress(session, run, processed=0, total=None)
+                with MultipartUploadWriter(key_errs, content_type="application/json") as writer:
+                    if settings.validation_engine == "columnar":
+                        summary, checksum = validate_csv_streaming(
+                            iter_text_lines(_upload_chunks(upload, key)),
+                            mapping_json,
+                            _tee(writer.write, spool.write),
+                            on_progress=on_progress,
+                            plan=plan,
+                        )
+                    else:
+                        summary, checksum = validate_rows_streaming(
+                            iter_csv_rows(_upload_chunks(upload, key)),
+                            mapping_json,
+                            _tee(writer.write, spool.write),
+                            on_progress=on_progress,
+                        )
+                uri = writer.uri
+                total_rows = summary["total_rows"]
+            else:
+                raw_bytes = decompress_bytes(get_object(key), upload.content_encoding)
+                rows = read_csv_bytes(raw_bytes)
+                total_rows = len(rows) if hasattr(rows, "__len__") else None
+                _update_progress(session, run, processed=0, total=total_rows)
+                summary, issues, artifact_bytes, checksum = validate_rows(rows, mapping_json)
+                uri = put_object(key_errs, artifact_bytes, content_type="application/json")
+            validation = ValidationResult(
+                tenant_id=tenant_id,
+                upload_id=upload_id,
+                mapping_template_id=upload.mapping_template_id,
+                summary_json=summary,
+                row_errors_uri=uri,
+                checksum=checksum,
+                content_key=content_key(upload.checksum, mapping_json, settings.code_version),
+            )
+            session.add(validation)
+            session.commit()
+            if issues is None:
+                spool.seek(0)
+                issues = iter_issue_artifact(iter(lambda: spool.read(READ_CHUNK_BYTES), b""))
+            _store_validation_issues(session, validation, issues)
         run.status = RunStatus.SUCCEEDED
         run.completed_at = datetime.utcnow()
         run.output_refs_json = merge_run_progress(
@@ -188,6 +311,21 @@ def validate_upload(run_id: int, upload_id: str, tenant_id: str, request_id: Opt
         session.close()
 
 
+ROLLUP_LOCATION_FIELDS = [
+    "id",
+    "external_location_id",
+    "country",
+    "state_region",
+    "postal_code",
+    "lob",
+    "product_code",
+    "quality_tier",
+    "tiv",
+    "limit",
+    "premium",
+]
+
+
 @celery_app.task
 def rollup_execute(
     run_id: int,
@@ -228,31 +366,26 @@ def rollup_execute(
             ).all()
             attr_map = {a.location_id: a.attributes_json or {} for a in attrs}
 
-        locations = session.query(Location).filter(
-            Location.tenant_id == tenant_id,
-            Location.exposure_version_id == exposure_version_id,
-        ).all()
-        total_locations = len(locations)
+        snapshot = _open_exposure_snapshot(session, tenant_id, exposure_version_id)
+        if snapshot is not None:
+            # Memory-mapped columns instead of one ORM object per location.
+            locations = snapshot.iter_records(ROLLUP_LOCATION_FIELDS)
+            total_locations = snapshot.row_count
+        else:
+            locations = session.execute(
+                select(*[getattr(Location, name) for name in ROLLUP_LOCATION_FIELDS])
+                .where(Location.tenant_id == tenant_id, Location.exposure_version_id == exposure_version_id)
+                .order_by(Location.id)
+            ).mappings().all()
+            total_locations = len(locations)
         _update_progress(session, run, processed=0, total=total_locations)
         enriched = []
         for loc in locations:
-            attrs = attr_map.get(loc.id, {})
-            enriched.append(
-                {
-                    "external_location_id": loc.external_location_id,
-                    "country": loc.country,
-                    "state_region": loc.state_region,
-                    "postal_code": loc.postal_code,
-                    "lob": loc.lob,
-                    "product_code": loc.product_code,
-                    "quality_tier": loc.quality_tier,
-                    "hazard_band": attrs.get("band"),
-                    "hazard_category": attrs.get("hazard_category"),
-                    "tiv": loc.tiv,
-                    "limit": loc.limit,
-                    "premium": loc.premium,
-                }
-            )
+            attrs = attr_map.get(loc["id"], {})
+            record = {name: loc[name] for name in ROLLUP_LOCATION_FIELDS if name != "id"}
+            record["hazard_band"] = attrs.get("band")
+            record["hazard_category"] = attrs.get("hazard_category")
+            enriched.append(record)
 
         rows, checksum = compute_rollup(enriched, config.dimensions_json, config.measures_json, config.filters_json)
         result_items = []
@@ -672,8 +805,198 @@ def uw_evaluate(
         session.close()
 
 
+def _create_exposure_version(
+    session: SessionLocal,
+    run: Run,
+    tenant_id: str,
+    upload: ExposureUpload,
+    name: str,
+    base_exposure_version_id: Optional[int] = None,
+) -> ExposureVersion:
+    # content_key stays unset until the locations are in; see _publish_exposure_version.
+    exposure_version = ExposureVersion(
+        tenant_id=tenant_id,
+        upload_id=upload.id,
+        mapping_template_id=upload.mapping_template_id,
+        name=name,
+        idempotency_key=run.config_refs_json.get("idempotency_key") if run.config_refs_json else None,
+        base_exposure_version_id=base_exposure_version_id,
+    )
+    session.add(exposure_version)
+    session.commit()
+    return exposure_version
+
+
+def _publish_exposure_version(
+    exposure_version: ExposureVersion, upload: ExposureUpload, mapping_json: Optional[Dict[str, Any]]
+) -> None:
+    # Called in the transaction that marks the run SUCCEEDED, so reuse_existing never finds a failed
+    # or half-loaded version. Delta versions carry enrichment from their base, so only full commits
+    # are reusable by content.
+    if exposure_version.base_exposure_version_id is None:
+        exposure_version.content_key = content_key(upload.checksum, mapping_json, settings.code_version)
+
+
+def _load_base_index(
+    session: SessionLocal, tenant_id: str, base_exposure_version_id: Optional[int]
+) -> Optional[BaseIndex]:
+    if base_exposure_version_id is None:
+        return None
+    base = session.get(ExposureVersion, base_exposure_version_id)
+    if not base or base.tenant_id != tenant_id:
+        raise ValueError("base exposure version not found")
+    rows = session.execute(
+        select(Location.external_location_id, Location.id, Location.row_hash).where(
+            Location.tenant_id == tenant_id,
+            Location.exposure_version_id == base_exposure_version_id,
+        )
+    )
+    return {external_id: (location_id, row_hash) for external_id, location_id, row_hash in rows}
+
+
+def _base_run_result(
+    session: SessionLocal,
+    model: Any,
+    tenant_id: str,
+    exposure_version: ExposureVersion,
+    matches: Callable[[Any], bool],
+) -> Tuple[Any, Optional[Run]]:
+    # Latest succeeded result of the same kind on the delta commit's base version, with its run.
+    if not exposure_version.base_exposure_version_id:
+        return None, None
+    rows = session.execute(
+        select(model, Run)
+        .join(Run, model.run_id == Run.id)
+        .where(
+            model.tenant_id == tenant_id,
+            model.exposure_version_id == exposure_version.base_exposure_version_id,
+            Run.status == RunStatus.SUCCEEDED,
+        )
+        .order_by(model.created_at.desc())
+    ).all()
+    for result, base_run in rows:
+        if matches(result) and base_run.completed_at:
+            return result, base_run
+    return None, None
+
+
+def _tee(*sinks):
+    def write(data: bytes) -> None:
+        for sink in sinks:
+            sink(data)
+
+    return write
+
+
+def _store_validation_issues(
+    session: SessionLocal, validation: ValidationResult, issues: Iterable[Dict[str, Any]]
+) -> None:
+    if not settings.validation_issue_store:
+        return
+    raw_conn = engine.raw_connection()
+    try:
+        count = copy_validation_issues(
+            raw_conn, validation.tenant_id, validation.id, issues, batch_rows=settings.commit_copy_batch_rows
+        )
+    finally:
+        raw_conn.close()
+    validation.issue_count = count
+    session.commit()
+
+
+def _insert_locations(
+    session: SessionLocal,
+    run: Run,
+    tenant_id: str,
+    exposure_version_id: int,
+    values: Iterable[Dict[str, Any]],
+    total_rows: Optional[int],
+    base_index: Optional[BaseIndex] = None,
+) -> Dict[str, int]:
+    stats = new_delta_stats()
+    values = annotate_delta(values, base_index, stats)
+    if settings.commit_engine == "copy":
+        raw_conn = engine.raw_connection()
+        try:
+            copy_locations(
+                raw_conn,
+                tenant_id,
+                exposure_version_id,
+                values,
+                on_progress=lambda staged: _update_progress(session, run, processed=staged, total=total_rows),
+                batch_rows=settings.commit_copy_batch_rows,
+                columns=DELTA_COPY_COLUMNS,
+            )
+        finally:
+            raw_conn.close()
+    else:
+        session.bulk_save_objects(
+            [Location(tenant_id=tenant_id, exposure_version_id=exposure_version_id, **loc) for loc in values]
+        )
+        session.commit()
+    if stats["unchanged"]:
+        session.execute(
+            text(carry_forward_sql()), {"tenant_id": tenant_id, "exposure_version_id": exposure_version_id}
+        )
+        session.commit()
+    return stats
+
+
+def _exposure_source_version(session: SessionLocal, tenant_id: str, exposure_version_id: int) -> str:
+    # Geocoding and enrichment stamp updated_at on every location they touch, so row count plus the
+    # latest stamp tells whether a snapshot still matches the table.
+    count, updated_at = session.execute(
+        select(func.count(Location.id), func.max(Location.updated_at)).where(
+            Location.tenant_id == tenant_id, Location.exposure_version_id == exposure_version_id
+        )
+    ).one()
+    return f"{count}:{updated_at.isoformat() if updated_at else ''}"
+
+
+def _open_exposure_snapshot(
+    session: SessionLocal, tenant_id: str, exposure_version_id: int
+) -> Optional[ExposureSnapshot]:
+    if not settings.exposure_snapshots:
+        return None
+    snapshot = open_exposure_snapshot(tenant_id, exposure_version_id)
+    if snapshot is None:
+        return None
+    if snapshot.source_version != _exposure_source_version(session, tenant_id, exposure_version_id):
+        return None
+    return snapshot
+
+
+def _write_exposure_snapshot(session: SessionLocal, run: Run, tenant_id: str, exposure_version_id: int) -> None:
+    if not settings.exposure_snapshots:
+        return
+    source_version = _exposure_source_version(session, tenant_id, exposure_version_id)
+    columns = [getattr(Location, name) for name, _ in SNAPSHOT_COLUMNS]
+    rows = session.execute(
+        select(*columns)
+        .where(Location.tenant_id == tenant_id, Location.exposure_version_id == exposure_version_id)
+        .order_by(Location.id)
+        .execution_options(yield_per=50000)
+    )
+    uri, checksum = write_exposure_snapshot(
+        tenant_id,
+        exposure_version_id,
+        rows,
+        lambda key, stream, content_type: upload_stream(key, stream, content_type=content_type)[:2],
+        source_version=source_version,
+    )
+    run.artifact_checksums_json = {**(run.artifact_checksums_json or {}), "exposure_snapshot": checksum}
+    _update_progress(session, run, processed=None, total=None, extra={"exposure_snapshot_uri": uri})
+
+
 @celery_app.task
-def commit_upload(run_id: int, upload_id: str, tenant_id: str, name: str = "Exposure", request_id: Optional[str] = None):
+def commit_upload(
+    run_id: int,
+    upload_id: str,
+    tenant_id: str,
+    name: str = "Exposure",
+    request_id: Optional[str] = None,
+    base_exposure_version_id: Optional[int] = None,
+):
     session = SessionLocal()
     run = session.get(Run, run_id)
     if not run or run.tenant_id != tenant_id:
@@ -692,50 +1015,31 @@ def commit_upload(run_id: int, upload_id: str, tenant_id: str, name: str = "Expo
         mapping = session.get(MappingTemplate, upload.mapping_template_id) if upload.mapping_template_id else None
         tenant = session.get(Tenant, tenant_id)
         key = upload.object_uri.split(f"s3://{settings.minio_bucket}/", 1)[1]
-        raw_bytes = get_object(key)
-        rows = canonicalize_rows(raw_bytes, mapping.template_json if mapping else {})
-        total_rows = len(rows) if hasattr(rows, "__len__") else None
-        _update_progress(session, run, processed=0, total=total_rows)
-        exposure_version = ExposureVersion(
-            tenant_id=tenant_id,
-            upload_id=upload_id,
-            mapping_template_id=upload.mapping_template_id,
-            name=name,
-            idempotency_key=run.config_refs_json.get("idempotency_key") if run.config_refs_json else None,
-        )
-        session.add(exposure_version)
-        session.commit()
-        locations = []
-        for mapped in rows:
-            loc_dict = to_location_dict(mapped)
-            if not (loc_dict.get("lob") or loc_dict.get("product_code")):
-                continue
-            locations.append(
-                Location(
-                    tenant_id=tenant_id,
-                    exposure_version_id=exposure_version.id,
-                    external_location_id=str(loc_dict.get("external_location_id")),
-                    address_line1=loc_dict.get("address_line1"),
-                    city=loc_dict.get("city"),
-                    state_region=loc_dict.get("state_region"),
-                    postal_code=loc_dict.get("postal_code"),
-                    country=loc_dict.get("country"),
-                    latitude=loc_dict.get("latitude"),
-                    longitude=loc_dict.get("longitude"),
-                    currency=(loc_dict.get("currency") or (tenant.default_currency if tenant else None)),
-                    lob=loc_dict.get("lob"),
-                    product_code=loc_dict.get("product_code"),
-                    tiv=loc_dict.get("tiv"),
-                    limit=loc_dict.get("limit"),
-                    premium=loc_dict.get("premium"),
-                )
+        plan = get_ingest_plan(upload.mapping_template_id, mapping.template_json if mapping else {})
+        with record_sorter(settings.commit_sort_buffer_rows, settings.commit_sort_tmp_dir) as sorter:
+            sorter.extend(iter_location_records(iter_text_lines(_upload_chunks(upload, key)), plan))
+            total_rows = len(sorter)
+            _update_progress(session, run, processed=0, total=total_rows)
+            base_index = _load_base_index(session, tenant_id, base_exposure_version_id)
+            exposure_version = _create_exposure_version(session, run, tenant_id, upload, name, base_exposure_version_id)
+            default_currency = tenant.default_currency if tenant else None
+            values = (
+                loc
+                for loc in (record.location_values(default_currency) for record in sorter.sorted())
+                if loc is not None
             )
-        session.bulk_save_objects(locations)
-        session.commit()
+            delta = _insert_locations(session, run, tenant_id, exposure_version.id, values, total_rows, base_index)
+        _write_exposure_snapshot(session, run, tenant_id, exposure_version.id)
+        _publish_exposure_version(exposure_version, upload, mapping.template_json if mapping else {})
         run.status = RunStatus.SUCCEEDED
         run.completed_at = datetime.utcnow()
         run.output_refs_json = merge_run_progress(
-            {"exposure_version_id": exposure_version.id},
+            {
+                "exposure_version_id": exposure_version.id,
+                "exposure_snapshot_uri": (run.output_refs_json or {}).get("exposure_snapshot_uri"),
+                "base_exposure_version_id": base_exposure_version_id,
+                "delta": delta if base_index is not None else None,
+            },
             processed=total_rows,
             total=total_rows,
         )
@@ -751,12 +1055,247 @@ def commit_upload(run_id: int, upload_id: str, tenant_id: str, name: str = "Expo
         session.close()
 
 
+@celery_app.task
+def ingest_upload(
+    run_id: int,
+    upload_id: str,
+    tenant_id: str,
+    name: str = "Exposure",
+    require_clean: bool = True,
+    request_id: Optional[str] = None,
+    base_exposure_version_id: Optional[int] = None,
+):
+    session = SessionLocal()
+    run = session.get(Run, run_id)
+    if not run or run.tenant_id != tenant_id:
+        return
+    try:
+        if run.status == RunStatus.CANCELLED:
+            return
+        _attach_request_id(run, request_id)
+        run.status = RunStatus.RUNNING
+        run.started_at = datetime.utcnow()
+        session.commit()
+        _log_task_start("ingest_upload", run_id, request_id)
+        upload = session.get(ExposureUpload, upload_id)
+        if not upload:
+            raise ValueError("upload not found")
+        mapping = session.get(MappingTemplate, upload.mapping_template_id) if upload.mapping_template_id else None
+        tenant = session.get(Tenant, tenant_id)
+        default_currency = tenant.default_currency if tenant else None
+        key = upload.object_uri.split(f"s3://{settings.minio_bucket}/", 1)[1]
+        key_errs = f"validations/{tenant_id}/{upload_id}/row_errors.json"
+        mapping_json = mapping.template_json if mapping else {}
+        plan = get_ingest_plan(upload.mapping_template_id, mapping_json)
+        with record_sorter(settings.commit_sort_buffer_rows, settings.commit_sort_tmp_dir) as collected:
+            with tempfile.TemporaryFile(prefix="aegis-issues-") as spool:
+                _update_progress(session, run, processed=0, total=None)
+                with MultipartUploadWriter(key_errs, content_type="application/json") as writer:
+                    summary, checksum = validate_csv_streaming(
+                        iter_text_lines(_upload_chunks(upload, key)),
+                        mapping_json,
+                        _tee(writer.write, spool.write),
+                        on_progress=lambda processed: _update_progress(session, run, processed=processed, total=None),
+                        plan=plan,
+                        on_batch=lambda bound, records: collected.extend(map(bound.record, records)),
+                    )
+                total_rows = summary["total_rows"]
+                validation = ValidationResult(
+                    tenant_id=tenant_id,
+                    upload_id=upload_id,
+                    mapping_template_id=upload.mapping_template_id,
+                    summary_json=summary,
+                    row_errors_uri=writer.uri,
+                    checksum=checksum,
+                    content_key=content_key(upload.checksum, mapping_json, settings.code_version),
+                )
+                session.add(validation)
+                session.commit()
+                spool.seek(0)
+                _store_validation_issues(
+                    session, validation, iter_issue_artifact(iter(lambda: spool.read(READ_CHUNK_BYTES), b""))
+                )
+            run.artifact_checksums_json = {"row_errors": checksum}
+            outputs: Dict[str, Any] = {"validation_result_id": validation.id, "exposure_version_id": None}
+            if require_clean and summary.get("ERROR"):
+                outputs["commit_skipped"] = "validation_errors"
+            else:
+                _update_progress(session, run, processed=0, total=total_rows)
+                base_index = _load_base_index(session, tenant_id, base_exposure_version_id)
+                exposure_version = _create_exposure_version(
+                    session, run, tenant_id, upload, name, base_exposure_version_id
+                )
+                values = (
+                    loc
+                    for loc in (record.location_values(default_currency) for record in collected.sorted())
+                    if loc is not None
+                )
+                delta = _insert_locations(session, run, tenant_id, exposure_version.id, values, total_rows, base_index)
+                _write_exposure_snapshot(session, run, tenant_id, exposure_version.id)
+                outputs["exposure_version_id"] = exposure_version.id
+                outputs["base_exposure_version_id"] = base_exposure_version_id
+                outputs["delta"] = delta if base_index is not None else None
+                outputs["exposure_snapshot_uri"] = (run.output_refs_json or {}).get("exposure_snapshot_uri")
+                _publish_exposure_version(exposure_version, upload, mapping_json)
+        run.status = RunStatus.SUCCEEDED
+        run.completed_at = datetime.utcnow()
+        run.output_refs_json = merge_run_progress(outputs, processed=total_rows, total=total_rows)
+        run.code_version = settings.code_version
+        session.commit()
+        return {**outputs, "run_id": run.id}
+    except Exception:
+        run.status = RunStatus.FAILED
+        run.completed_at = datetime.utcnow()
+        session.commit()
+        raise
+    finally:
+        session.close()
+
+
+def _tile_hazard_raster(version: HazardDatasetVersion, chunks: Iterable[bytes]) -> Dict[str, Any]:
+    # The uploaded .npy grid is spooled to disk and re-laid as tiles without loading it into memory.
+    meta = dict(version.raster_json or {})
+    key = raster_key(version.tenant_id, version.hazard_dataset_id, version.id)
+    with tempfile.TemporaryDirectory(prefix="aegis-raster-") as tmp_dir:
+        source_path = os.path.join(tmp_dir, "source.npy")
+        tiles_path = os.path.join(tmp_dir, TILES_NAME)
+        with open(source_path, "wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+        meta.update(write_tiled_raster(source_path, tiles_path, settings.hazard_raster_tile_size, meta.get("nodata")))
+        with open(tiles_path, "rb") as handle:
+            uri, checksum, _ = upload_stream(key, handle, content_type="application/octet-stream")
+        meta.update({"tiles_key": key, "tiles_uri": uri, "checksum": checksum})
+        # Overlays on this worker then memory-map the tiles without downloading them again.
+        cache_hazard_raster(meta, tiles_path)
+    return meta
+
+
+@celery_app.task
+def ingest_hazard_version(
+    run_id: int,
+    hazard_dataset_version_id: int,
+    tenant_id: str,
+    request_id: Optional[str] = None,
+):
+    session = SessionLocal()
+    run = session.get(Run, run_id)
+    if not run or run.tenant_id != tenant_id:
+        return
+    try:
+        if run.status == RunStatus.CANCELLED:
+            return
+        _attach_request_id(run, request_id)
+        run.status = RunStatus.RUNNING
+        run.started_at = datetime.utcnow()
+        session.commit()
+        _log_task_start("ingest_hazard_version", run_id, request_id)
+        version = session.get(HazardDatasetVersion, hazard_dataset_version_id)
+        if not version or version.tenant_id != tenant_id:
+            raise ValueError("hazard dataset version not found")
+        # A retry starts from an empty version so partial loads never double up; parts cascade.
+        version.feature_count = None
+        version.cell_index_zoom = None
+        session.query(HazardCellIndex).filter(
+            HazardCellIndex.tenant_id == tenant_id,
+            HazardCellIndex.hazard_dataset_version_id == version.id,
+        ).delete(synchronize_session=False)
+        session.query(HazardFeaturePolygon).filter(
+            HazardFeaturePolygon.tenant_id == tenant_id,
+            HazardFeaturePolygon.hazard_dataset_version_id == version.id,
+        ).delete(synchronize_session=False)
+        _update_progress(session, run, processed=0, total=None)
+        key = key_from_uri(version.storage_uri)
+        encoding = sniff_encoding(read_object_head(key, MAGIC_BYTES))
+        chunks = iter_decompressed(iter_object_chunks(key), encoding)
+        dataset = session.get(HazardDataset, version.hazard_dataset_id)
+        if dataset and dataset.data_format == DATA_FORMAT_RASTER:
+            version.raster_json = _tile_hazard_raster(version, chunks)
+            feature_count = version.raster_json["valid_cells"]
+            version.feature_count = feature_count
+            outputs = {
+                "hazard_dataset_version_id": version.id,
+                "feature_count": feature_count,
+                "raster_uri": version.raster_json["tiles_uri"],
+            }
+        else:
+            stats = {"skipped": 0}
+            rows = feature_rows(iter_geojson_features(chunks), stats, dataset.peril if dataset else None)
+            raw_conn = engine.raw_connection()
+            try:
+                feature_count = copy_hazard_features(
+                    raw_conn,
+                    tenant_id,
+                    version.id,
+                    rows,
+                    on_progress=lambda staged: _update_progress(session, run, processed=staged, total=None),
+                    batch_rows=settings.commit_copy_batch_rows,
+                    max_vertices=settings.hazard_subdivide_max_vertices,
+                    cell_zoom=settings.hazard_cell_index_zoom,
+                )
+            finally:
+                raw_conn.close()
+            version.feature_count = feature_count
+            version.cell_index_zoom = settings.hazard_cell_index_zoom or None
+            outputs = {
+                "hazard_dataset_version_id": version.id,
+                "feature_count": feature_count,
+                "skipped_features": stats["skipped"],
+            }
+        run.status = RunStatus.SUCCEEDED
+        run.completed_at = datetime.utcnow()
+        run.output_refs_json = merge_run_progress(outputs, processed=feature_count, total=feature_count)
+        run.code_version = settings.code_version
+        session.commit()
+        return {**outputs, "run_id": run.id}
+    except Exception:
+        run.status = RunStatus.FAILED
+        run.completed_at = datetime.utcnow()
+        session.commit()
+        raise
+    finally:
+        session.close()
+
+
+def _geocode_chunk(
+    session: SessionLocal,
+    tenant_id: str,
+    rows: List[Any],
+    geocoder,
+    executor: Optional[ThreadPoolExecutor],
+    errors: Dict[str, int],
+) -> List[Dict[str, Any]]:
+    addresses: Dict[str, Dict[str, Any]] = {}
+    fingerprints: Dict[int, str] = {}
+    for row in rows:
+        if needs_geocode(row):
+            address = location_address(row)
+            fingerprint = address_fingerprint(address)
+            addresses[fingerprint] = address
+            fingerprints[row["id"]] = fingerprint
+    # Each distinct address in the chunk is geocoded once, concurrently, after the cache is consulted.
+    outcomes = geocode_many(addresses, tenant_id, session, geocoder, executor)
+    updates = []
+    for row in rows:
+        geocoded = None
+        fingerprint = fingerprints.get(row["id"])
+        if fingerprint is not None:
+            outcome = outcomes[fingerprint]
+            if isinstance(outcome, ProviderError):
+                errors[outcome.code] = errors.get(outcome.code, 0) + 1
+            else:
+                geocoded = outcome
+        updates.append(geocode_location(row, geocoded))
+    return updates
+
+
 @celery_app.task
 def geocode_and_score(run_id: int, exposure_version_id: int, tenant_id: str, request_id: Optional[str] = None):
     session = SessionLocal()
     run = session.get(Run, run_id)
     if not run or run.tenant_id != tenant_id:
         return
+    executor: Optional[ThreadPoolExecutor] = None
     try:
         if run.status == RunStatus.CANCELLED:
             return
@@ -765,38 +1304,59 @@ def geocode_and_score(run_id: int, exposure_version_id: int, tenant_id: str, req
         run.started_at = datetime.utcnow()
         session.commit()
         _log_task_start("geocode_and_score", run_id, request_id)
-        locations = session.query(Location).filter(
+        # Rows carried from a delta commit's base version already have geocode and quality fields.
+        pending = and_(
             Location.exposure_version_id == exposure_version_id,
             Location.tenant_id == tenant_id,
-        ).all()
-        total_locations = len(locations)
+            or_(Location.source_location_id.is_(None), Location.quality_tier.is_(None)),
+        )
+        carried_forward = session.query(func.count(Location.id)).filter(
+            Location.exposure_version_id == exposure_version_id,
+            Location.tenant_id == tenant_id,
+            Location.source_location_id.isnot(None),
+            Location.quality_tier.isnot(None),
+        ).scalar()
+        total_locations = session.execute(select(func.count(Location.id)).where(pending)).scalar_one()
         _update_progress(session, run, processed=0, total=total_locations)
-        for loc in locations:
-            if loc.latitude is None or loc.longitude is None:
-                lat, lon, conf, method = geocode_address(
-                    loc.address_line1 or "", loc.city or "", loc.country or ""
-                )
-                loc.latitude = lat
-                loc.longitude = lon
-                loc.geocode_method = method
-                loc.geocode_confidence = conf
-            elif loc.geocode_confidence is None:
-                loc.geocode_method = "PROVIDED"
-                loc.geocode_confidence = 1.0
-            scores = quality_scores({
-                "address_line1": loc.address_line1,
-                "tiv": loc.tiv,
-                "geocode_confidence": loc.geocode_confidence,
-            })
-            loc.quality_tier = scores["quality_tier"]
-            loc.quality_reasons_json = scores["reasons"]
-            loc.updated_at = datetime.utcnow()
-        session.commit()
+        columns = [getattr(Location, name) for name in GEOCODE_SOURCE_COLUMNS]
+        geocoder = get_geocoder()
+        workers = 1 if getattr(geocoder, "name", None) == "stub" else settings.geocode_concurrency
+        if workers > 1:
+            executor = ThreadPoolExecutor(max_workers=workers)
+        processed = 0
+        geocode_errors: Dict[str, int] = {}
+        after_id = 0
+        while True:
+            # Keyset over location id so each chunk is an index range scan and memory stays flat.
+            rows = session.execute(
+                select(*columns)
+                .where(pending, Location.id > after_id)
+                .order_by(Location.id.asc())
+                .limit(settings.geocode_chunk_rows)
+            ).mappings().all()
+            if not rows:
+                break
+            updates = _geocode_chunk(session, tenant_id, rows, geocoder, executor, geocode_errors)
+            session.execute(
+                text(bulk_update_sql(len(updates))),
+                bulk_update_params(updates, tenant_id, datetime.utcnow()),
+            )
+            after_id = rows[-1]["id"]
+            processed += len(rows)
+            _update_progress(session, run, processed=processed, total=total_locations)
+        # The commit-time snapshot predates these coordinates and quality tiers.
+        _write_exposure_snapshot(session, run, tenant_id, exposure_version_id)
         run.status = RunStatus.SUCCEEDED
         run.completed_at = datetime.utcnow()
         run.output_refs_json = merge_run_progress(
-            {"exposure_version_id": exposure_version_id},
-            processed=total_locations,
+            {
+                "exposure_version_id": exposure_version_id,
+                "exposure_snapshot_uri": (run.output_refs_json or {}).get("exposure_snapshot_uri"),
+                "carried_forward": carried_forward,
+                "geocode_errors": sum(geocode_errors.values()),
+                "geocode_error_codes": geocode_errors,
+            },
+            processed=processed,
             total=total_locations,
         )
         run.code_version = settings.code_version
@@ -807,6 +1367,8 @@ def geocode_and_score(run_id: int, exposure_version_id: int, tenant_id: str, req
         session.commit()
         raise
     finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
         session.close()
 
 
@@ -840,39 +1402,62 @@ def overlay_hazard(
         if not hdv or hdv.tenant_id != tenant_id:
             raise ValueError("hazard dataset version not found")
         hazard_dataset = session.get(HazardDataset, hdv.hazard_dataset_id)
-        locations = session.query(Location).filter(
+        base_overlay, base_run = _base_run_result(
+            session,
+            HazardOverlayResult,
+            tenant_id,
+            ev,
+            lambda result: result.hazard_dataset_version_id == hazard_dataset_version_id
+            and result.method == overlay_result.method
+            and (result.params_json or {}) == (overlay_result.params_json or {}),
+        )
+        query = session.query(Location).filter(
             Location.tenant_id == tenant_id,
             Location.exposure_version_id == exposure_version_id,
-        ).all()
+        )
+        reused_attrs = 0
+        reused_locations = 0
+        if base_overlay:
+            reuse_params = {
+                "tenant_id": tenant_id,
+                "exposure_version_id": exposure_version_id,
+                "overlay_result_id": overlay_result.id,
+                "base_overlay_result_id": base_overlay.id,
+                "base_completed_at": base_run.completed_at,
+            }
+            reused_attrs = session.execute(text(copy_overlay_attributes_sql()), reuse_params).rowcount
+            reusable = and_(
+                Location.source_location_id.isnot(None),
+                or_(Location.updated_at.is_(None), Location.updated_at <= base_run.completed_at),
+            )
+            reused_locations = query.filter(reusable).count()
+            query = query.filter(not_(reusable))
+            session.commit()
+        locations = query.all()
         total_locations = len(locations)
         _update_progress(session, run, processed=0, total=total_locations)
+        raster = hazard_dataset is not None and hazard_dataset.data_format == DATA_FORMAT_RASTER
+        overlay_method = "RASTER_SAMPLE" if raster else "POSTGIS_SPATIAL_JOIN"
+        lookup_stats: Dict[str, int] = {"cell_hits": 0, "exact": 0}
+        location_entries = iter_location_hazard_entries(
+            session,
+            tenant_id,
+            locations,
+            [] if raster else [hazard_dataset_version_id],
+            load_hazard_rasters(session, tenant_id, [hazard_dataset_version_id]) if raster else [],
+            stats=lookup_stats,
+        )
         saved_attrs = []
         processed = 0
-        for loc in locations:
+        for loc, entries in location_entries:
             if loc.latitude is None or loc.longitude is None:
                 processed += 1
                 continue
-            geom_point = func.ST_SetSRID(func.ST_MakePoint(loc.longitude, loc.latitude), 4326)
-            features = (
-                session.query(HazardFeaturePolygon)
-                .filter(
-                    HazardFeaturePolygon.tenant_id == tenant_id,
-                    HazardFeaturePolygon.hazard_dataset_version_id == hazard_dataset_version_id,
-                    func.ST_Contains(HazardFeaturePolygon.geom, geom_point),
-                )
-                .all()
-            )
-            if not features:
+            if not entries:
                 continue
             hazards: Dict[str, Dict] = {}
-            for feature in features:
-                entry = extract_hazard_entry(
-                    feature.properties_json or {},
-                    hazard_dataset.peril if hazard_dataset else None,
-                    hazard_dataset.name if hazard_dataset else str(hdv.hazard_dataset_id),
-                    hdv.version_label,
-                )
-                merge_worst_in_peril(hazards, entry, tie_breaker_id=feature.id)
+            for entry, feature_id in entries:
+                merge_worst_in_peril(hazards, entry, tie_breaker_id=feature_id)
             if not hazards:
                 continue
             best_entry = None
@@ -901,10 +1486,10 @@ def overlay_hazard(
             attributes = {
                 "hazard_category": best_entry.get("peril"),
                 "band": best_entry.get("band"),
-                "percentile": props.get("percentile"),
+                "percentile": best_entry.get("percentile"),
                 "score": best_entry.get("score"),
                 "source": best_entry.get("source"),
-                "method": "POSTGIS_SPATIAL_JOIN",
+                "method": overlay_method,
                 "raw": props,
             }
             saved_attrs.append(
@@ -927,8 +1512,11 @@ def overlay_hazard(
             {
                 "hazard_overlay_result_id": overlay_result.id,
                 "summary": {
-                    "locations": len(locations),
-                    "attributes_created": len(saved_attrs),
+                    "locations": len(locations) + reused_locations,
+                    "attributes_created": len(saved_attrs) + reused_attrs,
+                    "reused_from_overlay_result_id": base_overlay.id if base_overlay else None,
+                    "locations_reused": reused_locations,
+                    "hazard_lookup": lookup_stats,
                 },
             },
             processed=processed,
@@ -945,6 +1533,15 @@ def overlay_hazard(
         session.close()
 
 
+def _reusable_base_item(base_items: Dict[int, ResilienceScoreItem], loc: Location) -> Optional[ResilienceScoreItem]:
+    base_item = base_items.get(loc.id)
+    if base_item is not None and (base_item.result_json or {}).get("input_structural") != normalize_structural(
+        loc.structural_json
+    ):
+        return None
+    return base_item
+
+
 @celery_app.task
 def compute_resilience_scores(
     run_id: int,
@@ -977,6 +1574,31 @@ def compute_resilience_scores(
             Location.tenant_id == tenant_id,
             Location.exposure_version_id == exposure_version_id,
         ).all()
+        ev = session.get(ExposureVersion, exposure_version_id)
+        base_score, base_run = _base_run_result(
+            session,
+            ResilienceScoreResult,
+            tenant_id,
+            ev,
+            lambda result: result.scoring_version == score_result.scoring_version
+            and result.code_version == score_result.code_version
+            and sorted(result.hazard_dataset_version_ids_json or []) == sorted(hazard_dataset_version_ids or [])
+            and (result.scoring_config_json or {}) == (score_result.scoring_config_json or {}),
+        ) if ev else (None, None)
+        base_items: Dict[int, ResilienceScoreItem] = {}
+        if base_score:
+            rows = session.execute(
+                select(Location.id, ResilienceScoreItem)
+                .join(ResilienceScoreItem, ResilienceScoreItem.location_id == Location.source_location_id)
+                .where(
+                    Location.tenant_id == tenant_id,
+                    Location.exposure_version_id == exposure_version_id,
+                    ResilienceScoreItem.resilience_score_result_id == base_score.id,
+                    or_(Location.updated_at.is_(None), Location.updated_at <= base_run.completed_at),
+                )
+            ).all()
+            base_items = {location_id: item for location_id, item in rows}
+        reused = 0
         total_locations = len(locations)
         _update_progress(session, run, processed=0, total=total_locations)
         scored = 0
@@ -990,8 +1612,21 @@ def compute_resilience_scores(
         batch_size = 1000
         batch: List[ResilienceScoreItem] = []
         version_ids = hazard_dataset_version_ids or []
+        rasters = load_hazard_rasters(session, tenant_id, version_ids)
+        raster_ids = {raster.version_id for raster, _, _, _ in rasters}
+        vector_ids = [version_id for version_id in version_ids if version_id not in raster_ids]
+        lookup_stats: Dict[str, int] = {"cell_hits": 0, "exact": 0}
+        location_entries = iter_location_hazard_entries(
+            session,
+            tenant_id,
+            locations,
+            vector_ids,
+            rasters,
+            wanted=lambda loc: _reusable_base_item(base_items, loc) is None,
+            stats=lookup_stats,
+        )
 
-        for loc in locations:
+        for loc, entries in location_entries:
             if loc.latitude is None or loc.longitude is None:
                 skipped_missing_coords += 1
                 continue
@@ -1002,32 +1637,10 @@ def compute_resilience_scores(
                 with_structural_count += 1
             else:
                 without_structural_count += 1
-            hazards: Dict[str, Dict] = {}
-            if version_ids:
-                geom_point = func.ST_SetSRID(func.ST_MakePoint(loc.longitude, loc.latitude), 4326)
-                rows = session.execute(
-                    select(HazardFeaturePolygon, HazardDatasetVersion, HazardDataset)
-                    .join(
-                        HazardDatasetVersion,
-                        HazardFeaturePolygon.hazard_dataset_version_id == HazardDatasetVersion.id,
-                    )
-                    .join(HazardDataset, HazardDatasetVersion.hazard_dataset_id == HazardDataset.id)
-                    .where(
-                        HazardFeaturePolygon.tenant_id == tenant_id,
-                        HazardDatasetVersion.tenant_id == tenant_id,
-                        HazardDataset.tenant_id == tenant_id,
-                        HazardFeaturePolygon.hazard_dataset_version_id.in_(version_ids),
-                        func.ST_Contains(HazardFeaturePolygon.geom, geom_point),
-                    )
-                ).all()
-                for feature, version, dataset in rows:
-                    entry = extract_hazard_entry(
-                        feature.properties_json or {},
-                        dataset.peril,
-                        dataset.name,
-                        version.version_label,
-                    )
-                    merge_worst_in_peril(hazards, entry, tie_breaker_id=feature.id)
+            base_item = _reusable_base_item(base_items, loc)
+            hazards: Dict[str, Dict] = base_item.hazards_json if base_item is not None else {}
+            for entry, feature_id in entries:
+                merge_worst_in_peril(hazards, entry, tie_breaker_id=feature_id)
             update_peril_coverage(peril_coverage, hazards, perils)
             fallback_used = any(
                 peril not in hazards or hazards.get(peril, {}).get("score") is None
@@ -1036,25 +1649,41 @@ def compute_resilience_scores(
             if fallback_used:
                 unknown_hazard_fallback_used_count += 1
 
-            normalized_hazards = {
-                peril: {k: v for k, v in entry.items() if k != "_tie_breaker_id"}
-                for peril, entry in hazards.items()
-            }
-            result_payload = compute_resilience_score(normalized_hazards, structural, config)
-            result_with_input = dict(result_payload)
-            result_with_input["input_structural"] = structural
-            batch.append(
-                ResilienceScoreItem(
-                    tenant_id=tenant_id,
-                    resilience_score_result_id=score_result_id,
-                    location_id=loc.id,
-                    resilience_score=result_payload["resilience_score"],
-                    risk_score=result_payload["risk_score"],
-                    hazards_json=normalized_hazards,
-                    result_json=result_with_input,
+            if base_item is not None:
+                # Unchanged row from the delta base with the same structural input: reuse its score.
+                batch.append(
+                    ResilienceScoreItem(
+                        tenant_id=tenant_id,
+                        resilience_score_result_id=score_result_id,
+                        location_id=loc.id,
+                        resilience_score=base_item.resilience_score,
+                        risk_score=base_item.risk_score,
+                        hazards_json=base_item.hazards_json,
+                        result_json=base_item.result_json,
+                    )
                 )
-            )
-            scored += 1
+                reused += 1
+                scored += 1
+            else:
+                normalized_hazards = {
+                    peril: {k: v for k, v in entry.items() if k != "_tie_breaker_id"}
+                    for peril, entry in hazards.items()
+                }
+                result_payload = compute_resilience_score(normalized_hazards, structural, config)
+                result_with_input = dict(result_payload)
+                result_with_input["input_structural"] = structural
+                batch.append(
+                    ResilienceScoreItem(
+                        tenant_id=tenant_id,
+                        resilience_score_result_id=score_result_id,
+                        location_id=loc.id,
+                        resilience_score=result_payload["resilience_score"],
+                        risk_score=result_payload["risk_score"],
+                        hazards_json=normalized_hazards,
+                        result_json=result_with_input,
+                    )
+                )
+                scored += 1
 
             if len(batch) >= batch_size:
                 session.bulk_save_objects(batch)
@@ -1078,6 +1707,9 @@ def compute_resilience_scores(
                 "peril_coverage": peril_coverage,
                 "unknown_hazard_fallback_used_count": unknown_hazard_fallback_used_count,
                 "missing_tiv_count": missing_tiv_count,
+                "reused_from_resilience_score_result_id": base_score.id if base_score else None,
+                "reused": reused,
+                "hazard_lookup": lookup_stats,
             },
             processed=scored + skipped_missing_coords,
             total=total_locations,
@@ -1158,7 +1790,7 @@ def enrich_property_profile(
         if not profile:
             profile = PropertyProfile(tenant_id=tenant_id, address_fingerprint=fingerprint)
 
-        payload = run_enrichment_pipeline(address_json)
+        payload = run_enrichment_pipeline(address_json, tenant_id, session)
         profile.address_fingerprint = payload["address_fingerprint"]
         profile.standardized_address_json = payload["standardized_address_json"]
         profile.geocode_json = payload["geocode_json"]
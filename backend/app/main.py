@@ -5,6 +5,7 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from .storage.s3 import ensure_bucket
+from .services.providers.clients import close_http_clients
 
 from .api.routes import router
 from .api.schemas import build_api_error
@@ -38,6 +39,11 @@ def startup_event():
         # bucket creation best-effort
         pass
 
+
+@app.on_event("shutdown")
+def shutdown_event():
+    close_http_clients()
+
 app.middleware("http")(correlation_middleware)
 app.include_router(router)
 
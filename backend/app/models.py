@@ -4,6 +4,7 @@ from typing import Any, Optional
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
@@ -41,6 +42,8 @@ class RunType(str, enum.Enum):
     RESILIENCE_SCORE = "RESILIENCE_SCORE"
     PROPERTY_ENRICHMENT = "PROPERTY_ENRICHMENT"
     UW_EVAL = "UW_EVAL"
+    INGEST = "INGEST"
+    HAZARD_INGEST = "HAZARD_INGEST"
 
 
 class RunStatus(str, enum.Enum):
@@ -127,15 +130,23 @@ class ExposureUpload(Base):
     tenant_id = Column(String, ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
     filename = Column(String, nullable=False)
     object_uri = Column(String, nullable=False)
-    checksum = Column(String, nullable=False)
+    checksum = Column(String, nullable=True)
     idempotency_key = Column(String, nullable=True)
     created_by = Column(String, ForeignKey("user.id", ondelete="SET NULL"))
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    status = Column(String, nullable=False, default="COMPLETE", server_default="COMPLETE")
+    multipart_upload_id = Column(String, nullable=True)
+    part_size = Column(Integer, nullable=True)
+    parts_json = Column(JSON, nullable=True)
+    size_bytes = Column(BigInteger, nullable=True)
+    content_encoding = Column(String, nullable=True)
+    duplicate_of_upload_id = Column(String, ForeignKey("exposure_upload.id", ondelete="SET NULL"), nullable=True)
 
     mapping_template_id = Column(Integer, ForeignKey("mapping_template.id"))
 
     __table_args__ = (
         Index("ix_upload_tenant_created", "tenant_id", "created_at"),
+        Index("ix_upload_tenant_checksum", "tenant_id", "checksum"),
         UniqueConstraint("tenant_id", "idempotency_key", name="uq_upload_tenant_idempotency"),
     )
 
@@ -198,9 +209,37 @@ class ValidationResult(Base):
     summary_json = Column(JSON, nullable=False)
     row_errors_uri = Column(String, nullable=False)
     checksum = Column(String, nullable=False)
+    issue_count = Column(Integer, nullable=True)
+    content_key = Column(String, nullable=True)
+    source_validation_result_id = Column(
+        Integer, ForeignKey("validation_result.id", ondelete="SET NULL"), nullable=True
+    )
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
-    __table_args__ = (Index("ix_validation_tenant_created", "tenant_id", "created_at"),)
+    __table_args__ = (
+        Index("ix_validation_tenant_created", "tenant_id", "created_at"),
+        Index("ix_validation_tenant_content_key", "tenant_id", "content_key"),
+    )
+
+
+class ValidationIssue(Base):
+    __tablename__ = "validation_issue"
+
+    validation_result_id = Column(
+        Integer, ForeignKey("validation_result.id", ondelete="CASCADE"), primary_key=True
+    )
+    seq = Column(BigInteger, primary_key=True)
+    tenant_id = Column(String, ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
+    row_number = Column(Integer, nullable=False)
+    severity = Column(String, nullable=False)
+    field = Column(String, nullable=False)
+    code = Column(String, nullable=False)
+    message = Column(String, nullable=False)
+
+    __table_args__ = (
+        Index("ix_validation_issue_severity", "validation_result_id", "severity", "seq"),
+        Index("ix_validation_issue_code", "validation_result_id", "code", "seq"),
+    )
 
 
 class DriftRun(Base):
@@ -247,9 +286,14 @@ class ExposureVersion(Base):
     mapping_template_id = Column(Integer, ForeignKey("mapping_template.id", ondelete="SET NULL"))
     name = Column(String, nullable=False)
     idempotency_key = Column(String, nullable=True)
+    base_exposure_version_id = Column(Integer, ForeignKey("exposure_version.id", ondelete="SET NULL"), nullable=True)
+    content_key = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
-    __table_args__ = (Index("ix_exposure_version_tenant_created", "tenant_id", "created_at"),)
+    __table_args__ = (
+        Index("ix_exposure_version_tenant_created", "tenant_id", "created_at"),
+        Index("ix_exposure_version_tenant_content_key", "tenant_id", "content_key"),
+    )
 
 
 class Location(Base):
@@ -277,12 +321,15 @@ class Location(Base):
     quality_tier = Column(String, nullable=True)
     quality_reasons_json = Column(JSON, nullable=True)
     structural_json = Column(JSON, nullable=True)
+    row_hash = Column(String, nullable=True)
+    source_location_id = Column(Integer, ForeignKey("location.id", ondelete="SET NULL"), nullable=True)
     updated_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     __table_args__ = (
         UniqueConstraint("tenant_id", "exposure_version_id", "external_location_id", name="uq_location_unique"),
         Index("ix_location_tenant_created", "tenant_id", "created_at"),
+        Index("ix_location_source_location", "source_location_id"),
     )
 
 
@@ -309,6 +356,20 @@ class PropertyProfile(Base):
     )
 
 
+class GeocodeCacheEntry(Base):
+    __tablename__ = "geocode_cache"
+
+    tenant_id = Column(String, ForeignKey("tenant.id", ondelete="CASCADE"), primary_key=True)
+    provider = Column(String, primary_key=True)
+    provider_version = Column(String, primary_key=True)
+    address_fingerprint = Column(String, primary_key=True)
+    result_json = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (Index("ix_geocode_cache_expires", "expires_at"),)
+
+
 class HazardDataset(Base):
     __tablename__ = "hazard_dataset"
 
@@ -319,6 +380,7 @@ class HazardDataset(Base):
     vendor = Column(String, nullable=True)
     coverage_geo = Column(String, nullable=True)
     license_ref = Column(String, nullable=True)
+    data_format = Column(String, nullable=False, default="vector", server_default="vector")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     __table_args__ = (Index("ix_hazard_dataset_tenant_created", "tenant_id", "created_at"),)
@@ -334,6 +396,9 @@ class HazardDatasetVersion(Base):
     storage_uri = Column(String, nullable=False)
     checksum = Column(String, nullable=False)
     effective_date = Column(DateTime, nullable=True)
+    feature_count = Column(Integer, nullable=True)
+    raster_json = Column(JSON, nullable=True)
+    cell_index_zoom = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     __table_args__ = (
@@ -350,10 +415,45 @@ class HazardFeaturePolygon(Base):
     hazard_dataset_version_id = Column(Integer, ForeignKey("hazard_dataset_version.id", ondelete="CASCADE"), nullable=False)
     geom = Column(Geometry("MULTIPOLYGON", srid=4326))
     properties_json = Column(JSON, nullable=True)
+    peril = Column(String, nullable=True)
+    score = Column(Float, nullable=True)
+    band = Column(String, nullable=True)
+    percentile = Column(Float, nullable=True)
 
     __table_args__ = (
         Index("ix_hazard_feature_polygon_tenant", "tenant_id"),
+        Index("ix_hazard_feature_polygon_version_peril_score", "hazard_dataset_version_id", "peril", "score"),
+    )
+
+
+class HazardFeaturePart(Base):
+    __tablename__ = "hazard_feature_part"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tenant_id = Column(String, ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
+    hazard_dataset_version_id = Column(Integer, ForeignKey("hazard_dataset_version.id", ondelete="CASCADE"), nullable=False)
+    hazard_feature_polygon_id = Column(
+        Integer, ForeignKey("hazard_feature_polygon.id", ondelete="CASCADE"), nullable=False
     )
+    geom = Column(Geometry("GEOMETRY", srid=4326), nullable=False)
+
+    __table_args__ = (
+        Index("ix_hazard_feature_part_tenant_version", "tenant_id", "hazard_dataset_version_id"),
+        Index("ix_hazard_feature_part_feature", "hazard_feature_polygon_id"),
+    )
+
+
+class HazardCellIndex(Base):
+    __tablename__ = "hazard_cell_index"
+
+    hazard_dataset_version_id = Column(
+        Integer, ForeignKey("hazard_dataset_version.id", ondelete="CASCADE"), primary_key=True
+    )
+    cell_x = Column(Integer, primary_key=True)
+    cell_y = Column(Integer, primary_key=True)
+    tenant_id = Column(String, ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
+    covered_feature_ids_json = Column(JSON, nullable=False)
+    boundary_feature_ids_json = Column(JSON, nullable=False)
 
 
 class HazardOverlayResult(Base):
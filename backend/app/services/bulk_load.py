@@ -0,0 +1,140 @@
+import io
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+LOCATION_COPY_COLUMNS = [
+    ("external_location_id", "text"),
+    ("address_line1", "text"),
+    ("city", "text"),
+    ("state_region", "text"),
+    ("postal_code", "text"),
+    ("country", "text"),
+    ("latitude", "double precision"),
+    ("longitude", "double precision"),
+    ("currency", "text"),
+    ("lob", "text"),
+    ("product_code", "text"),
+    ("tiv", "double precision"),
+    ("limit", "double precision"),
+    ("premium", "double precision"),
+]
+COPY_BATCH_ROWS = 50000
+
+
+def copy_text_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, float):
+        return repr(value)
+    text = str(value)
+    return (
+        text.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def encode_copy_row(values: Sequence[Any]) -> bytes:
+    return ("\t".join(copy_text_value(v) for v in values) + "\n").encode()
+
+
+class CopyRowReader(io.RawIOBase):
+    def __init__(self, rows: Iterable[bytes]):
+        self._rows = iter(rows)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._rows)
+            except StopIteration:
+                break
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def readline(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+
+def _quote(name: str) -> str:
+    return f'"{name}"'
+
+
+def stage_ddl(table: str, columns: List) -> str:
+    cols = ", ".join(f"{_quote(name)} {sql_type}" for name, sql_type in columns)
+    return f"CREATE TEMP TABLE {table} (seq bigint, {cols}) ON COMMIT DROP"
+
+
+def _copy_sql(table: str, columns: List) -> str:
+    cols = ", ".join(["seq"] + [_quote(name) for name, _ in columns])
+    return f"COPY {table} ({cols}) FROM STDIN"
+
+
+def copy_rows_to_stage(
+    cursor,
+    table: str,
+    columns: List,
+    rows: Iterable[Dict[str, Any]],
+    on_progress: Optional[Callable[[int], None]] = None,
+    batch_rows: int = COPY_BATCH_ROWS,
+) -> int:
+    names = [name for name, _ in columns]
+    copy_sql = _copy_sql(table, columns)
+    iterator: Iterator = enumerate(rows)
+    staged = 0
+    while True:
+        batch = islice(iterator, batch_rows)
+        counter = {"rows": 0}
+
+        def encoded():
+            for seq, row in batch:
+                counter["rows"] += 1
+                yield encode_copy_row([seq] + [row.get(name) for name in names])
+
+        cursor.copy_expert(copy_sql, CopyRowReader(encoded()))
+        if not counter["rows"]:
+            break
+        staged += counter["rows"]
+        if on_progress:
+            on_progress(staged)
+        if counter["rows"] < batch_rows:
+            break
+    return staged
+
+
+def copy_locations(
+    dbapi_connection,
+    tenant_id: str,
+    exposure_version_id: int,
+    rows: Iterable[Dict[str, Any]],
+    on_progress: Optional[Callable[[int], None]] = None,
+    batch_rows: int = COPY_BATCH_ROWS,
+    columns: List = LOCATION_COPY_COLUMNS,
+) -> int:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(stage_ddl("location_stage", columns))
+        copy_rows_to_stage(cursor, "location_stage", columns, rows, on_progress, batch_rows)
+        cols = ", ".join(_quote(name) for name, _ in columns)
+        # ORDER BY seq keeps location ids in canonical row order, matching the ORM path.
+        cursor.execute(
+            f"INSERT INTO location (tenant_id, exposure_version_id, {cols}, created_at) "
+            f"SELECT %(tenant_id)s, %(exposure_version_id)s, {cols}, timezone('utc', now()) "
+            "FROM location_stage ORDER BY seq",
+            {"tenant_id": tenant_id, "exposure_version_id": exposure_version_id},
+        )
+        inserted = cursor.rowcount
+        dbapi_connection.commit()
+        return inserted
+    except Exception:
+        dbapi_connection.rollback()
+        raise
+    finally:
+        cursor.close()
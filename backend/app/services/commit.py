@@ -1,18 +1,29 @@
 import csv
 import io
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
+from app.services.compression import decompress_bytes
+from app.services.external_sort import ExternalSorter
 
-def canonicalize_rows(raw_bytes: bytes, mapping: Dict) -> List[Dict]:
-    reader = csv.DictReader(io.StringIO(raw_bytes.decode()))
-    rows = []
-    for row in reader:
-        mapped = {dst: row.get(src, "") for src, dst in mapping.items()} if mapping else row
-        rows.append(mapped)
-    rows.sort(key=lambda r: str(r.get("external_location_id", "")))
+
+def canonicalize_rows(raw_bytes: bytes, mapping: Dict, buffer_rows: int = 0) -> Iterable[Dict]:
+    reader = csv.DictReader(io.StringIO(decompress_bytes(raw_bytes).decode()))
+    mapped_rows = (
+        ({dst: row.get(src, "") for src, dst in mapping.items()} if mapping else row) for row in reader
+    )
+    if buffer_rows:
+        sorter = ExternalSorter(canonical_sort_key, buffer_rows)
+        sorter.extend(mapped_rows)
+        return sorter.sorted()
+    rows = list(mapped_rows)
+    rows.sort(key=canonical_sort_key)
     return rows
 
 
+def canonical_sort_key(mapped: Dict) -> str:
+    return str(mapped.get("external_location_id", ""))
+
+
 def parse_float(val):
     try:
         return float(val)
@@ -38,3 +49,11 @@ def to_location_dict(mapped: Dict) -> Dict:
         "premium": parse_float(mapped.get("premium")),
     }
 
+
+def location_values(mapped: Dict, default_currency: Optional[str] = None) -> Optional[Dict]:
+    loc_dict = to_location_dict(mapped)
+    if not (loc_dict.get("lob") or loc_dict.get("product_code")):
+        return None
+    loc_dict["external_location_id"] = str(loc_dict.get("external_location_id"))
+    loc_dict["currency"] = loc_dict.get("currency") or default_currency
+    return loc_dict
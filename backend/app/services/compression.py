@@ -0,0 +1,84 @@
+import zlib
+from typing import Iterable, Iterator, Optional
+
+ENCODING_GZIP = "gzip"
+ENCODING_ZSTD = "zstd"
+SUPPORTED_ENCODINGS = (ENCODING_GZIP, ENCODING_ZSTD)
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+MAGIC_BYTES = max(len(GZIP_MAGIC), len(ZSTD_MAGIC))
+
+_DECLARED = {
+    "gzip": ENCODING_GZIP,
+    "x-gzip": ENCODING_GZIP,
+    "application/gzip": ENCODING_GZIP,
+    "application/x-gzip": ENCODING_GZIP,
+    "zstd": ENCODING_ZSTD,
+    "application/zstd": ENCODING_ZSTD,
+}
+
+
+def declared_encoding(*values: Optional[str]) -> Optional[str]:
+    # Content-Encoding style values or compressed content types; the first recognised one wins.
+    for value in values:
+        if value:
+            encoding = _DECLARED.get(value.split(";", 1)[0].strip().lower())
+            if encoding:
+                return encoding
+    return None
+
+
+def sniff_encoding(head: bytes) -> Optional[str]:
+    if head.startswith(GZIP_MAGIC):
+        return ENCODING_GZIP
+    if head.startswith(ZSTD_MAGIC):
+        return ENCODING_ZSTD
+    return None
+
+
+def _zstd_decompressobj():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd uploads require the zstandard package") from None
+    return zstandard.ZstdDecompressor().decompressobj
+
+
+def _gzip_decompressobj():
+    return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+
+def iter_decompressed(chunks: Iterable[bytes], encoding: Optional[str]) -> Iterator[bytes]:
+    if not encoding:
+        yield from chunks
+        return
+    if encoding == ENCODING_GZIP:
+        factory = _gzip_decompressobj
+    elif encoding == ENCODING_ZSTD:
+        factory = _zstd_decompressobj()
+    else:
+        raise ValueError(f"unsupported content encoding {encoding}")
+    decompressor = factory()
+    in_member = False
+    for chunk in chunks:
+        # Concatenated gzip members / zstd frames are valid; start a fresh decompressor at each boundary.
+        while chunk:
+            in_member = True
+            data = decompressor.decompress(chunk)
+            if data:
+                yield data
+            if not decompressor.eof:
+                break
+            chunk = decompressor.unused_data
+            decompressor = factory()
+            in_member = False
+    if in_member:
+        raise ValueError("truncated compressed upload")
+
+
+def decompress_bytes(raw: bytes, encoding: Optional[str] = None) -> bytes:
+    encoding = encoding or sniff_encoding(raw[:MAGIC_BYTES])
+    if not encoding:
+        return raw
+    return b"".join(iter_decompressed([raw], encoding))
@@ -0,0 +1,21 @@
+import hashlib
+from typing import Any, Dict, Optional
+
+from app.services.ingest_plan import template_checksum
+
+
+def content_key(upload_checksum: Optional[str], template_json: Optional[Dict], code_version: str) -> Optional[str]:
+    # Same stored bytes + same mapping + same code produce the same validation and commit output.
+    if not upload_checksum:
+        return None
+    payload = f"{upload_checksum}:{template_checksum(template_json)}:{code_version}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def reuse_refs(kind: str, source_id: int, source_upload_id: Optional[str], key: str) -> Dict[str, Any]:
+    return {
+        f"{kind}_id": source_id,
+        f"reused_{kind}_id": source_id,
+        "reused_from_upload_id": source_upload_id,
+        "content_key": key,
+    }
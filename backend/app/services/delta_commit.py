@@ -0,0 +1,84 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from app.services.bulk_load import LOCATION_COPY_COLUMNS
+
+DELTA_COPY_COLUMNS = LOCATION_COPY_COLUMNS + [("row_hash", "text"), ("source_location_id", "integer")]
+ROW_HASH_FIELDS = [name for name, _ in LOCATION_COPY_COLUMNS]
+# Columns filled by geocoding, quality scoring and enrichment after commit; carried from the base row.
+CARRIED_COLUMNS = [
+    "latitude",
+    "longitude",
+    "geocode_method",
+    "geocode_confidence",
+    "quality_tier",
+    "quality_reasons_json",
+    "structural_json",
+    "updated_at",
+]
+
+# external_location_id -> (location id, row_hash) for the base exposure version.
+BaseIndex = Dict[str, Tuple[int, Optional[str]]]
+
+
+def location_row_hash(values: Dict[str, Any]) -> str:
+    payload = json.dumps([values.get(name) for name in ROW_HASH_FIELDS], separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def new_delta_stats() -> Dict[str, int]:
+    return {"new": 0, "changed": 0, "unchanged": 0, "removed": 0}
+
+
+def annotate_delta(
+    values: Iterable[Dict[str, Any]], base_index: Optional[BaseIndex], stats: Dict[str, int]
+) -> Iterator[Dict[str, Any]]:
+    # Rows whose committed values hash the same as the base row are linked to it via
+    # source_location_id; everything else is new work for geocode, overlay and scoring.
+    matched = 0
+    for loc in values:
+        row_hash = location_row_hash(loc)
+        source_location_id = None
+        base = base_index.get(loc["external_location_id"]) if base_index else None
+        if base is None:
+            stats["new"] += 1
+        else:
+            matched += 1
+            if base[1] == row_hash:
+                source_location_id = base[0]
+                stats["unchanged"] += 1
+            else:
+                stats["changed"] += 1
+        yield {**loc, "row_hash": row_hash, "source_location_id": source_location_id}
+    stats["removed"] = len(base_index or {}) - matched
+
+
+def carry_forward_sql() -> str:
+    assignments = ", ".join(f'"{name}" = base."{name}"' for name in CARRIED_COLUMNS)
+    return (
+        f"UPDATE location AS loc SET {assignments} FROM location AS base "
+        "WHERE loc.source_location_id = base.id AND base.tenant_id = :tenant_id "
+        "AND loc.tenant_id = :tenant_id AND loc.exposure_version_id = :exposure_version_id"
+    )
+
+
+def reused_location_filter_sql() -> str:
+    # A carried row can reuse a base result only if its carried geocode/enrichment state
+    # (updated_at) is not newer than the base run that produced the result.
+    return (
+        "loc.source_location_id IS NOT NULL "
+        "AND (loc.updated_at IS NULL OR loc.updated_at <= :base_completed_at)"
+    )
+
+
+def copy_overlay_attributes_sql() -> str:
+    return (
+        "INSERT INTO location_hazard_attribute "
+        "(tenant_id, location_id, hazard_overlay_result_id, attributes_json) "
+        "SELECT :tenant_id, loc.id, :overlay_result_id, attr.attributes_json "
+        "FROM location AS loc JOIN location_hazard_attribute AS attr "
+        "ON attr.location_id = loc.source_location_id AND attr.hazard_overlay_result_id = :base_overlay_result_id "
+        "WHERE loc.tenant_id = :tenant_id AND loc.exposure_version_id = :exposure_version_id "
+        f"AND {reused_location_filter_sql()} ORDER BY loc.id"
+    )
@@ -0,0 +1,239 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.storage.s3 import download_object, get_object_or_none
+
+settings = get_settings()
+
+SNAPSHOT_FORMAT = "npy-columns/v1"
+MANIFEST_NAME = "manifest.json"
+SNAPSHOT_CHUNK_ROWS = 50000
+READ_CHUNK_BYTES = 1024 * 1024
+
+SNAPSHOT_COLUMNS: List[Tuple[str, str]] = [
+    ("id", "int64"),
+    ("external_location_id", "string"),
+    ("address_line1", "string"),
+    ("city", "string"),
+    ("state_region", "string"),
+    ("postal_code", "string"),
+    ("country", "string"),
+    ("latitude", "float64"),
+    ("longitude", "float64"),
+    ("currency", "string"),
+    ("lob", "string"),
+    ("product_code", "string"),
+    ("quality_tier", "string"),
+    ("tiv", "float64"),
+    ("limit", "float64"),
+    ("premium", "float64"),
+]
+
+
+def snapshot_prefix(tenant_id: str, exposure_version_id: int) -> str:
+    return f"snapshots/{tenant_id}/exposure_versions/{exposure_version_id}"
+
+
+def _write_npy(path: str, raw_path: str, dtype: str, count: int) -> None:
+    # Same bytes np.save would produce, with the body copied from a spill file written chunk by chunk.
+    with open(path, "wb") as out, open(raw_path, "rb") as raw:
+        header = {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False, "shape": (count,)}
+        np.lib.format.write_array_header_1_0(out, header)
+        shutil.copyfileobj(raw, out, READ_CHUNK_BYTES)
+
+
+def manifest_bytes(manifest: Dict[str, Any]) -> bytes:
+    return json.dumps(manifest, sort_keys=True, separators=(",", ":")).encode()
+
+
+def write_exposure_snapshot(
+    tenant_id: str,
+    exposure_version_id: int,
+    rows: Iterable[Sequence[Any]],
+    put: Callable[[str, BinaryIO, str], Tuple[str, str]],
+    chunk_rows: int = SNAPSHOT_CHUNK_ROWS,
+    tmp_dir: Optional[str] = None,
+    source_version: Optional[str] = None,
+) -> Tuple[str, str]:
+    # put(key, stream, content_type) uploads one file and returns (uri, sha256). Rows are consumed in
+    # chunks and each column is appended to its own spill file, so memory stays flat apart from the
+    # string dictionaries, which grow with distinct values only.
+    prefix = snapshot_prefix(tenant_id, exposure_version_id)
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as work:
+        spills = {name: open(os.path.join(work, f"{name}.raw"), "wb") for name, _ in SNAPSHOT_COLUMNS}
+        valid_spills = {
+            name: open(os.path.join(work, f"{name}.valid.raw"), "wb")
+            for name, kind in SNAPSHOT_COLUMNS
+            if kind != "string"
+        }
+        dictionaries: Dict[str, Dict[str, int]] = {name: {} for name, kind in SNAPSHOT_COLUMNS if kind == "string"}
+        nulls = {name: False for name in valid_spills}
+        row_count = 0
+        try:
+            iterator = iter(rows)
+            while True:
+                chunk = list(islice(iterator, chunk_rows))
+                if not chunk:
+                    break
+                row_count += len(chunk)
+                for (name, kind), values in zip(SNAPSHOT_COLUMNS, zip(*chunk)):
+                    if kind == "string":
+                        # Dictionary-encoded in first-seen order; -1 marks NULL.
+                        dictionary = dictionaries[name]
+                        codes = [-1 if v is None else dictionary.setdefault(v, len(dictionary)) for v in values]
+                        spills[name].write(np.array(codes, dtype=np.int32).tobytes())
+                        continue
+                    valid = np.fromiter((v is not None for v in values), dtype=bool, count=len(values))
+                    fill = 0 if kind == "int64" else np.nan
+                    spills[name].write(np.array([fill if v is None else v for v in values], dtype=kind).tobytes())
+                    valid_spills[name].write(valid.tobytes())
+                    nulls[name] = nulls[name] or not valid.all()
+        finally:
+            for handle in list(spills.values()) + list(valid_spills.values()):
+                handle.close()
+
+        manifest_columns: List[Dict[str, Any]] = []
+        for name, kind in SNAPSHOT_COLUMNS:
+            files: List[Tuple[str, str]] = []
+            raw = os.path.join(work, f"{name}.raw")
+            if kind == "string":
+                _write_npy(os.path.join(work, f"{name}.codes.npy"), raw, "int32", row_count)
+                with open(os.path.join(work, f"{name}.dict.json"), "w") as handle:
+                    json.dump(list(dictionaries[name]), handle, separators=(",", ":"))
+                files = [(f"{name}.codes.npy", "application/octet-stream"), (f"{name}.dict.json", "application/json")]
+            else:
+                _write_npy(os.path.join(work, f"{name}.npy"), raw, kind, row_count)
+                files = [(f"{name}.npy", "application/octet-stream")]
+                if nulls[name]:
+                    valid_raw = os.path.join(work, f"{name}.valid.raw")
+                    _write_npy(os.path.join(work, f"{name}.valid.npy"), valid_raw, "bool", row_count)
+                    files.append((f"{name}.valid.npy", "application/octet-stream"))
+            checksums = {}
+            for filename, content_type in files:
+                with open(os.path.join(work, filename), "rb") as handle:
+                    checksums[filename] = put(f"{prefix}/{filename}", handle, content_type)[1]
+            manifest_columns.append({"name": name, "kind": kind, "files": [f for f, _ in files], "checksums": checksums})
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "exposure_version_id": exposure_version_id,
+        "row_count": row_count,
+        "source_version": source_version,
+        "columns": manifest_columns,
+    }
+    body = manifest_bytes(manifest)
+    # The manifest goes last so readers never see a partially written snapshot.
+    uri, _ = put(f"{prefix}/{MANIFEST_NAME}", io.BytesIO(body), "application/json")
+    return uri, hashlib.sha256(body).hexdigest()
+
+
+class ExposureSnapshot:
+    def __init__(self, manifest: Dict[str, Any], fetch: Callable[[str], str]):
+        self.manifest = manifest
+        self._columns = {entry["name"]: entry for entry in manifest["columns"]}
+        self._fetch = fetch
+        self._cache: Dict[str, Any] = {}
+
+    @property
+    def row_count(self) -> int:
+        return int(self.manifest["row_count"])
+
+    @property
+    def source_version(self) -> Optional[str]:
+        return self.manifest.get("source_version")
+
+    @property
+    def column_names(self) -> List[str]:
+        return [entry["name"] for entry in self.manifest["columns"]]
+
+    def _entry(self, name: str) -> Dict[str, Any]:
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise KeyError(f"column {name} not in snapshot") from None
+
+    def _load_npy(self, filename: str) -> np.ndarray:
+        if filename not in self._cache:
+            self._cache[filename] = np.load(self._fetch(filename), mmap_mode="r", allow_pickle=False)
+        return self._cache[filename]
+
+    def array(self, name: str) -> np.ndarray:
+        entry = self._entry(name)
+        if entry["kind"] == "string":
+            return self.codes(name)[0]
+        return self._load_npy(f"{name}.npy")
+
+    def valid(self, name: str) -> np.ndarray:
+        entry = self._entry(name)
+        if entry["kind"] == "string":
+            return self.codes(name)[0] >= 0
+        if f"{name}.valid.npy" in entry["files"]:
+            return self._load_npy(f"{name}.valid.npy")
+        return np.ones(self.row_count, dtype=bool)
+
+    def codes(self, name: str) -> Tuple[np.ndarray, List[str]]:
+        entry = self._entry(name)
+        if entry["kind"] != "string":
+            raise ValueError(f"column {name} is not a string column")
+        key = f"{name}.dict.json"
+        if key not in self._cache:
+            with open(self._fetch(key), "rb") as handle:
+                self._cache[key] = json.load(handle)
+        return self._load_npy(f"{name}.codes.npy"), self._cache[key]
+
+    def values(self, name: str) -> List[Any]:
+        entry = self._entry(name)
+        if entry["kind"] == "string":
+            codes, dictionary = self.codes(name)
+            return [dictionary[c] if c >= 0 else None for c in codes.tolist()]
+        data = self.array(name).tolist()
+        valid = self.valid(name).tolist()
+        return [v if ok else None for v, ok in zip(data, valid)]
+
+    def iter_records(self, fields: Sequence[str]) -> Iterator[Dict[str, Any]]:
+        columns = [self.values(field) for field in fields]
+        for row in zip(*columns):
+            yield dict(zip(fields, row))
+
+
+def local_file_fetcher(cache_dir: str, download: Callable[[str, Any], Any], prefix: str) -> Callable[[str], str]:
+    def fetch(filename: str) -> str:
+        path = os.path.join(cache_dir, filename)
+        if not os.path.exists(path):
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f".{filename}.")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    download(f"{prefix}/{filename}", handle)
+                os.replace(tmp_path, path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        return path
+
+    return fetch
+
+
+def open_exposure_snapshot(
+    tenant_id: str, exposure_version_id: int, cache_dir: Optional[str] = None
+) -> Optional[ExposureSnapshot]:
+    prefix = snapshot_prefix(tenant_id, exposure_version_id)
+    body = get_object_or_none(f"{prefix}/{MANIFEST_NAME}")
+    if body is None:
+        return None
+    cache_dir = os.path.join(
+        cache_dir or settings.snapshot_cache_dir,
+        tenant_id,
+        str(exposure_version_id),
+        hashlib.sha256(body).hexdigest()[:16],
+    )
+    return ExposureSnapshot(json.loads(body), local_file_fetcher(cache_dir, download_object, prefix))
@@ -0,0 +1,82 @@
+import heapq
+import pickle
+import tempfile
+from typing import IO, Any, Callable, Iterable, Iterator, List, Optional
+
+SPILL_CHUNK_ROWS = 1000
+
+
+def _write_run(items: List[Any], tmp_dir: Optional[str]) -> IO[bytes]:
+    handle = tempfile.TemporaryFile(prefix="aegis-sort-", dir=tmp_dir)
+    for start in range(0, len(items), SPILL_CHUNK_ROWS):
+        pickle.dump(items[start : start + SPILL_CHUNK_ROWS], handle, protocol=pickle.HIGHEST_PROTOCOL)
+    handle.seek(0)
+    return handle
+
+
+def _read_run(handle: IO[bytes]) -> Iterator[Any]:
+    try:
+        while True:
+            try:
+                chunk = pickle.load(handle)
+            except EOFError:
+                return
+            yield from chunk
+    finally:
+        handle.close()
+
+
+class ExternalSorter:
+    # Buffers up to buffer_rows items, spilling each full buffer as a sorted run to a temp file.
+    # Runs are merged in spill order, so items with equal keys keep their input order.
+    def __init__(self, key: Callable[[Any], Any], buffer_rows: int = 0, tmp_dir: Optional[str] = None):
+        self.key = key
+        self.buffer_rows = buffer_rows
+        self.tmp_dir = tmp_dir
+        self.count = 0
+        self.spilled_runs = 0
+        self._buffer: List[Any] = []
+        self._runs: List[IO[bytes]] = []
+        self._merging: List[IO[bytes]] = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, item: Any) -> None:
+        self._buffer.append(item)
+        self.count += 1
+        if self.buffer_rows and len(self._buffer) >= self.buffer_rows:
+            self._spill()
+
+    def extend(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.add(item)
+
+    def _spill(self) -> None:
+        self._buffer.sort(key=self.key)
+        self._runs.append(_write_run(self._buffer, self.tmp_dir))
+        self.spilled_runs += 1
+        self._buffer = []
+
+    def sorted(self) -> Iterator[Any]:
+        self._buffer.sort(key=self.key)
+        buffer, self._buffer = self._buffer, []
+        runs, self._runs = self._runs, []
+        self._merging.extend(runs)
+        if not runs:
+            return iter(buffer)
+        return heapq.merge(*(_read_run(handle) for handle in runs), iter(buffer), key=self.key)
+
+    def close(self) -> None:
+        # Also closes runs handed to an unfinished merge, e.g. when the consumer failed midway.
+        for handle in self._runs + self._merging:
+            handle.close()
+        self._runs = []
+        self._merging = []
+        self._buffer = []
+
+    def __enter__(self) -> "ExternalSorter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
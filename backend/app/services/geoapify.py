@@ -5,6 +5,8 @@ from typing import Any, Dict, List, Optional
 import httpx
 
 from app.core.config import get_settings
+from app.services.providers.circuit_breaker import get_circuit_breaker
+from app.services.providers.clients import get_http_client
 
 
 def _normalize_country_code(value: Optional[str]) -> Optional[str]:
@@ -31,11 +33,29 @@ def geoapify_autocomplete(text: str, limit: int = 5, country_code: Optional[str]
     if normalized_country:
         params["filter"] = f"countrycode:{normalized_country}"
 
-    timeout = httpx.Timeout(settings.provider_timeout_seconds, connect=settings.provider_connect_timeout_seconds)
-    with httpx.Client(timeout=timeout) as client:
-        response = client.get(settings.geoapify_autocomplete_url, params=params)
+    breaker = get_circuit_breaker("geoapify")
+    if breaker is not None:
+        breaker.before_call()
+    try:
+        response = get_http_client("geoapify").get(settings.geoapify_autocomplete_url, params=params)
         response.raise_for_status()
         payload = response.json()
+    except (httpx.TransportError, httpx.HTTPStatusError) as exc:
+        status = exc.response.status_code if isinstance(exc, httpx.HTTPStatusError) else None
+        if breaker is not None:
+            if status is None or status == 429 or status >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        raise
+    except Exception:
+        # Decoding and redirect errors still prove the vendor answered; recording an outcome here
+        # also releases a half-open probe slot.
+        if breaker is not None:
+            breaker.record_success()
+        raise
+    if breaker is not None:
+        breaker.record_success()
 
     results = payload.get("results") or payload.get("features") or []
     suggestions: List[Dict[str, Any]] = []
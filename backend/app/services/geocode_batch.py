@@ -0,0 +1,81 @@
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Union
+
+from app.core.config import get_settings
+from app.services.geocode_cache import GeocodeCache, get_geocode_cache
+from app.services.providers.base import GeocodeResult, ProviderError
+
+GeocodeOutcome = Union[GeocodeResult, ProviderError]
+
+
+def _forward_geocode(geocoder, address: Dict[str, Any]) -> GeocodeOutcome:
+    try:
+        return geocoder.forward_geocode(address)
+    except ProviderError as exc:
+        return exc
+
+
+def geocode_concurrently(
+    geocoder, addresses: Dict[str, Dict[str, Any]], executor: Optional[Executor] = None
+) -> Dict[str, GeocodeOutcome]:
+    # Provider calls only; the adapter's rate limiter and backoff apply inside each call.
+    if getattr(geocoder, "batch_size", 0) > 0:
+        return _geocode_batches(geocoder, addresses, executor)
+    if executor is None or len(addresses) <= 1:
+        return {fingerprint: _forward_geocode(geocoder, address) for fingerprint, address in addresses.items()}
+    futures = {
+        fingerprint: executor.submit(_forward_geocode, geocoder, address)
+        for fingerprint, address in addresses.items()
+    }
+    return {fingerprint: future.result() for fingerprint, future in futures.items()}
+
+
+def _geocode_batches(
+    geocoder, addresses: Dict[str, Dict[str, Any]], executor: Optional[Executor]
+) -> Dict[str, GeocodeOutcome]:
+    fingerprints = list(addresses)
+    size = geocoder.batch_size
+    batches = [fingerprints[start : start + size] for start in range(0, len(fingerprints), size)]
+
+    def run(batch: List[str]) -> List[GeocodeOutcome]:
+        try:
+            return geocoder.forward_geocode_batch([addresses[fingerprint] for fingerprint in batch])
+        except ProviderError as exc:
+            return [exc for _ in batch]
+
+    if executor is None or len(batches) <= 1:
+        outcomes = [run(batch) for batch in batches]
+    else:
+        outcomes = list(executor.map(run, batches))
+    return {
+        fingerprint: outcome
+        for batch, batch_outcomes in zip(batches, outcomes)
+        for fingerprint, outcome in zip(batch, batch_outcomes)
+    }
+
+
+def geocode_many(
+    addresses: Dict[str, Dict[str, Any]],
+    tenant_id: Optional[str],
+    session,
+    geocoder,
+    executor: Optional[Executor] = None,
+    cache: Optional[GeocodeCache] = None,
+) -> Dict[str, GeocodeOutcome]:
+    # addresses maps address_fingerprint -> normalized address. Cache reads and writes stay on the
+    # calling thread (they use its session) and are batched per call; only misses go to the worker pool.
+    cache = cache or get_geocode_cache()
+    use_cache = tenant_id is not None and get_settings().geocode_cache_enabled
+    provider = getattr(geocoder, "name", "unknown")
+    results: Dict[str, GeocodeOutcome] = {}
+    if use_cache:
+        results.update(cache.lookup_many(session, tenant_id, provider, addresses))
+    misses = {fingerprint: address for fingerprint, address in addresses.items() if fingerprint not in results}
+    fresh: Dict[str, GeocodeResult] = {}
+    for fingerprint, outcome in geocode_concurrently(geocoder, misses, executor).items():
+        results[fingerprint] = outcome
+        if not isinstance(outcome, ProviderError) and outcome.get("lat") is not None and outcome.get("lon") is not None:
+            fresh[fingerprint] = outcome
+    if use_cache:
+        cache.store_many(session, tenant_id, provider, fresh)
+    return results
@@ -0,0 +1,179 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import get_settings
+from app.models import GeocodeCacheEntry
+from app.services.providers import get_geocoder
+from app.services.providers.base import GeocodeResult
+
+CacheKey = Tuple[str, str, str, str]
+DB_BATCH_SIZE = 1000
+
+
+class GeocodeCache:
+    # In-process LRU in front of the tenant-scoped geocode_cache table. Entries are tagged with the
+    # provider name and AEGIS_GEOCODE_CACHE_VERSION so switching vendors never serves stale coordinates.
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: int,
+        version: str,
+        now: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.version = version
+        self.now = now
+        self._entries: "OrderedDict[CacheKey, Tuple[datetime, GeocodeResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0, "expired": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _remember(self, key: CacheKey, expires_at: datetime, result: GeocodeResult) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def lookup(self, session, tenant_id: str, provider: str, fingerprint: str) -> Optional[GeocodeResult]:
+        return self.lookup_many(session, tenant_id, provider, [fingerprint]).get(fingerprint)
+
+    def lookup_many(
+        self, session, tenant_id: str, provider: str, fingerprints: Iterable[str]
+    ) -> Dict[str, GeocodeResult]:
+        # Memory first; the remaining fingerprints cost one IN query per DB_BATCH_SIZE.
+        now = self.now()
+        found: Dict[str, GeocodeResult] = {}
+        pending: List[str] = []
+        with self._lock:
+            for fingerprint in dict.fromkeys(fingerprints):
+                key = (tenant_id, provider, self.version, fingerprint)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if entry[0] > now:
+                        self._entries.move_to_end(key)
+                        self._stats["memory_hits"] += 1
+                        found[fingerprint] = entry[1]
+                        continue
+                    del self._entries[key]
+                    self._stats["expired"] += 1
+                pending.append(fingerprint)
+        if session is not None:
+            for start in range(0, len(pending), DB_BATCH_SIZE):
+                rows = session.execute(
+                    select(
+                        GeocodeCacheEntry.address_fingerprint,
+                        GeocodeCacheEntry.result_json,
+                        GeocodeCacheEntry.expires_at,
+                    ).where(
+                        GeocodeCacheEntry.tenant_id == tenant_id,
+                        GeocodeCacheEntry.provider == provider,
+                        GeocodeCacheEntry.provider_version == self.version,
+                        GeocodeCacheEntry.address_fingerprint.in_(pending[start : start + DB_BATCH_SIZE]),
+                        GeocodeCacheEntry.expires_at > now,
+                    )
+                ).all()
+                for row in rows:
+                    found[row.address_fingerprint] = row.result_json
+                    key = (tenant_id, provider, self.version, row.address_fingerprint)
+                    self._remember(key, row.expires_at, row.result_json)
+                    self._count("db_hits")
+        with self._lock:
+            self._stats["misses"] += sum(1 for fingerprint in pending if fingerprint not in found)
+        return found
+
+    def store(self, session, tenant_id: str, provider: str, fingerprint: str, result: GeocodeResult) -> None:
+        self.store_many(session, tenant_id, provider, {fingerprint: result})
+
+    def store_many(self, session, tenant_id: str, provider: str, results: Dict[str, GeocodeResult]) -> None:
+        now = self.now()
+        expires_at = now + self.ttl
+        for fingerprint, result in results.items():
+            self._remember((tenant_id, provider, self.version, fingerprint), expires_at, result)
+        with self._lock:
+            self._stats["stores"] += len(results)
+        if session is None or not results:
+            return
+        # Written in the caller's transaction; a rolled-back request simply re-geocodes next time.
+        items = list(results.items())
+        for start in range(0, len(items), DB_BATCH_SIZE):
+            stmt = insert(GeocodeCacheEntry).values(
+                [
+                    {
+                        "tenant_id": tenant_id,
+                        "provider": provider,
+                        "provider_version": self.version,
+                        "address_fingerprint": fingerprint,
+                        "result_json": result,
+                        "created_at": now,
+                        "expires_at": expires_at,
+                    }
+                    for fingerprint, result in items[start : start + DB_BATCH_SIZE]
+                ]
+            )
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["tenant_id", "provider", "provider_version", "address_fingerprint"],
+                    set_={"result_json": stmt.excluded.result_json, "created_at": now, "expires_at": expires_at},
+                )
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "memory_entries": len(self._entries), "version": self.version}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: Optional[GeocodeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_geocode_cache() -> GeocodeCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                settings = get_settings()
+                _cache = GeocodeCache(
+                    settings.geocode_cache_memory_entries,
+                    settings.geocode_cache_ttl_seconds,
+                    settings.geocode_cache_version,
+                )
+    return _cache
+
+
+def cached_forward_geocode(
+    normalized_address: Dict[str, Any],
+    fingerprint: str,
+    tenant_id: Optional[str],
+    session=None,
+    geocoder=None,
+    cache: Optional[GeocodeCache] = None,
+) -> GeocodeResult:
+    # Callers pass normalize_address() output and its address_fingerprint; ProviderError propagates uncached.
+    geocoder = geocoder or get_geocoder()
+    if tenant_id is None or not get_settings().geocode_cache_enabled:
+        return geocoder.forward_geocode(normalized_address)
+    cache = cache or get_geocode_cache()
+    provider = getattr(geocoder, "name", "unknown")
+    result = cache.lookup(session, tenant_id, provider, fingerprint)
+    if result is not None:
+        return result
+    result = geocoder.forward_geocode(normalized_address)
+    if result.get("lat") is not None and result.get("lon") is not None:
+        cache.store(session, tenant_id, provider, fingerprint, result)
+    return result
@@ -0,0 +1,191 @@
+import codecs
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from app.services.bulk_load import COPY_BATCH_ROWS, stage_ddl, copy_rows_to_stage
+from app.services.hazard_lookup import build_cell_index_params, build_cell_index_sql
+from app.services.hazard_query import hazard_columns
+
+HAZARD_FEATURE_COPY_COLUMNS = [
+    ("geom_json", "text"),
+    ("properties_json", "text"),
+    ("peril", "text"),
+    ("score", "double precision"),
+    ("band", "text"),
+    ("percentile", "double precision"),
+]
+# ST_Subdivide rejects caps below 5 vertices.
+MIN_SUBDIVIDE_VERTICES = 5
+_WHITESPACE = " \t\r\n"
+
+
+class _TextStream:
+    # Incrementally decoded text with a cursor; read_more() appends the next chunk.
+    def __init__(self, chunks: Iterable[bytes], encoding: str):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.buffer = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def read_more(self, min_chars: int = 1) -> bool:
+        if self.exhausted:
+            return False
+        # Drop consumed text so the buffer only ever holds the value being parsed.
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+        parts = []
+        read = 0
+        for chunk in self.chunks:
+            text = self.decoder.decode(chunk)
+            if text:
+                parts.append(text)
+                read += len(text)
+                if read >= min_chars:
+                    self.buffer += "".join(parts)
+                    return True
+        parts.append(self.decoder.decode(b"", final=True))
+        self.buffer += "".join(parts)
+        self.exhausted = True
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"invalid GeoJSON: expected {char!r}")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete until the stream is exhausted; a value ending exactly at the buffer edge
+                # may be a truncated number, so numbers are also re-read once more data arrives.
+                # Each retry at least doubles the pending text, so a large feature is re-parsed
+                # O(log n) times rather than once per chunk.
+                if self.read_more(len(self.buffer) - self.pos):
+                    continue
+                raise ValueError("invalid GeoJSON") from None
+            if end == len(self.buffer) and not self.exhausted and not isinstance(value, (dict, list, str)):
+                self.read_more()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_geojson_features(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[Dict[str, Any]]:
+    # Streams the "features" array of a FeatureCollection one feature at a time; other top-level
+    # members (type, crs, bbox, name) are parsed and discarded.
+    decoder = json.JSONDecoder()
+    stream = _TextStream(chunks, encoding)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value(decoder)
+        if not isinstance(key, str):
+            raise ValueError("invalid GeoJSON: expected member name")
+        stream.expect(":")
+        if key == "features":
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.pos += 1
+            else:
+                while True:
+                    feature = stream.value(decoder)
+                    if isinstance(feature, dict):
+                        yield feature
+                    separator = stream.peek()
+                    stream.pos += 1
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise ValueError("invalid GeoJSON: expected ',' or ']' in features")
+        else:
+            stream.value(decoder)
+        separator = stream.peek()
+        stream.pos += 1
+        if separator == "}":
+            break
+        if separator != ",":
+            raise ValueError("invalid GeoJSON: expected ',' or '}'")
+    if stream.peek():
+        raise ValueError("invalid GeoJSON: trailing data")
+
+
+def feature_rows(
+    features: Iterable[Dict[str, Any]], stats: Dict[str, int], dataset_peril: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    for feature in features:
+        geom = feature.get("geometry")
+        if not geom:
+            stats["skipped"] += 1
+            continue
+        properties = feature.get("properties") or {}
+        yield {
+            "geom_json": json.dumps(geom, separators=(",", ":")),
+            "properties_json": json.dumps(properties, separators=(",", ":")),
+            **hazard_columns(properties, dataset_peril),
+        }
+
+
+def copy_hazard_features(
+    dbapi_connection,
+    tenant_id: str,
+    hazard_dataset_version_id: int,
+    rows: Iterable[Dict[str, Any]],
+    on_progress: Optional[Callable[[int], None]] = None,
+    batch_rows: int = COPY_BATCH_ROWS,
+    max_vertices: int = 256,
+    cell_zoom: Optional[int] = None,
+) -> int:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(stage_ddl("hazard_feature_stage", HAZARD_FEATURE_COPY_COLUMNS))
+        copy_rows_to_stage(cursor, "hazard_feature_stage", HAZARD_FEATURE_COPY_COLUMNS, rows, on_progress, batch_rows)
+        # Geometry parsing happens once, set-based, inside PostGIS; ORDER BY seq keeps file order in ids.
+        cursor.execute(
+            "INSERT INTO hazard_feature_polygon (tenant_id, hazard_dataset_version_id, geom, properties_json, "
+            "peril, score, band, percentile) "
+            "SELECT %(tenant_id)s, %(hazard_dataset_version_id)s, "
+            "ST_Multi(ST_SetSRID(ST_GeomFromGeoJSON(geom_json), 4326)), properties_json::json, "
+            "peril, score, band, percentile "
+            "FROM hazard_feature_stage ORDER BY seq",
+            {"tenant_id": tenant_id, "hazard_dataset_version_id": hazard_dataset_version_id},
+        )
+        inserted = cursor.rowcount
+        subdivide_hazard_features(cursor, tenant_id, hazard_dataset_version_id, max_vertices)
+        if cell_zoom:
+            cursor.execute(build_cell_index_sql(), build_cell_index_params(tenant_id, hazard_dataset_version_id, cell_zoom))
+        dbapi_connection.commit()
+        return inserted
+    except Exception:
+        dbapi_connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def subdivide_hazard_features(cursor, tenant_id: str, hazard_dataset_version_id: int, max_vertices: int) -> None:
+    # Point lookups probe these pieces; each keeps a pointer back to its source feature.
+    cursor.execute(
+        "INSERT INTO hazard_feature_part (tenant_id, hazard_dataset_version_id, hazard_feature_polygon_id, geom) "
+        "SELECT tenant_id, hazard_dataset_version_id, id, ST_Subdivide(geom, %(max_vertices)s) "
+        "FROM hazard_feature_polygon "
+        "WHERE tenant_id = %(tenant_id)s AND hazard_dataset_version_id = %(hazard_dataset_version_id)s",
+        {
+            "tenant_id": tenant_id,
+            "hazard_dataset_version_id": hazard_dataset_version_id,
+            "max_vertices": max(MIN_SUBDIVIDE_VERTICES, int(max_vertices)),
+        },
+    )
@@ -0,0 +1,265 @@
+import math
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Integer, func, literal, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.models import (
+    HazardCellIndex,
+    HazardDataset,
+    HazardDatasetVersion,
+    HazardFeaturePart,
+    HazardFeaturePolygon,
+)
+from app.services.hazard_raster import HazardRaster, sample_hazard_entries
+
+CELL_FETCH_CHUNK = 500
+LOOKUP_CHUNK_LOCATIONS = 1000
+CellEntry = Tuple[List[int], List[int]]
+RasterSource = Tuple[HazardRaster, Optional[str], str, str]
+
+
+def feature_contains_point(tenant_id: str, version_ids: Iterable[int], point):
+    # Filter for HazardFeaturePolygon rows containing point, boundary excluded like ST_Contains on the
+    # raw vendor polygon. The GIST probe runs against the small ST_Subdivide parts with intersects,
+    # since a point on an internal cut line lies on the boundary of every piece it touches; the exact
+    # check then runs on the union of just those pieces, whose interior near the point is the feature's.
+    parts = (
+        select(HazardFeaturePart.hazard_feature_polygon_id)
+        .where(
+            HazardFeaturePart.tenant_id == tenant_id,
+            HazardFeaturePart.hazard_dataset_version_id.in_(list(version_ids)),
+            func.ST_Intersects(HazardFeaturePart.geom, point),
+        )
+        .group_by(HazardFeaturePart.hazard_feature_polygon_id)
+        .having(func.ST_Contains(func.ST_Union(HazardFeaturePart.geom), point))
+    )
+    return HazardFeaturePolygon.id.in_(parts)
+
+
+def cell_size(zoom: int) -> Tuple[float, float]:
+    # Quadtree over lon/lat: zoom z splits the world into 2^z x 2^z cells.
+    return 360.0 / (1 << zoom), 180.0 / (1 << zoom)
+
+
+def cell_xy(lon: float, lat: float, zoom: int) -> Tuple[int, int]:
+    width, height = cell_size(zoom)
+    return int(math.floor((lon + 180.0) / width)), int(math.floor((lat + 90.0) / height))
+
+
+def build_cell_index_sql() -> str:
+    # Driven from the ST_Subdivide parts: each small part is tested against the few cells its own bbox
+    # touches, never the full vendor polygon against every cell of its bbox. A feature covers a cell
+    # when the cell lies in the interior of one of its parts (ST_ContainsProperly), so no point of a
+    # covered cell can sit on the feature's edge. Cells touching a part's boundary, including cells
+    # only covered by the union of several parts, are recorded as boundary and get the exact check.
+    return (
+        "INSERT INTO hazard_cell_index (hazard_dataset_version_id, cell_x, cell_y, tenant_id, "
+        "covered_feature_ids_json, boundary_feature_ids_json) "
+        "SELECT %(hazard_dataset_version_id)s, c.x, c.y, %(tenant_id)s, "
+        "COALESCE(json_agg(c.feature_id ORDER BY c.feature_id) FILTER (WHERE c.covers), '[]'::json), "
+        "COALESCE(json_agg(c.feature_id ORDER BY c.feature_id) FILTER (WHERE NOT c.covers), '[]'::json) "
+        "FROM ("
+        "SELECT p.hazard_feature_polygon_id AS feature_id, x, y, bool_or(ST_ContainsProperly(p.geom, e.env)) AS covers "
+        "FROM hazard_feature_part AS p "
+        "CROSS JOIN LATERAL generate_series("
+        "floor((ST_XMin(p.geom) + 180) / %(width)s)::int, floor((ST_XMax(p.geom) + 180) / %(width)s)::int) AS x "
+        "CROSS JOIN LATERAL generate_series("
+        "floor((ST_YMin(p.geom) + 90) / %(height)s)::int, floor((ST_YMax(p.geom) + 90) / %(height)s)::int) AS y "
+        "CROSS JOIN LATERAL (SELECT ST_MakeEnvelope("
+        "x * %(width)s - 180, y * %(height)s - 90, (x + 1) * %(width)s - 180, (y + 1) * %(height)s - 90, 4326"
+        ") AS env) AS e "
+        "WHERE p.tenant_id = %(tenant_id)s AND p.hazard_dataset_version_id = %(hazard_dataset_version_id)s "
+        "AND ST_Intersects(p.geom, e.env) "
+        "GROUP BY p.hazard_feature_polygon_id, x, y"
+        ") AS c GROUP BY c.x, c.y"
+    )
+
+
+def build_cell_index_params(tenant_id: str, hazard_dataset_version_id: int, zoom: int) -> Dict[str, object]:
+    width, height = cell_size(zoom)
+    return {
+        "tenant_id": tenant_id,
+        "hazard_dataset_version_id": hazard_dataset_version_id,
+        "width": width,
+        "height": height,
+    }
+
+
+def _fetch_cells(
+    session, tenant_id: str, version_id: int, cells: Sequence[Tuple[int, int]]
+) -> Dict[Tuple[int, int], CellEntry]:
+    found: Dict[Tuple[int, int], CellEntry] = {}
+    for start in range(0, len(cells), CELL_FETCH_CHUNK):
+        rows = session.execute(
+            select(
+                HazardCellIndex.cell_x,
+                HazardCellIndex.cell_y,
+                HazardCellIndex.covered_feature_ids_json,
+                HazardCellIndex.boundary_feature_ids_json,
+            ).where(
+                HazardCellIndex.tenant_id == tenant_id,
+                HazardCellIndex.hazard_dataset_version_id == version_id,
+                tuple_(HazardCellIndex.cell_x, HazardCellIndex.cell_y).in_(cells[start : start + CELL_FETCH_CHUNK]),
+            )
+        ).all()
+        for row in rows:
+            found[(row.cell_x, row.cell_y)] = (row.covered_feature_ids_json, row.boundary_feature_ids_json)
+    return found
+
+
+def lookup_feature_ids(
+    session,
+    tenant_id: str,
+    version_ids: Sequence[int],
+    points: Sequence[Tuple[float, float]],
+    stats: Optional[Dict[str, int]] = None,
+) -> List[List[int]]:
+    # Matching HazardFeaturePolygon ids per (lon, lat) point. Indexed versions answer from their cell
+    # rows; a missing cell means no feature touches it. Only boundary candidates and versions built
+    # before the index existed go to PostGIS.
+    if not version_ids or not points:
+        return [[] for _ in points]
+    zooms = dict(
+        session.execute(
+            select(HazardDatasetVersion.id, HazardDatasetVersion.cell_index_zoom).where(
+                HazardDatasetVersion.tenant_id == tenant_id,
+                HazardDatasetVersion.id.in_(list(version_ids)),
+            )
+        ).all()
+    )
+    unindexed = [version_id for version_id in version_ids if zooms.get(version_id) is None]
+    covered: List[Set[int]] = [set() for _ in points]
+    boundary: List[Set[int]] = [set() for _ in points]
+    for version_id, zoom in zooms.items():
+        if zoom is None:
+            continue
+        point_cells = [cell_xy(lon, lat, zoom) for lon, lat in points]
+        cells = _fetch_cells(session, tenant_id, version_id, sorted(set(point_cells)))
+        for index, cell in enumerate(point_cells):
+            entry = cells.get(cell)
+            if entry is not None:
+                covered[index].update(entry[0])
+                boundary[index].update(entry[1])
+    results: List[List[int]] = []
+    for index, (lon, lat) in enumerate(points):
+        ids = set(covered[index])
+        if boundary[index] or unindexed:
+            point = func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)
+            candidates = []
+            if boundary[index]:
+                candidates.append(HazardFeaturePolygon.id.in_(sorted(boundary[index])))
+            if unindexed:
+                candidates.append(HazardFeaturePolygon.hazard_dataset_version_id.in_(unindexed))
+            ids.update(
+                session.execute(
+                    select(HazardFeaturePolygon.id).where(
+                        HazardFeaturePolygon.tenant_id == tenant_id,
+                        or_(*candidates),
+                        feature_contains_point(tenant_id, version_ids, point),
+                    )
+                ).scalars().all()
+            )
+            if stats is not None:
+                stats["exact"] = stats.get("exact", 0) + 1
+        elif stats is not None:
+            stats["cell_hits"] = stats.get("cell_hits", 0) + 1
+        results.append(sorted(ids))
+    return results
+
+
+def worst_hazard_entries(
+    session, tenant_id: str, ids_per_point: Sequence[Sequence[int]]
+) -> List[List[Tuple[Dict[str, Any], int]]]:
+    # Worst feature per (point, peril) chosen in SQL from the typed columns, ordered like
+    # merge_worst_in_peril: highest score, numeric before NULL, lowest feature id on ties.
+    results: List[List[Tuple[Dict[str, Any], int]]] = [[] for _ in ids_per_point]
+    pairs = [(index, feature_id) for index, ids in enumerate(ids_per_point) for feature_id in ids]
+    if not pairs:
+        return results
+    matches = select(
+        func.unnest(literal([index for index, _ in pairs], ARRAY(Integer))).label("point"),
+        func.unnest(literal([feature_id for _, feature_id in pairs], ARRAY(Integer))).label("feature_id"),
+    ).subquery()
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=(matches.c.point, HazardFeaturePolygon.peril),
+            order_by=(HazardFeaturePolygon.score.desc().nullslast(), HazardFeaturePolygon.id.asc()),
+        )
+        .label("rank")
+    )
+    ranked = (
+        select(
+            matches.c.point,
+            HazardFeaturePolygon.id,
+            HazardFeaturePolygon.peril,
+            HazardFeaturePolygon.score,
+            HazardFeaturePolygon.band,
+            HazardFeaturePolygon.percentile,
+            HazardFeaturePolygon.properties_json,
+            HazardDataset.name,
+            HazardDatasetVersion.version_label,
+            rank,
+        )
+        .join(HazardFeaturePolygon, HazardFeaturePolygon.id == matches.c.feature_id)
+        .join(HazardDatasetVersion, HazardFeaturePolygon.hazard_dataset_version_id == HazardDatasetVersion.id)
+        .join(HazardDataset, HazardDatasetVersion.hazard_dataset_id == HazardDataset.id)
+        .where(
+            HazardFeaturePolygon.tenant_id == tenant_id,
+            HazardDatasetVersion.tenant_id == tenant_id,
+            HazardDataset.tenant_id == tenant_id,
+            HazardFeaturePolygon.peril.isnot(None),
+        )
+        .subquery()
+    )
+    rows = session.execute(
+        select(ranked).where(ranked.c.rank == 1).order_by(ranked.c.point, ranked.c.peril)
+    ).all()
+    for row in rows:
+        entry = {
+            "peril": row.peril,
+            "score": row.score,
+            "band": row.band,
+            "percentile": row.percentile,
+            "source": f"{row.name}:{row.version_label}",
+            "raw": row.properties_json or {},
+        }
+        results[row.point].append((entry, row.id))
+    return results
+
+
+def iter_location_hazard_entries(
+    session,
+    tenant_id: str,
+    locations: Sequence[Any],
+    vector_version_ids: Sequence[int],
+    rasters: Sequence[RasterSource],
+    wanted: Optional[Callable[[Any], bool]] = None,
+    stats: Optional[Dict[str, int]] = None,
+    chunk_size: int = LOOKUP_CHUNK_LOCATIONS,
+) -> Iterator[Tuple[Any, List[Tuple[Dict[str, Any], Optional[int]]]]]:
+    # Yields (location, [(hazard entry, tie breaker feature id)]) in input order. Lookups run per chunk
+    # of located rows: one cell-index pass and one worst-per-peril query for vector versions, one
+    # vectorized sample for rasters. Rows without coordinates, or rejected by wanted, get no entries.
+    for start in range(0, len(locations), chunk_size):
+        chunk = locations[start : start + chunk_size]
+        located = [
+            loc
+            for loc in chunk
+            if loc.latitude is not None and loc.longitude is not None and (wanted is None or wanted(loc))
+        ]
+        entries: Dict[int, List[Tuple[Dict[str, Any], Optional[int]]]] = {loc.id: [] for loc in located}
+        if located and vector_version_ids:
+            points = [(loc.longitude, loc.latitude) for loc in located]
+            ids_per_point = lookup_feature_ids(session, tenant_id, vector_version_ids, points, stats)
+            for loc, worst in zip(located, worst_hazard_entries(session, tenant_id, ids_per_point)):
+                entries[loc.id].extend(worst)
+        if located and rasters:
+            sampled = sample_hazard_entries(
+                rasters, [loc.longitude for loc in located], [loc.latitude for loc in located]
+            )
+            for loc, point_entries in zip(located, sampled):
+                entries[loc.id].extend((entry, None) for entry in point_entries)
+        for loc in chunk:
+            yield loc, entries.get(loc.id, [])
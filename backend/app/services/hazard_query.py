@@ -10,12 +10,9 @@ def coerce_float(value: Any) -> Optional[float]:
         return None
 
 
-def extract_hazard_entry(
-    properties: Dict[str, Any],
-    dataset_peril: Optional[str],
-    dataset_name: str,
-    version_label: str,
-) -> Dict[str, Any]:
+def hazard_columns(properties: Dict[str, Any], dataset_peril: Optional[str]) -> Dict[str, Any]:
+    # Typed values promoted onto HazardFeaturePolygon at ingest; lookups read these columns
+    # instead of re-parsing properties_json.
     props = properties or {}
     peril_value = props.get("hazard_category")
     if peril_value is None:
@@ -26,9 +23,22 @@ def extract_hazard_entry(
         score_value = props.get("Score")
     band = props.get("band") or props.get("Band")
     return {
-        "peril": peril,
+        "peril": peril or None,
         "score": coerce_float(score_value),
-        "band": band,
+        "band": str(band) if band else None,
+        "percentile": coerce_float(props.get("percentile")),
+    }
+
+
+def extract_hazard_entry(
+    properties: Dict[str, Any],
+    dataset_peril: Optional[str],
+    dataset_name: str,
+    version_label: str,
+) -> Dict[str, Any]:
+    props = properties or {}
+    return {
+        **hazard_columns(props, dataset_peril),
         "source": f"{dataset_name}:{version_label}",
         "raw": props,
     }
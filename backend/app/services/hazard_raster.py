@@ -0,0 +1,241 @@
+import hashlib
+import math
+import os
+import shutil
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.models import HazardDataset, HazardDatasetVersion
+from app.services.exposure_snapshot import local_file_fetcher
+from app.services.hazard_query import extract_hazard_entry
+from app.storage.s3 import download_object
+
+settings = get_settings()
+
+RASTER_FORMAT = "npy-tiled/v1"
+DATA_FORMAT_VECTOR = "vector"
+DATA_FORMAT_RASTER = "raster"
+DATA_FORMATS = {DATA_FORMAT_VECTOR, DATA_FORMAT_RASTER}
+TILES_NAME = "tiles.npy"
+RASTER_WARM_RETRY_SECONDS = 5
+
+_warming: Set[str] = set()
+_warming_lock = threading.Lock()
+
+
+def parse_transform(value: str) -> List[float]:
+    # GDAL geotransform order: x_origin, pixel_width, row_rotation, y_origin, column_rotation, pixel_height.
+    try:
+        transform = [float(part) for part in value.split(",")]
+    except ValueError:
+        raise ValueError("transform must be six comma-separated numbers") from None
+    if len(transform) != 6 or not all(math.isfinite(v) for v in transform):
+        raise ValueError("transform must be six comma-separated numbers")
+    if transform[2] or transform[4]:
+        raise ValueError("rotated rasters are not supported")
+    if not transform[1] or not transform[5]:
+        raise ValueError("pixel size must be non-zero")
+    return transform
+
+
+def raster_key(tenant_id: str, hazard_dataset_id: int, hazard_dataset_version_id: int) -> str:
+    return f"hazards/{tenant_id}/{hazard_dataset_id}/rasters/{hazard_dataset_version_id}/{TILES_NAME}"
+
+
+def write_tiled_raster(source_path: str, path: str, tile_size: int, nodata: Optional[float]) -> Dict[str, Any]:
+    # Re-lays a 2-D .npy grid as (tile_rows, tile_cols, tile_size, tile_size) so each tile is one
+    # contiguous block of the file and a memory-mapped sample only pages in the tiles it touches.
+    # Both files are memory-mapped, so only one strip of tiles is ever held in memory.
+    source = np.load(source_path, mmap_mode="r", allow_pickle=False)
+    if source.ndim != 2:
+        raise ValueError("raster must be a 2-D array")
+    height, width = source.shape
+    dtype = source.dtype if source.dtype.kind == "f" else np.dtype("float32")
+    fill = np.nan if nodata is None else nodata
+    tile_rows = -(-height // tile_size)
+    tile_cols = -(-width // tile_size)
+    tiles = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(tile_rows, tile_cols, tile_size, tile_size))
+    valid_cells = 0
+    for tile_row in range(tile_rows):
+        block = np.full((tile_size, tile_cols * tile_size), fill, dtype=dtype)
+        top = tile_row * tile_size
+        rows = np.asarray(source[top : top + tile_size], dtype=dtype)
+        block[: rows.shape[0], :width] = rows
+        valid = ~np.isnan(rows) if nodata is None else (rows != nodata) & ~np.isnan(rows)
+        valid_cells += int(valid.sum())
+        tiles[tile_row] = block.reshape(tile_size, tile_cols, tile_size).transpose(1, 0, 2)
+    tiles.flush()
+    del tiles
+    return {
+        "format": RASTER_FORMAT,
+        "width": width,
+        "height": height,
+        "tile_size": tile_size,
+        "dtype": dtype.str,
+        "valid_cells": valid_cells,
+    }
+
+
+class HazardRaster:
+    def __init__(self, tiles: np.ndarray, meta: Dict[str, Any], version_id: Optional[int] = None):
+        self.tiles = tiles
+        self.meta = meta
+        self.version_id = version_id
+        self.transform = meta["transform"]
+        self.width = int(meta["width"])
+        self.height = int(meta["height"])
+        self.tile_size = int(meta["tile_size"])
+        self.nodata = meta.get("nodata")
+
+    def pixel_indices(self, lons: Sequence[float], lats: Sequence[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        x0, dx, _, y0, _, dy = self.transform
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            cols = np.floor((lons - x0) / dx)
+            rows = np.floor((lats - y0) / dy)
+            inside = (cols >= 0) & (cols < self.width) & (rows >= 0) & (rows < self.height)
+        # Out-of-grid (and NaN) positions are zeroed so the integer cast is always defined.
+        rows = np.where(inside, rows, 0).astype(np.int64)
+        cols = np.where(inside, cols, 0).astype(np.int64)
+        return rows, cols, inside
+
+    def sample(self, lons: Sequence[float], lats: Sequence[float]) -> np.ndarray:
+        # One value per point; NaN outside the grid or on nodata cells.
+        rows, cols, inside = self.pixel_indices(lons, lats)
+        values = np.full(inside.shape, np.nan, dtype=np.float64)
+        if inside.any():
+            r = rows[inside]
+            c = cols[inside]
+            size = self.tile_size
+            values[inside] = self.tiles[r // size, c // size, r % size, c % size]
+        if self.nodata is not None:
+            values[values == self.nodata] = np.nan
+        return values
+
+
+def raster_properties(meta: Dict[str, Any], value: float) -> Dict[str, Any]:
+    # Shapes a sampled cell like a polygon feature's properties so extract_hazard_entry applies unchanged.
+    props = dict(meta.get("properties") or {})
+    props[meta.get("value_property") or "score"] = value
+    return props
+
+
+def raster_cache_path(meta: Dict[str, Any], cache_dir: Optional[str] = None) -> str:
+    key = meta["tiles_key"]
+    return os.path.join(
+        cache_dir or settings.hazard_raster_cache_dir,
+        hashlib.sha256(f"{key}:{meta.get('checksum')}".encode()).hexdigest()[:16],
+        key.rsplit("/", 1)[1],
+    )
+
+
+def fetch_hazard_raster(meta: Dict[str, Any], cache_dir: Optional[str] = None) -> str:
+    path = raster_cache_path(meta, cache_dir)
+    prefix = meta["tiles_key"].rsplit("/", 1)[0]
+    return local_file_fetcher(os.path.dirname(path), download_object, prefix)(os.path.basename(path))
+
+
+def cache_hazard_raster(meta: Dict[str, Any], tiles_path: str, cache_dir: Optional[str] = None) -> str:
+    # Seeds the local cache from a tile file that is already on disk (the ingest task's output).
+    path = raster_cache_path(meta, cache_dir)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.copyfile(tiles_path, tmp_path)
+        os.replace(tmp_path, path)
+    return path
+
+
+def warm_hazard_raster(meta: Dict[str, Any], cache_dir: Optional[str] = None) -> None:
+    # Background download for the request path; concurrent requests for the same tiles share one fetch.
+    path = raster_cache_path(meta, cache_dir)
+    with _warming_lock:
+        if path in _warming or os.path.exists(path):
+            return
+        _warming.add(path)
+    try:
+        fetch_hazard_raster(meta, cache_dir)
+    finally:
+        with _warming_lock:
+            _warming.discard(path)
+
+
+def warm_hazard_raster_in_background(meta: Dict[str, Any], cache_dir: Optional[str] = None) -> None:
+    path = raster_cache_path(meta, cache_dir)
+    with _warming_lock:
+        if path in _warming or os.path.exists(path):
+            return
+    threading.Thread(target=warm_hazard_raster, args=(meta, cache_dir), daemon=True).start()
+
+
+def open_hazard_raster(
+    meta: Dict[str, Any], version_id: Optional[int] = None, cache_dir: Optional[str] = None
+) -> HazardRaster:
+    path = fetch_hazard_raster(meta, cache_dir)
+    return HazardRaster(np.load(path, mmap_mode="r", allow_pickle=False), meta, version_id)
+
+
+def _raster_versions(session, tenant_id: str, version_ids: Sequence[int]):
+    return session.execute(
+        select(HazardDatasetVersion, HazardDataset)
+        .join(HazardDataset, HazardDatasetVersion.hazard_dataset_id == HazardDataset.id)
+        .where(
+            HazardDatasetVersion.tenant_id == tenant_id,
+            HazardDataset.tenant_id == tenant_id,
+            HazardDatasetVersion.id.in_(list(version_ids)),
+            HazardDataset.data_format == DATA_FORMAT_RASTER,
+            HazardDatasetVersion.feature_count.isnot(None),
+        )
+        .order_by(HazardDatasetVersion.id.asc())
+    ).all()
+
+
+def load_hazard_rasters(
+    session, tenant_id: str, version_ids: Sequence[int]
+) -> List[Tuple[HazardRaster, Optional[str], str, str]]:
+    if not version_ids:
+        return []
+    return [
+        (open_hazard_raster(version.raster_json, version.id), dataset.peril, dataset.name, version.version_label)
+        for version, dataset in _raster_versions(session, tenant_id, version_ids)
+    ]
+
+
+def load_cached_hazard_rasters(
+    session, tenant_id: str, version_ids: Sequence[int], cache_dir: Optional[str] = None
+) -> Tuple[List[Tuple[HazardRaster, Optional[str], str, str]], Dict[int, Dict[str, Any]]]:
+    # Never downloads: rasters missing from the local cache come back as {version_id: raster_json}
+    # so a request can answer without them and warm the cache off the request path.
+    if not version_ids:
+        return [], {}
+    rasters = []
+    pending: Dict[int, Dict[str, Any]] = {}
+    for version, dataset in _raster_versions(session, tenant_id, version_ids):
+        path = raster_cache_path(version.raster_json, cache_dir)
+        if not os.path.exists(path):
+            pending[version.id] = version.raster_json
+            continue
+        raster = HazardRaster(np.load(path, mmap_mode="r", allow_pickle=False), version.raster_json, version.id)
+        rasters.append((raster, dataset.peril, dataset.name, version.version_label))
+    return rasters, pending
+
+
+def sample_hazard_entries(
+    rasters: Sequence[Tuple[HazardRaster, Optional[str], str, str]],
+    lons: Sequence[float],
+    lats: Sequence[float],
+) -> List[List[Dict[str, Any]]]:
+    # rasters holds (raster, dataset_peril, dataset_name, version_label); returns the hazard entries
+    # found at each point, ready for merge_worst_in_peril.
+    per_point: List[List[Dict[str, Any]]] = [[] for _ in range(len(lons))]
+    for raster, peril, name, label in rasters:
+        values = raster.sample(lons, lats)
+        for index in np.flatnonzero(~np.isnan(values)).tolist():
+            props = raster_properties(raster.meta, float(values[index]))
+            per_point[index].append(extract_hazard_entry(props, peril, name, label))
+    return per_point
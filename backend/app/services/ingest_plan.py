@@ -0,0 +1,181 @@
+import csv
+import hashlib
+import json
+from collections import OrderedDict
+from operator import attrgetter, itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.services.commit import parse_float
+from app.services.external_sort import ExternalSorter
+
+PLAN_CACHE_SIZE = 128
+
+SOURCE_FIELDS = [
+    "external_location_id",
+    "address_line1",
+    "city",
+    "state_region",
+    "postal_code",
+    "country",
+    "latitude",
+    "lat",
+    "longitude",
+    "lon",
+    "currency",
+    "lob",
+    "product_code",
+    "tiv",
+    "limit",
+    "premium",
+]
+# Extra slots appended to every row so fields with no source column resolve to a constant.
+_EMPTY_SLOT = 0
+_NONE_SLOT = 1
+_CONSTANTS = ["", None]
+
+
+class LocationRecord:
+    __slots__ = (
+        "sort_key",
+        "external_location_id",
+        "address_line1",
+        "city",
+        "state_region",
+        "postal_code",
+        "country",
+        "latitude",
+        "longitude",
+        "currency",
+        "lob",
+        "product_code",
+        "tiv",
+        "limit",
+        "premium",
+    )
+
+    def __init__(self, values: Sequence, sort_key):
+        (
+            external_location_id,
+            self.address_line1,
+            self.city,
+            self.state_region,
+            self.postal_code,
+            self.country,
+            latitude,
+            lat,
+            longitude,
+            lon,
+            self.currency,
+            self.lob,
+            self.product_code,
+            tiv,
+            limit,
+            premium,
+        ) = values
+        self.sort_key = str(sort_key)
+        self.external_location_id = str(external_location_id)
+        self.latitude = parse_float(latitude or lat)
+        self.longitude = parse_float(longitude or lon)
+        self.tiv = parse_float(tiv)
+        self.limit = parse_float(limit)
+        self.premium = parse_float(premium)
+
+    def location_values(self, default_currency: Optional[str] = None) -> Optional[Dict]:
+        # Same result as commit.location_values(mapped_row, default_currency).
+        if not (self.lob or self.product_code):
+            return None
+        return {
+            "external_location_id": self.external_location_id,
+            "address_line1": self.address_line1,
+            "city": self.city,
+            "state_region": self.state_region,
+            "postal_code": self.postal_code,
+            "country": self.country,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "currency": self.currency or default_currency,
+            "lob": self.lob,
+            "product_code": self.product_code,
+            "tiv": self.tiv,
+            "limit": self.limit,
+            "premium": self.premium,
+        }
+
+
+class BoundPlan:
+    def __init__(self, mapping: Dict, fieldnames: Sequence[str]):
+        # Mirrors csv.DictReader + map_row: last duplicate header wins, short rows read as None,
+        # a mapped source missing from the header reads as "", an unmapped field reads as None.
+        self.fieldnames = list(fieldnames)
+        self.width = len(self.fieldnames)
+        positions = {name: idx for idx, name in enumerate(self.fieldnames)}
+        sources = {dst: src for src, dst in mapping.items()} if mapping else None
+        self.columns: Dict[str, Optional[int]] = {}
+        slots = []
+        for field in SOURCE_FIELDS:
+            if sources is None:
+                idx = positions.get(field)
+                slot = idx if idx is not None else self.width + _NONE_SLOT
+            elif field in sources:
+                idx = positions.get(sources[field])
+                slot = idx if idx is not None else self.width + _EMPTY_SLOT
+            else:
+                idx = None
+                slot = self.width + _NONE_SLOT
+            self.columns[field] = idx
+            slots.append(slot)
+        sort_slot = slots[0] if slots[0] != self.width + _NONE_SLOT else self.width + _EMPTY_SLOT
+        self._getter = itemgetter(*slots, sort_slot)
+
+    def record(self, row: List[str]) -> LocationRecord:
+        if len(row) != self.width:
+            row = row[: self.width] + [None] * (self.width - len(row))
+        values = self._getter(row + _CONSTANTS)
+        return LocationRecord(values[:-1], values[-1])
+
+
+class IngestPlan:
+    def __init__(self, template_json: Optional[Dict]):
+        self.mapping = dict(template_json or {})
+        self._bound: Dict[Tuple[str, ...], BoundPlan] = {}
+
+    def bind(self, fieldnames: Sequence[str]) -> BoundPlan:
+        key = tuple(fieldnames)
+        bound = self._bound.get(key)
+        if bound is None:
+            bound = self._bound[key] = BoundPlan(self.mapping, fieldnames)
+        return bound
+
+
+_plan_cache: "OrderedDict[Tuple[Optional[int], str], IngestPlan]" = OrderedDict()
+
+
+def template_checksum(template_json: Optional[Dict]) -> str:
+    return hashlib.sha256(json.dumps(template_json or {}, sort_keys=True).encode()).hexdigest()
+
+
+def get_ingest_plan(template_id: Optional[int], template_json: Optional[Dict]) -> IngestPlan:
+    key = (template_id, template_checksum(template_json))
+    plan = _plan_cache.get(key)
+    if plan is None:
+        plan = _plan_cache[key] = IngestPlan(template_json)
+        if len(_plan_cache) > PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    else:
+        _plan_cache.move_to_end(key)
+    return plan
+
+
+def iter_location_records(lines: Iterable[str], plan: IngestPlan) -> Iterator[LocationRecord]:
+    reader = csv.reader(lines)
+    bound = plan.bind(next(reader, []))
+    # csv.DictReader skips blank lines; so does the commit path.
+    return (bound.record(row) for row in reader if row)
+
+
+def read_location_records(lines: Iterable[str], plan: IngestPlan) -> List[LocationRecord]:
+    return list(iter_location_records(lines, plan))
+
+
+def record_sorter(buffer_rows: int = 0, tmp_dir: Optional[str] = None) -> ExternalSorter:
+    return ExternalSorter(attrgetter("sort_key"), buffer_rows, tmp_dir)
@@ -0,0 +1,92 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from app.services.property_enrichment import normalize_address
+from app.services.quality import quality_scores
+
+# Columns read per location; everything else on the row is left untouched.
+GEOCODE_SOURCE_COLUMNS = [
+    "id",
+    "address_line1",
+    "city",
+    "country",
+    "tiv",
+    "latitude",
+    "longitude",
+    "geocode_method",
+    "geocode_confidence",
+]
+GEOCODE_UPDATE_COLUMNS: List[Tuple[str, str]] = [
+    ("latitude", "double precision"),
+    ("longitude", "double precision"),
+    ("geocode_method", "text"),
+    ("geocode_confidence", "double precision"),
+    ("quality_tier", "text"),
+    ("quality_reasons_json", "json"),
+]
+
+
+def needs_geocode(row: Mapping[str, Any]) -> bool:
+    return row["latitude"] is None or row["longitude"] is None
+
+
+def location_address(row: Mapping[str, Any]) -> Dict[str, Any]:
+    return normalize_address(
+        {"address_line1": row["address_line1"], "city": row["city"], "country": row["country"]}
+    )
+
+
+def geocode_location(row: Mapping[str, Any], geocoded: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    # geocoded is the provider result for rows without coordinates; None leaves them ungeocoded.
+    latitude = row["latitude"]
+    longitude = row["longitude"]
+    method = row["geocode_method"]
+    confidence = row["geocode_confidence"]
+    if needs_geocode(row):
+        if geocoded is not None:
+            latitude = geocoded.get("lat")
+            longitude = geocoded.get("lon")
+            confidence = geocoded.get("confidence")
+            method = geocoded.get("method") or geocoded.get("provider")
+    elif confidence is None:
+        method = "PROVIDED"
+        confidence = 1.0
+    scores = quality_scores({
+        "address_line1": row["address_line1"],
+        "tiv": row["tiv"],
+        "geocode_confidence": confidence,
+    })
+    return {
+        "id": row["id"],
+        "latitude": latitude,
+        "longitude": longitude,
+        "geocode_method": method,
+        "geocode_confidence": confidence,
+        "quality_tier": scores["quality_tier"],
+        "quality_reasons_json": scores["reasons"],
+    }
+
+
+def bulk_update_sql(count: int) -> str:
+    # One set-based UPDATE per chunk; the casts give the VALUES list its column types.
+    names = ["id"] + [name for name, _ in GEOCODE_UPDATE_COLUMNS]
+    types = ["integer"] + [sql_type for _, sql_type in GEOCODE_UPDATE_COLUMNS]
+    rows = ", ".join(
+        "(" + ", ".join(f"CAST(:{name}_{i} AS {sql_type})" for name, sql_type in zip(names, types)) + ")"
+        for i in range(count)
+    )
+    assignments = ", ".join(f'"{name}" = v."{name}"' for name, _ in GEOCODE_UPDATE_COLUMNS)
+    return (
+        f"UPDATE location AS loc SET {assignments}, updated_at = :updated_at "
+        f"FROM (VALUES {rows}) AS v({', '.join(names)}) "
+        "WHERE loc.id = v.id AND loc.tenant_id = :tenant_id"
+    )
+
+
+def bulk_update_params(updates: Sequence[Dict[str, Any]], tenant_id: str, updated_at: datetime) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"tenant_id": tenant_id, "updated_at": updated_at}
+    for i, update in enumerate(updates):
+        for name, value in update.items():
+            params[f"{name}_{i}"] = json.dumps(value) if name == "quality_reasons_json" else value
+    return params
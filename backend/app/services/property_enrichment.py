@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.config import get_settings
+from app.services.geocode_cache import cached_forward_geocode
 from app.services.providers import get_characteristics_provider, get_geocoder, get_parcel_provider
 from app.services.providers.base import ProviderError
 from app.services.structural import normalize_structural
@@ -161,7 +162,9 @@ def providers_are_stub() -> bool:
     )
 
 
-def run_enrichment_pipeline(address_json: Dict[str, Any]) -> Dict[str, Any]:
+def run_enrichment_pipeline(
+    address_json: Dict[str, Any], tenant_id: Optional[str] = None, session=None
+) -> Dict[str, Any]:
     normalized = normalize_address(address_json)
     fingerprint = address_fingerprint(normalized)
     errors: List[Dict[str, Any]] = []
@@ -169,7 +172,7 @@ def run_enrichment_pipeline(address_json: Dict[str, Any]) -> Dict[str, Any]:
     geocoder = get_geocoder()
     geocode: Dict[str, Any] = {}
     try:
-        geocode = geocoder.forward_geocode(normalized)
+        geocode = cached_forward_geocode(normalized, fingerprint, tenant_id, session, geocoder)
     except ProviderError as exc:
         errors.append(exc.to_dict())
         geocode = {"provider": getattr(geocoder, "name", "unknown"), "confidence": 0.0, "retrieved_at": datetime.utcnow().isoformat(), "raw": {}}
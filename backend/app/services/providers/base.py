@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import random
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Sequence, TypedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, TypedDict, Union
+
+import httpx
+
+if TYPE_CHECKING:
+    from app.services.providers.circuit_breaker import CircuitBreaker
+    from app.services.providers.rate_limit import TokenBucket
 
 
 class BaseResult(TypedDict, total=False):
@@ -70,3 +78,204 @@ def json_pointer_get(payload: Any, pointer: str) -> Any:
         else:
             raise ProviderError(code="parse", message=f"Pointer invalid for payload: {pointer}", retryable=False)
     return current
+
+
+def retry_after_seconds(headers: Any) -> Optional[float]:
+    value = headers.get("retry-after") if headers is not None else None
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def backoff_delay(
+    attempt: int,
+    base_seconds: float,
+    max_seconds: float,
+    retry_after: Optional[float] = None,
+    rand: Callable[[], float] = random.random,
+) -> float:
+    # Full jitter over an exponential ceiling; a vendor Retry-After takes precedence.
+    if base_seconds <= 0:
+        return 0.0
+    if retry_after is not None:
+        return min(max_seconds, retry_after)
+    return rand() * min(max_seconds, base_seconds * (2 ** attempt))
+
+
+def batch_payload(records: Sequence[Dict[str, Any]], batch_mapping: Dict[str, Any]) -> Dict[str, Any]:
+    # With an item_id pointer each record is tagged with its position so the vendor may reorder results.
+    if batch_mapping.get("item_id"):
+        records = [{"id": str(index), **record} for index, record in enumerate(records)]
+    return {batch_mapping.get("request_key", "items"): list(records)}
+
+
+def batch_items(data: Any, batch_mapping: Dict[str, Any], count: int) -> List[Any]:
+    items = json_pointer_get(data, batch_mapping.get("items", "/"))
+    if not isinstance(items, list):
+        raise ProviderError(code="parse", message="Batch response items is not an array", retryable=False)
+    id_pointer = batch_mapping.get("item_id")
+    if not id_pointer:
+        return [items[index] if index < len(items) else None for index in range(count)]
+    by_id: Dict[str, Any] = {}
+    for item in items:
+        try:
+            by_id[str(json_pointer_get(item, id_pointer))] = item
+        except ProviderError:
+            continue
+    return [by_id.get(str(index)) for index in range(count)]
+
+
+def batch_item_error(item: Any, batch_mapping: Dict[str, Any]) -> Optional[ProviderError]:
+    if item is None:
+        return ProviderError(code="parse", message="Batch response has no result for item", retryable=False)
+    pointer = batch_mapping.get("item_error")
+    if not pointer:
+        return None
+    try:
+        error = json_pointer_get(item, pointer)
+    except ProviderError:
+        return None
+    if error:
+        return ProviderError(code="bad_request", message=str(error), retryable=False)
+    return None
+
+
+def run_batches(
+    inputs: Sequence[Any],
+    batch_size: int,
+    batch_mapping: Dict[str, Any],
+    to_record: Callable[[Any], Dict[str, Any]],
+    request_json: Callable[[Dict[str, Any]], Any],
+    build: Callable[[Any, Any], Any],
+) -> List[Union[Any, ProviderError]]:
+    # One result per input, in input order. A failed request fails only its own batch, and
+    # per-item errors or unparseable items fail only that item.
+    results: List[Union[Any, ProviderError]] = []
+    size = max(1, batch_size or len(inputs))
+    for start in range(0, len(inputs), size):
+        chunk = inputs[start : start + size]
+        try:
+            data = request_json(batch_payload([to_record(value) for value in chunk], batch_mapping))
+            items = batch_items(data, batch_mapping, len(chunk))
+        except ProviderError as exc:
+            results.extend(exc for _ in chunk)
+            continue
+        for value, item in zip(chunk, items):
+            error = batch_item_error(item, batch_mapping)
+            if error is None:
+                try:
+                    results.append(build(item, value))
+                    continue
+                except ProviderError as exc:
+                    error = exc
+            results.append(error)
+    return results
+
+
+class HttpJsonProvider:
+    # Shared transport for the configurable HTTP adapters. Subclasses set label (used in error
+    # messages) and setting_prefix (names the missing setting, e.g. "geocoder_http_base_url").
+    name = "http"
+    label = "Provider"
+    setting_prefix = "provider"
+
+    def __init__(
+        self,
+        base_url: Optional[str],
+        api_key: Optional[str],
+        api_key_header: str,
+        mapping: Optional[Dict[str, Any]],
+        timeout_seconds: float,
+        connect_timeout_seconds: float,
+        max_retries: int,
+        client: Optional[httpx.Client] = None,
+        backoff_base_seconds: float = 0.0,
+        backoff_max_seconds: float = 0.0,
+        limiter: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        batch_size: int = 0,
+        batch_mapping: Optional[Dict[str, Any]] = None,
+    ):
+        self.base_url = base_url or ""
+        self.api_key = api_key
+        self.api_key_header = api_key_header or "Authorization"
+        self.mapping = mapping or {}
+        self.max_retries = max(0, int(max_retries))
+        self.timeout = httpx.Timeout(timeout_seconds, connect=connect_timeout_seconds)
+        self.client = client or httpx.Client(timeout=self.timeout)
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.limiter = limiter
+        self.breaker = breaker
+        # Batch mode is on when batch_size > 0; batch_mapping locates per-item results in the response.
+        self.batch_size = max(0, int(batch_size or 0))
+        self.batch_mapping = batch_mapping or {}
+
+    def _headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.api_key:
+            headers[self.api_key_header] = self.api_key
+        return headers
+
+    def _request_json(self, payload: Dict[str, Any], url: Optional[str] = None) -> Dict[str, Any]:
+        label = self.label
+        if not self.base_url:
+            raise ProviderError(
+                code="bad_request", message=f"{self.setting_prefix}_http_base_url not configured", retryable=False
+            )
+        last_error: Optional[ProviderError] = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            if self.breaker is not None:
+                self.breaker.before_call()
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                response = self.client.post(url or self.base_url, json=payload, headers=self._headers())
+                response.raise_for_status()
+                data = response.json()
+                if self.breaker is not None:
+                    self.breaker.record_success()
+                return data
+            except httpx.TimeoutException:
+                last_error = ProviderError(code="timeout", message=f"{label} request timed out", retryable=True)
+            except httpx.HTTPStatusError as exc:
+                status = exc.response.status_code
+                if status == 429:
+                    retry_after = retry_after_seconds(exc.response.headers)
+                    last_error = ProviderError(code="rate_limited", message=f"{label} rate limited", retryable=True)
+                elif status in (401, 403):
+                    last_error = ProviderError(code="auth", message=f"{label} auth error", retryable=False)
+                elif 400 <= status < 500:
+                    last_error = ProviderError(code="bad_request", message=f"{label} bad request ({status})", retryable=False)
+                else:
+                    last_error = ProviderError(code="upstream", message=f"{label} upstream error ({status})", retryable=True)
+            except ValueError as exc:
+                last_error = ProviderError(code="parse", message=f"{label} response parse error: {exc}", retryable=False)
+            except Exception as exc:
+                last_error = ProviderError(code="upstream", message=f"{label} error: {exc}", retryable=False)
+            if self.breaker is not None:
+                self.breaker.record_error(last_error)
+            if last_error and last_error.retryable and attempt < self.max_retries:
+                delay = backoff_delay(attempt, self.backoff_base_seconds, self.backoff_max_seconds, retry_after)
+                if delay:
+                    time.sleep(delay)
+                continue
+            if last_error:
+                raise last_error
+        raise ProviderError(code="upstream", message=f"{label} request failed", retryable=False)
+
+    def _extract(self, data: Dict[str, Any], key: str, required: bool = False) -> Any:
+        pointer = self.mapping.get(key)
+        if pointer is None:
+            if required:
+                raise ProviderError(code="parse", message=f"Missing mapping for {key}", retryable=False)
+            return None
+        return json_pointer_get(data, pointer)
+
+    def _check_mapping(self) -> None:
+        if not self.mapping:
+            raise ProviderError(
+                code="parse", message=f"{self.setting_prefix}_http_mapping_json not configured", retryable=False
+            )
@@ -5,6 +5,9 @@ from typing import Any, Dict
 from app.core.config import get_settings
 from app.services.providers.base import CharacteristicsResult
 from app.services.providers.http_characteristics import HttpCharacteristicsProvider
+from app.services.providers.circuit_breaker import get_circuit_breaker
+from app.services.providers.clients import get_http_client
+from app.services.providers.rate_limit import get_rate_limiter
 
 ROOF_MATERIALS = ["metal", "tile", "asphalt_shingle", "wood_shake"]
 
@@ -53,4 +56,11 @@ def get_characteristics_provider():
         timeout_seconds=settings.provider_timeout_seconds,
         connect_timeout_seconds=settings.provider_connect_timeout_seconds,
         max_retries=settings.provider_max_retries,
+        client=get_http_client("characteristics"),
+        backoff_base_seconds=settings.provider_backoff_base_seconds,
+        backoff_max_seconds=settings.provider_backoff_max_seconds,
+        limiter=get_rate_limiter("characteristics", settings.characteristics_rate_per_second),
+        breaker=get_circuit_breaker("characteristics"),
+        batch_size=settings.characteristics_http_batch_size,
+        batch_mapping=settings.characteristics_http_batch_mapping_json,
     )
@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from app.core.config import get_settings
+from app.services.providers.base import ProviderError
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Errors that mean the vendor is unhealthy; auth, bad_request and parse errors prove it answered.
+FAILURE_CODES = {"timeout", "rate_limited", "upstream"}
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_seconds: float = 60.0,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = max(1, int(minimum_calls))
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = max(1, int(half_open_max_calls))
+        self.clock = clock
+        self.state = STATE_CLOSED
+        self.opened_at: Optional[float] = None
+        self.opened_at_utc: Optional[datetime] = None
+        self.rejected = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._half_open_calls = 0
+        self._half_open_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            self._outcomes.popleft()
+
+    def _open(self, now: float) -> None:
+        self.state = STATE_OPEN
+        self.opened_at = now
+        self.opened_at_utc = datetime.utcnow()
+        self._half_open_calls = 0
+        self._outcomes.clear()
+
+    def before_call(self) -> None:
+        with self._lock:
+            now = self.clock()
+            if self.state == STATE_OPEN and now - self.opened_at >= self.open_seconds:
+                self.state = STATE_HALF_OPEN
+                self._half_open_calls = 0
+                self._half_open_at = now
+            elif self.state == STATE_HALF_OPEN and now - self._half_open_at >= self.open_seconds:
+                # A probe whose outcome was never recorded must not wedge the breaker half-open.
+                self._open(now)
+            if self.state == STATE_HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return
+            if self.state == STATE_CLOSED:
+                return
+            self.rejected += 1
+        raise ProviderError(code="circuit_open", message=f"{self.name} circuit open", retryable=True)
+
+    def record_success(self) -> None:
+        with self._lock:
+            now = self.clock()
+            if self.state == STATE_HALF_OPEN:
+                self.state = STATE_CLOSED
+                self.opened_at = None
+                self.opened_at_utc = None
+                self._outcomes.clear()
+            self._outcomes.append((now, True))
+            self._prune(now)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = self.clock()
+            if self.state == STATE_HALF_OPEN:
+                self._open(now)
+                return
+            self._outcomes.append((now, False))
+            self._prune(now)
+            calls = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if calls >= self.minimum_calls and failures / calls >= self.failure_rate_threshold:
+                self._open(now)
+
+    def record_error(self, error: ProviderError) -> None:
+        if error.code in FAILURE_CODES:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._prune(self.clock())
+            calls = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "name": self.name,
+                "state": self.state,
+                "window_calls": calls,
+                "window_failures": failures,
+                "failure_rate": failures / calls if calls else 0.0,
+                "opened_at": self.opened_at_utc.isoformat() if self.opened_at_utc else None,
+                "rejected": self.rejected,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> Optional[CircuitBreaker]:
+    settings = get_settings()
+    if not settings.provider_circuit_enabled:
+        return None
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_rate_threshold=settings.provider_circuit_failure_rate,
+                minimum_calls=settings.provider_circuit_minimum_calls,
+                window_seconds=settings.provider_circuit_window_seconds,
+                open_seconds=settings.provider_circuit_open_seconds,
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def circuit_breaker_snapshots() -> Dict[str, Dict[str, Any]]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
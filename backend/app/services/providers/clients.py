@@ -0,0 +1,61 @@
+import importlib.util
+import logging
+import os
+import threading
+from typing import Dict
+
+import httpx
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# name -> keep-alive client, owned by the current process. A forked worker starts with an empty
+# registry instead of sharing the parent's sockets.
+_clients: Dict[str, httpx.Client] = {}
+_owner_pid = os.getpid()
+_lock = threading.Lock()
+
+
+def _http2_enabled() -> bool:
+    settings = get_settings()
+    if not settings.provider_http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("AEGIS_PROVIDER_HTTP2 is set but the h2 package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def _build_client() -> httpx.Client:
+    settings = get_settings()
+    return httpx.Client(
+        timeout=httpx.Timeout(settings.provider_timeout_seconds, connect=settings.provider_connect_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=settings.provider_max_connections,
+            max_keepalive_connections=settings.provider_max_keepalive_connections,
+            keepalive_expiry=settings.provider_keepalive_expiry_seconds,
+        ),
+        http2=_http2_enabled(),
+    )
+
+
+def get_http_client(name: str) -> httpx.Client:
+    global _owner_pid
+    with _lock:
+        if _owner_pid != os.getpid():
+            _clients.clear()
+            _owner_pid = os.getpid()
+        client = _clients.get(name)
+        if client is None or client.is_closed:
+            client = _build_client()
+            _clients[name] = client
+        return client
+
+
+def close_http_clients() -> None:
+    with _lock:
+        clients = list(_clients.values()) if _owner_pid == os.getpid() else []
+        _clients.clear()
+    for client in clients:
+        client.close()
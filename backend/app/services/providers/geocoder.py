@@ -5,6 +5,9 @@ from app.core.config import get_settings
 from app.services.geocode import geocode_address
 from app.services.providers.base import GeocodeResult
 from app.services.providers.http_geocoder import HttpGeocoder
+from app.services.providers.circuit_breaker import get_circuit_breaker
+from app.services.providers.clients import get_http_client
+from app.services.providers.rate_limit import get_rate_limiter
 
 
 class StubGeocoder:
@@ -43,4 +46,11 @@ def get_geocoder():
         timeout_seconds=settings.provider_timeout_seconds,
         connect_timeout_seconds=settings.provider_connect_timeout_seconds,
         max_retries=settings.provider_max_retries,
+        client=get_http_client("geocoder"),
+        backoff_base_seconds=settings.provider_backoff_base_seconds,
+        backoff_max_seconds=settings.provider_backoff_max_seconds,
+        limiter=get_rate_limiter("geocoder", settings.geocoder_rate_per_second),
+        breaker=get_circuit_breaker("geocoder"),
+        batch_size=settings.geocoder_http_batch_size,
+        batch_mapping=settings.geocoder_http_batch_mapping_json,
     )
@@ -5,6 +5,9 @@ from typing import Any, Dict
 from app.core.config import get_settings
 from app.services.providers.base import ParcelResult
 from app.services.providers.http_parcel import HttpParcelProvider
+from app.services.providers.circuit_breaker import get_circuit_breaker
+from app.services.providers.clients import get_http_client
+from app.services.providers.rate_limit import get_rate_limiter
 
 
 class StubParcelProvider:
@@ -48,4 +51,11 @@ def get_parcel_provider():
         timeout_seconds=settings.provider_timeout_seconds,
         connect_timeout_seconds=settings.provider_connect_timeout_seconds,
         max_retries=settings.provider_max_retries,
+        client=get_http_client("parcel"),
+        backoff_base_seconds=settings.provider_backoff_base_seconds,
+        backoff_max_seconds=settings.provider_backoff_max_seconds,
+        limiter=get_rate_limiter("parcel", settings.parcel_rate_per_second),
+        breaker=get_circuit_breaker("parcel"),
+        batch_size=settings.parcel_http_batch_size,
+        batch_mapping=settings.parcel_http_batch_mapping_json,
     )
@@ -0,0 +1,53 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = float(rate_per_second)
+        self.capacity = float(burst or max(1, int(self.rate)))
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def _wait_seconds(self) -> float:
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self) -> None:
+        while True:
+            wait = self._wait_seconds()
+            if not wait:
+                return
+            self.sleep(wait)
+
+
+_limiters: Dict[str, Tuple[float, TokenBucket]] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate_per_second: float) -> Optional[TokenBucket]:
+    # One bucket per provider per process, so concurrent runs share the vendor's quota.
+    if not rate_per_second or rate_per_second <= 0:
+        return None
+    with _limiters_lock:
+        entry = _limiters.get(name)
+        if entry is None or entry[0] != rate_per_second:
+            entry = (rate_per_second, TokenBucket(rate_per_second))
+            _limiters[name] = entry
+        return entry[1]
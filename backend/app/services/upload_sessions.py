@@ -0,0 +1,85 @@
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+UPLOAD_STATUS_UPLOADING = "UPLOADING"
+UPLOAD_STATUS_FINALIZING = "FINALIZING"
+UPLOAD_STATUS_COMPLETE = "COMPLETE"
+UPLOAD_STATUS_ABORTED = "ABORTED"
+MIN_PART_BYTES = 5 * 1024 * 1024
+MAX_PART_NUMBER = 10000
+
+
+class UploadSessionError(ValueError):
+    pass
+
+
+def validate_part(part_number: int, size: int, part_size: int, max_part_bytes: int) -> None:
+    if part_number < 1 or part_number > MAX_PART_NUMBER:
+        raise UploadSessionError(f"part_number must be between 1 and {MAX_PART_NUMBER}")
+    if size == 0:
+        raise UploadSessionError("part body is empty")
+    if size > min(part_size, max_part_bytes):
+        raise UploadSessionError(f"part exceeds part_size of {part_size} bytes")
+
+
+def record_part(parts_json: Optional[Dict[str, Any]], part_number: int, etag: str, size: int, sha256: str) -> Dict:
+    parts = dict(parts_json or {})
+    parts[str(part_number)] = {"etag": etag, "size": size, "sha256": sha256}
+    return parts
+
+
+def received_parts(parts_json: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {"part_number": int(number), **info}
+        for number, info in sorted((parts_json or {}).items(), key=lambda item: int(item[0]))
+    ]
+
+
+def received_ranges(parts_json: Optional[Dict[str, Any]], part_size: int) -> List[Tuple[int, int]]:
+    # Inclusive byte ranges of the final object covered by received parts, merged when adjacent.
+    ranges: List[Tuple[int, int]] = []
+    for part in received_parts(parts_json):
+        start = (part["part_number"] - 1) * part_size
+        end = start + part["size"] - 1
+        if ranges and ranges[-1][1] + 1 == start:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+    return ranges
+
+
+def missing_parts(parts_json: Optional[Dict[str, Any]], total_parts: Optional[int] = None) -> List[int]:
+    numbers = {part["part_number"] for part in received_parts(parts_json)}
+    last = total_parts or (max(numbers) if numbers else 0)
+    return [n for n in range(1, last + 1) if n not in numbers]
+
+
+def completion_parts(parts_json: Optional[Dict[str, Any]], part_size: int) -> List[Dict[str, Any]]:
+    parts = received_parts(parts_json)
+    if not parts:
+        raise UploadSessionError("no parts uploaded")
+    gaps = missing_parts(parts_json)
+    if gaps:
+        raise UploadSessionError(f"missing parts: {gaps[:20]}")
+    for part in parts[:-1]:
+        if part["size"] != part_size:
+            raise UploadSessionError(f"part {part['part_number']} must be exactly {part_size} bytes")
+    return [{"PartNumber": part["part_number"], "ETag": part["etag"]} for part in parts]
+
+
+def parts_checksum(parts_json: Optional[Dict[str, Any]]) -> str:
+    # Reported alongside a session so clients can check their parts; it depends on the part size, so
+    # ExposureUpload.checksum is always the plain sha256 of the assembled file instead.
+    # A single part keeps its own sha256; more parts hash the concatenated part digests and carry an
+    # S3-style "-<parts>" suffix.
+    parts = received_parts(parts_json)
+    if len(parts) == 1:
+        return parts[0]["sha256"]
+    digest = hashlib.sha256(b"".join(bytes.fromhex(part["sha256"]) for part in parts))
+    return f"{digest.hexdigest()}-{len(parts)}"
+
+
+def expected_total_parts(total_size: Optional[int], part_size: int) -> Optional[int]:
+    if not total_size:
+        return None
+    return (total_size + part_size - 1) // part_size
@@ -1,14 +1,14 @@
-import csv
-import io
-import json
-import hashlib
+import codecs
 import csv
 import hashlib
 import io
 import json
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.services.compression import decompress_bytes
 
 SEVERITIES = ["ERROR", "WARN", "INFO"]
+PROGRESS_EVERY_ROWS = 10000
 
 
 def compute_checksum_sha256(data: bytes) -> str:
@@ -31,102 +31,115 @@ def _as_float(val):
         return None
 
 
-def validate_rows(rows: List[Dict], mapping: Dict) -> Tuple[Dict, List[Dict], bytes, str]:
+def _serialize_issue(issue: Dict) -> bytes:
+    return json.dumps(issue, sort_keys=True, separators=(",", ":")).encode()
+
+
+def map_row(row: Dict, mapping: Dict) -> Dict:
+    return {dst: row.get(src, "") for src, dst in mapping.items()} if mapping else row
+
+
+def validate_mapped_row(idx: int, mapped: Dict) -> List[Dict]:
     issues: List[Dict] = []
-    summary = {"ERROR": 0, "WARN": 0, "INFO": 0, "total_rows": len(rows)}
-    for idx, row in enumerate(rows, start=1):
-        mapped = {dst: row.get(src, "") for src, dst in mapping.items()} if mapping else row
-        ext_id = (mapped.get("external_location_id") or "").strip()
-        if not ext_id:
+    ext_id = (mapped.get("external_location_id") or "").strip()
+    if not ext_id:
+        issues.append({
+            "row_number": idx,
+            "severity": "ERROR",
+            "field": "external_location_id",
+            "code": "MISSING_EXTERNAL_ID",
+            "message": "external_location_id is required",
+        })
+    lat = mapped.get("latitude") or mapped.get("lat")
+    lon = mapped.get("longitude") or mapped.get("lon")
+    address = mapped.get("address_line1")
+    city = mapped.get("city")
+    country = mapped.get("country")
+    state_region = mapped.get("state_region")
+    postal_code = mapped.get("postal_code")
+    if not ((lat and lon) or (address and city and state_region and postal_code and country)):
+        issues.append({
+            "row_number": idx,
+            "severity": "ERROR",
+            "field": "location",
+            "code": "MISSING_LOCATION",
+            "message": "Latitude/Longitude or full address fields required",
+        })
+    tiv = mapped.get("tiv")
+    if tiv is None or tiv == "":
+        issues.append({
+            "row_number": idx,
+            "severity": "ERROR",
+            "field": "tiv",
+            "code": "MISSING_TIV",
+            "message": "tiv is required",
+        })
+    else:
+        parsed_tiv = _as_float(tiv)
+        if parsed_tiv is None:
             issues.append({
                 "row_number": idx,
                 "severity": "ERROR",
-                "field": "external_location_id",
-                "code": "MISSING_EXTERNAL_ID",
-                "message": "external_location_id is required",
-            })
-        lat = mapped.get("latitude") or mapped.get("lat")
-        lon = mapped.get("longitude") or mapped.get("lon")
-        address = mapped.get("address_line1")
-        city = mapped.get("city")
-        country = mapped.get("country")
-        state_region = mapped.get("state_region")
-        postal_code = mapped.get("postal_code")
-        if not ((lat and lon) or (address and city and state_region and postal_code and country)):
-            issues.append({
-                "row_number": idx,
-                "severity": "ERROR",
-                "field": "location",
-                "code": "MISSING_LOCATION",
-                "message": "Latitude/Longitude or full address fields required",
+                "field": "tiv",
+                "code": "INVALID_TIV",
+                "message": "tiv must be numeric",
             })
-        tiv = mapped.get("tiv")
-        if tiv is None or tiv == "":
+        elif parsed_tiv < 0:
             issues.append({
                 "row_number": idx,
                 "severity": "ERROR",
                 "field": "tiv",
-                "code": "MISSING_TIV",
-                "message": "tiv is required",
+                "code": "NEGATIVE_TIV",
+                "message": "tiv must be non-negative",
             })
-        else:
-            parsed_tiv = _as_float(tiv)
-            if parsed_tiv is None:
-                issues.append({
-                    "row_number": idx,
-                    "severity": "ERROR",
-                    "field": "tiv",
-                    "code": "INVALID_TIV",
-                    "message": "tiv must be numeric",
-                })
-            elif parsed_tiv < 0:
-                issues.append({
-                    "row_number": idx,
-                    "severity": "ERROR",
-                    "field": "tiv",
-                    "code": "NEGATIVE_TIV",
-                    "message": "tiv must be non-negative",
-                })
-        currency = (mapped.get("currency") or "").strip()
-        if not currency:
+    currency = (mapped.get("currency") or "").strip()
+    if not currency:
+        issues.append({
+            "row_number": idx,
+            "severity": "WARN",
+            "field": "currency",
+            "code": "MISSING_CURRENCY_DEFAULTED",
+            "message": "currency missing; will default to tenant currency",
+        })
+    lob = (mapped.get("lob") or "").strip()
+    product_code = (mapped.get("product_code") or "").strip()
+    if not lob and not product_code:
+        issues.append({
+            "row_number": idx,
+            "severity": "ERROR",
+            "field": "segmentation",
+            "code": "MISSING_SEGMENTATION",
+            "message": "lob or product_code required",
+        })
+    for numeric_field in ["limit", "premium"]:
+        val = mapped.get(numeric_field)
+        if val is None or val == "":
+            continue
+        parsed = _as_float(val)
+        if parsed is None:
             issues.append({
                 "row_number": idx,
                 "severity": "WARN",
-                "field": "currency",
-                "code": "MISSING_CURRENCY_DEFAULTED",
-                "message": "currency missing; will default to tenant currency",
+                "field": numeric_field,
+                "code": f"INVALID_{numeric_field.upper()}",
+                "message": f"{numeric_field} must be numeric",
             })
-        lob = (mapped.get("lob") or "").strip()
-        product_code = (mapped.get("product_code") or "").strip()
-        if not lob and not product_code:
+        elif parsed < 0:
             issues.append({
                 "row_number": idx,
-                "severity": "ERROR",
-                "field": "segmentation",
-                "code": "MISSING_SEGMENTATION",
-                "message": "lob or product_code required",
+                "severity": "WARN",
+                "field": numeric_field,
+                "code": f"NEGATIVE_{numeric_field.upper()}",
+                "message": f"{numeric_field} should be non-negative",
             })
-        for numeric_field in ["limit", "premium"]:
-            val = mapped.get(numeric_field)
-            if val is None or val == "":
-                continue
-            parsed = _as_float(val)
-            if parsed is None:
-                issues.append({
-                    "row_number": idx,
-                    "severity": "WARN",
-                    "field": numeric_field,
-                    "code": f"INVALID_{numeric_field.upper()}",
-                    "message": f"{numeric_field} must be numeric",
-                })
-            elif parsed < 0:
-                issues.append({
-                    "row_number": idx,
-                    "severity": "WARN",
-                    "field": numeric_field,
-                    "code": f"NEGATIVE_{numeric_field.upper()}",
-                    "message": f"{numeric_field} should be non-negative",
-                })
+    return issues
+
+
+def validate_rows(rows: List[Dict], mapping: Dict) -> Tuple[Dict, List[Dict], bytes, str]:
+    issues: List[Dict] = []
+    summary = {"ERROR": 0, "WARN": 0, "INFO": 0, "total_rows": len(rows)}
+    for idx, row in enumerate(rows, start=1):
+        issues.extend(validate_mapped_row(idx, map_row(row, mapping)))
     issues = sorted(issues, key=_stable_issue_sort)
     for issue in issues:
         summary[issue["severity"]] += 1
@@ -135,6 +148,73 @@ def validate_rows(rows: List[Dict], mapping: Dict) -> Tuple[Dict, List[Dict], by
     return summary, issues, artifact_bytes, checksum
 
 
+class IssueArtifactWriter:
+    # Emits the same bytes as json.dumps(issues, sort_keys=True, separators=(",", ":"))
+    # one issue at a time, hashing as it goes.
+    def __init__(self, sink: Callable[[bytes], None]):
+        self.sink = sink
+        self.digest = hashlib.sha256()
+        self.count = 0
+        self._emit(b"[")
+
+    def _emit(self, data: bytes) -> None:
+        self.digest.update(data)
+        self.sink(data)
+
+    def add(self, issue: Dict) -> None:
+        data = _serialize_issue(issue)
+        self._emit(b"," + data if self.count else data)
+        self.count += 1
+
+    def close(self) -> str:
+        self._emit(b"]")
+        return self.digest.hexdigest()
+
+
+def validate_rows_streaming(
+    rows: Iterable[Dict],
+    mapping: Dict,
+    sink: Callable[[bytes], None],
+    on_progress: Optional[Callable[[int], None]] = None,
+    progress_every: int = PROGRESS_EVERY_ROWS,
+    first_row_number: int = 1,
+) -> Tuple[Dict, str]:
+    summary = {"ERROR": 0, "WARN": 0, "INFO": 0, "total_rows": 0}
+    writer = IssueArtifactWriter(sink)
+    total_rows = 0
+    for idx, row in enumerate(rows, start=first_row_number):
+        mapped = map_row(row, mapping)
+        # row numbers only increase, so sorting within a row keeps the global order
+        for issue in sorted(validate_mapped_row(idx, mapped), key=_stable_issue_sort):
+            summary[issue["severity"]] += 1
+            writer.add(issue)
+        total_rows += 1
+        if on_progress and total_rows % progress_every == 0:
+            on_progress(total_rows)
+    summary["total_rows"] = total_rows
+    return summary, writer.close()
+
+
+def iter_text_lines(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        if "\n" not in pending:
+            continue
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def iter_csv_rows(chunks: Iterable[bytes]) -> Iterator[Dict]:
+    return csv.DictReader(iter_text_lines(chunks))
+
+
 def read_csv_bytes(raw_bytes: bytes) -> List[Dict]:
-    reader = csv.DictReader(io.StringIO(raw_bytes.decode()))
+    reader = csv.DictReader(io.StringIO(decompress_bytes(raw_bytes).decode()))
     return list(reader)
@@ -0,0 +1,160 @@
+import csv
+from itertools import compress, islice
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.ingest_plan import BoundPlan, IngestPlan
+from app.services.validation import PROGRESS_EVERY_ROWS, IssueArtifactWriter, _as_float
+
+BATCH_ROWS = 10000
+
+# Same checks as validate_mapped_row, listed in artifact sort order (severity, field, code)
+# so issues for one row come out already sorted.
+CHECKS = [
+    ("ERROR", "external_location_id", "MISSING_EXTERNAL_ID", "external_location_id is required"),
+    ("ERROR", "location", "MISSING_LOCATION", "Latitude/Longitude or full address fields required"),
+    ("ERROR", "segmentation", "MISSING_SEGMENTATION", "lob or product_code required"),
+    ("ERROR", "tiv", "INVALID_TIV", "tiv must be numeric"),
+    ("ERROR", "tiv", "MISSING_TIV", "tiv is required"),
+    ("ERROR", "tiv", "NEGATIVE_TIV", "tiv must be non-negative"),
+    ("WARN", "currency", "MISSING_CURRENCY_DEFAULTED", "currency missing; will default to tenant currency"),
+    ("WARN", "limit", "INVALID_LIMIT", "limit must be numeric"),
+    ("WARN", "limit", "NEGATIVE_LIMIT", "limit should be non-negative"),
+    ("WARN", "premium", "INVALID_PREMIUM", "premium must be numeric"),
+    ("WARN", "premium", "NEGATIVE_PREMIUM", "premium should be non-negative"),
+]
+
+
+def _present(column: Sequence[str]) -> np.ndarray:
+    if "" not in column:
+        return np.ones(len(column), dtype=bool)
+    return np.fromiter(map(bool, column), dtype=bool, count=len(column))
+
+
+def _present_stripped(column: Sequence[str]) -> np.ndarray:
+    return np.fromiter(map(bool, map(str.strip, column)), dtype=bool, count=len(column))
+
+
+def _parse_floats(column: Sequence[str], present: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    values = np.full(len(column), np.nan)
+    invalid = np.zeros(len(column), dtype=bool)
+    positions = np.flatnonzero(present)
+    if not len(positions):
+        return values, invalid
+    items = list(column) if len(positions) == len(column) else list(compress(column, present))
+    try:
+        values[positions] = np.fromiter(map(float, items), dtype=np.float64, count=len(items))
+    except ValueError:
+        parsed = [_as_float(item) for item in items]
+        values[positions] = [np.nan if p is None else p for p in parsed]
+        invalid[positions] = [p is None for p in parsed]
+    return values, invalid
+
+
+def validate_record_batch(
+    records: List[List[str]],
+    columns: Dict[str, Optional[int]],
+    width: int,
+    first_row_number: int,
+) -> List[Dict]:
+    count = len(records)
+    if not count:
+        return []
+    if min(map(len, records)) < width:
+        records = [r + [""] * (width - len(r)) if len(r) < width else r for r in records]
+    transposed = list(zip(*records)) if width else []
+    blank = ("",) * count
+
+    def col(field: str) -> Sequence[str]:
+        idx = columns[field]
+        return transposed[idx] if idx is not None else blank
+
+    missing_ext = ~_present_stripped(col("external_location_id"))
+    latitude = _present(col("latitude"))
+    if not latitude.all():
+        latitude |= _present(col("lat"))
+    longitude = _present(col("longitude"))
+    if not longitude.all():
+        longitude |= _present(col("lon"))
+    has_location = latitude & longitude
+    if not has_location.all():
+        has_location |= (
+            _present(col("address_line1"))
+            & _present(col("city"))
+            & _present(col("state_region"))
+            & _present(col("postal_code"))
+            & _present(col("country"))
+        )
+    missing_segmentation = ~_present_stripped(col("lob"))
+    if missing_segmentation.any():
+        missing_segmentation &= ~_present_stripped(col("product_code"))
+    tiv_present = _present(col("tiv"))
+    tiv, tiv_invalid = _parse_floats(col("tiv"), tiv_present)
+    masks = [
+        missing_ext,
+        ~has_location,
+        missing_segmentation,
+        tiv_invalid,
+        ~tiv_present,
+        tiv_present & ~tiv_invalid & (tiv < 0),
+        ~_present_stripped(col("currency")),
+    ]
+    for field in ("limit", "premium"):
+        values, invalid = _parse_floats(col(field), _present(col(field)))
+        masks.append(invalid)
+        masks.append(~invalid & (values < 0))
+
+    failing = []
+    for check_idx, mask in enumerate(masks):
+        failing.extend((int(row), check_idx) for row in np.flatnonzero(mask))
+    failing.sort()
+    issues = []
+    for row, check_idx in failing:
+        severity, field, code, message = CHECKS[check_idx]
+        issues.append({
+            "row_number": first_row_number + row,
+            "severity": severity,
+            "field": field,
+            "code": code,
+            "message": message,
+        })
+    return issues
+
+
+def validate_csv_streaming(
+    lines: Iterable[str],
+    mapping: Dict,
+    sink: Callable[[bytes], None],
+    on_progress: Optional[Callable[[int], None]] = None,
+    progress_every: int = PROGRESS_EVERY_ROWS,
+    fieldnames: Optional[List[str]] = None,
+    first_row_number: int = 1,
+    batch_rows: int = BATCH_ROWS,
+    plan: Optional[IngestPlan] = None,
+    on_batch: Optional[Callable[[BoundPlan, List[List[str]]], None]] = None,
+) -> Tuple[Dict, str]:
+    summary = {"ERROR": 0, "WARN": 0, "INFO": 0, "total_rows": 0}
+    writer = IssueArtifactWriter(sink)
+    reader = csv.reader(lines)
+    if fieldnames is None:
+        fieldnames = next(reader, [])
+    bound = (plan or IngestPlan(mapping)).bind(fieldnames)
+    total_rows = 0
+    while True:
+        raw = list(islice(reader, batch_rows))
+        if not raw:
+            break
+        # csv.DictReader skips blank lines without counting them as rows
+        records = [r for r in raw if r]
+        for issue in validate_record_batch(records, bound.columns, bound.width, first_row_number + total_rows):
+            summary[issue["severity"]] += 1
+            writer.add(issue)
+        if on_batch:
+            on_batch(bound, records)
+        reported = total_rows // progress_every
+        total_rows += len(records)
+        if on_progress and total_rows // progress_every > reported:
+            on_progress(total_rows)
+    summary["total_rows"] = total_rows
+    return summary, writer.close()
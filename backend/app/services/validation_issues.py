@@ -0,0 +1,94 @@
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.services.bulk_load import COPY_BATCH_ROWS, copy_rows_to_stage
+
+ISSUE_FIELDS = ["row_number", "severity", "field", "code", "message"]
+VALIDATION_ISSUE_COPY_COLUMNS = [
+    ("tenant_id", "text"),
+    ("validation_result_id", "integer"),
+    ("row_number", "integer"),
+    ("severity", "text"),
+    ("field", "text"),
+    ("code", "text"),
+    ("message", "text"),
+]
+_SEPARATORS = "[], \t\r\n"
+
+
+def iter_issue_artifact(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[Dict[str, Any]]:
+    # Decodes a row_errors.json array one object at a time without holding the whole artifact.
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ""
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _SEPARATORS:
+                pos += 1
+            if pos >= len(buffer):
+                break
+            try:
+                issue, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            yield issue
+        buffer = buffer[pos:]
+    buffer += text_decoder.decode(b"", final=True)
+    if buffer.strip(_SEPARATORS):
+        raise ValueError("truncated validation issue artifact")
+
+
+def copy_validation_issues(
+    dbapi_connection,
+    tenant_id: str,
+    validation_result_id: int,
+    issues: Iterable[Dict[str, Any]],
+    batch_rows: int = COPY_BATCH_ROWS,
+) -> int:
+    # seq is the issue's position in row_errors.json, so keyset pages follow artifact order.
+    rows = ({"tenant_id": tenant_id, "validation_result_id": validation_result_id, **issue} for issue in issues)
+    cursor = dbapi_connection.cursor()
+    try:
+        copied = copy_rows_to_stage(cursor, "validation_issue", VALIDATION_ISSUE_COPY_COLUMNS, rows, None, batch_rows)
+        dbapi_connection.commit()
+        return copied
+    except Exception:
+        dbapi_connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def issue_payload(row) -> Dict[str, Any]:
+    return {field: getattr(row, field) for field in ISSUE_FIELDS}
+
+
+def filter_issues(
+    issues: Iterable[Dict[str, Any]],
+    severity: Optional[str] = None,
+    code: Optional[str] = None,
+    after_seq: Optional[int] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> List[Tuple[int, Dict[str, Any]]]:
+    # Artifact fallback for validation results stored before the validation_issue table existed;
+    # returns (seq, issue) pairs in the same order as the keyset query.
+    page = []
+    skipped = 0
+    for seq, issue in enumerate(issues):
+        if after_seq is not None and seq <= after_seq:
+            continue
+        if severity and issue.get("severity") != severity:
+            continue
+        if code and issue.get("code") != code:
+            continue
+        if skipped < offset:
+            skipped += 1
+            continue
+        page.append((seq, issue))
+        if limit and len(page) >= limit:
+            break
+    return page
@@ -0,0 +1,140 @@
+import csv
+import hashlib
+import json
+import os
+import tempfile
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from billiard import Process
+
+from app.services.validation import iter_text_lines, validate_rows_streaming
+from app.services.validation_columnar import validate_csv_streaming
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+# (start_byte, end_byte, rows_before) for each shard; rows_before is the global row offset.
+Shard = Tuple[int, int, int]
+
+
+def _tracked_lines(handle, position: List[int]) -> Iterator[str]:
+    for line in handle:
+        position[0] += len(line)
+        yield line.decode()
+
+
+def plan_shards(path: str, shard_count: int) -> Tuple[List[str], List[Shard], int]:
+    # csv.reader only pulls the lines it needs for the current record, so the byte
+    # position after each record is a safe row-aligned cut point even with quoted newlines.
+    size = os.path.getsize(path)
+    shards: List[Shard] = []
+    position = [0]
+    with open(path, "rb") as handle:
+        reader = csv.reader(_tracked_lines(handle, position))
+        fieldnames = next(reader, [])
+        start = position[0]
+        rows_before = 0
+        rows = 0
+        target = start + max((size - start) // max(shard_count, 1), 1)
+        for record in reader:
+            if record:
+                rows += 1
+            if position[0] >= target and len(shards) < shard_count - 1:
+                shards.append((start, position[0], rows_before))
+                start = position[0]
+                rows_before = rows
+                target = start + max((size - start) // max(shard_count - len(shards), 1), 1)
+        if position[0] > start or not shards:
+            shards.append((start, position[0], rows_before))
+    return fieldnames, shards, rows
+
+
+def _iter_range(path: str, start: int, end: int, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = handle.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _shard_path(out_dir: str, index: int) -> str:
+    return os.path.join(out_dir, f"shard-{index:05d}.json")
+
+
+def _validate_shard(
+    path: str, shard: Shard, fieldnames: List[str], mapping: Dict, out_path: str, engine: str
+) -> None:
+    start, end, rows_before = shard
+    with open(out_path, "wb") as out:
+        lines = iter_text_lines(_iter_range(path, start, end))
+        if engine == "columnar":
+            summary, _ = validate_csv_streaming(
+                lines, mapping, out.write, fieldnames=fieldnames, first_row_number=rows_before + 1
+            )
+        else:
+            rows = csv.DictReader(lines, fieldnames=fieldnames)
+            summary, _ = validate_rows_streaming(rows, mapping, out.write, first_row_number=rows_before + 1)
+    with open(out_path + ".summary", "w") as out:
+        json.dump(summary, out)
+
+
+def validate_file_sharded(
+    path: str,
+    mapping: Dict,
+    sink: Callable[[bytes], None],
+    workers: int,
+    on_progress: Optional[Callable[[int], None]] = None,
+    engine: str = "columnar",
+) -> Tuple[Dict, str]:
+    fieldnames, shards, total_rows = plan_shards(path, workers)
+    summary = {"ERROR": 0, "WARN": 0, "INFO": 0, "total_rows": total_rows}
+    digest = hashlib.sha256()
+
+    def emit(data: bytes) -> None:
+        digest.update(data)
+        sink(data)
+
+    emit(b"[")
+    wrote_issue = False
+    with tempfile.TemporaryDirectory(prefix="aegis-validate-") as out_dir:
+        # billiard processes may be started from daemonic Celery prefork children.
+        processes = [
+            Process(
+                target=_validate_shard,
+                args=(path, shard, fieldnames, mapping, _shard_path(out_dir, index), engine),
+            )
+            for index, shard in enumerate(shards)
+        ]
+        try:
+            for process in processes:
+                process.start()
+            # Merging in shard order reproduces the serial artifact byte for byte.
+            for index, (process, (_, _, rows_before)) in enumerate(zip(processes, shards)):
+                process.join()
+                if process.exitcode != 0:
+                    raise RuntimeError(f"validation shard {index} failed with exit code {process.exitcode}")
+                out_path = _shard_path(out_dir, index)
+                with open(out_path + ".summary") as handle:
+                    shard_summary = json.load(handle)
+                for severity in ("ERROR", "WARN", "INFO"):
+                    summary[severity] += shard_summary[severity]
+                body_size = os.path.getsize(out_path) - 2
+                if body_size > 0:
+                    if wrote_issue:
+                        emit(b",")
+                    for chunk in _iter_range(out_path, 1, 1 + body_size):
+                        emit(chunk)
+                    wrote_issue = True
+                os.remove(out_path)
+                if on_progress:
+                    on_progress(rows_before + shard_summary["total_rows"])
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+    emit(b"]")
+    return summary, digest.hexdigest()
@@ -1,12 +1,17 @@
 import hashlib
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
 
 import boto3
 from botocore.client import Config
+from botocore.exceptions import ClientError
 
 from app.core.config import get_settings
 
 settings = get_settings()
 
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
 
 def get_client():
     return boto3.client(
@@ -30,14 +35,234 @@ def compute_checksum(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def object_uri(key: str) -> str:
+    return f"s3://{settings.minio_bucket}/{key}"
+
+
+def key_from_uri(uri: str) -> str:
+    return uri.split(f"s3://{settings.minio_bucket}/", 1)[1]
+
+
 def put_object(key: str, data: bytes, content_type: str = "application/octet-stream") -> str:
     ensure_bucket()
     client = get_client()
     client.put_object(Bucket=settings.minio_bucket, Key=key, Body=data, ContentType=content_type)
-    return f"s3://{settings.minio_bucket}/{key}"
+    return object_uri(key)
 
 
 def get_object(key: str) -> bytes:
     client = get_client()
     resp = client.get_object(Bucket=settings.minio_bucket, Key=key)
     return resp["Body"].read()
+
+
+def delete_object(key: str, client=None) -> None:
+    client = client or get_client()
+    client.delete_object(Bucket=settings.minio_bucket, Key=key)
+
+
+def read_object_head(key: str, length: int, client=None) -> bytes:
+    client = client or get_client()
+    resp = client.get_object(Bucket=settings.minio_bucket, Key=key, Range=f"bytes=0-{length - 1}")
+    return resp["Body"].read()
+
+
+def object_size(key: str, client=None) -> int:
+    client = client or get_client()
+    return int(client.head_object(Bucket=settings.minio_bucket, Key=key)["ContentLength"])
+
+
+def download_object(key: str, handle, chunk_size: int = DEFAULT_CHUNK_SIZE, client=None) -> int:
+    written = 0
+    for chunk in iter_object_chunks(key, chunk_size, client=client):
+        handle.write(chunk)
+        written += len(chunk)
+    handle.flush()
+    return written
+
+
+def client_error_code(exc: ClientError) -> Optional[str]:
+    return exc.response.get("Error", {}).get("Code")
+
+
+def get_object_or_none(key: str) -> Optional[bytes]:
+    try:
+        return get_object(key)
+    except ClientError as exc:
+        if client_error_code(exc) in ("NoSuchKey", "404"):
+            return None
+        raise
+
+
+def object_exists(key: str, client=None) -> bool:
+    try:
+        object_size(key, client=client)
+    except ClientError as exc:
+        if client_error_code(exc) in ("NoSuchKey", "404"):
+            return False
+        raise
+    return True
+
+
+def iter_object_chunks(key: str, chunk_size: int = DEFAULT_CHUNK_SIZE, client=None) -> Iterator[bytes]:
+    client = client or get_client()
+    resp = client.get_object(Bucket=settings.minio_bucket, Key=key)
+    body = resp["Body"]
+    try:
+        for chunk in body.iter_chunks(chunk_size):
+            if chunk:
+                yield chunk
+    finally:
+        body.close()
+
+
+def object_checksum(key: str, client=None) -> str:
+    digest = hashlib.sha256()
+    for chunk in iter_object_chunks(key, client=client):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def create_multipart_upload(key: str, content_type: str = "application/octet-stream", client=None) -> str:
+    if client is None:
+        ensure_bucket()
+        client = get_client()
+    resp = client.create_multipart_upload(Bucket=settings.minio_bucket, Key=key, ContentType=content_type)
+    return resp["UploadId"]
+
+
+def upload_part(key: str, upload_id: str, part_number: int, data: bytes, client=None) -> str:
+    client = client or get_client()
+    resp = client.upload_part(
+        Bucket=settings.minio_bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=data
+    )
+    return resp["ETag"]
+
+
+def complete_multipart_upload(key: str, upload_id: str, parts: List[Dict[str, Any]], client=None) -> str:
+    client = client or get_client()
+    try:
+        client.complete_multipart_upload(
+            Bucket=settings.minio_bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+        )
+    except ClientError as exc:
+        # S3 forgets the upload id once the object is assembled, so a retried completion whose
+        # object exists already succeeded.
+        if client_error_code(exc) != "NoSuchUpload" or not object_exists(key, client=client):
+            raise
+    return object_uri(key)
+
+
+def abort_multipart_upload(key: str, upload_id: str, client=None) -> None:
+    client = client or get_client()
+    try:
+        client.abort_multipart_upload(Bucket=settings.minio_bucket, Key=key, UploadId=upload_id)
+    except ClientError as exc:
+        if client_error_code(exc) != "NoSuchUpload":
+            raise
+
+
+class MultipartUploadWriter:
+    def __init__(
+        self,
+        key: str,
+        content_type: str = "application/octet-stream",
+        part_size: Optional[int] = None,
+        client=None,
+    ):
+        self.key = key
+        self.content_type = content_type
+        self.part_size = max(int(part_size or settings.s3_part_size_bytes), MIN_PART_SIZE)
+        self.client = client
+        self.upload_id: Optional[str] = None
+        self.parts: List[Dict[str, Any]] = []
+        self.bytes_written = 0
+        self.uri: Optional[str] = None
+        self._buffer = bytearray()
+
+    def __enter__(self) -> "MultipartUploadWriter":
+        self._start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _start(self) -> None:
+        if self.upload_id is not None:
+            return
+        if self.client is None:
+            ensure_bucket()
+            self.client = get_client()
+        resp = self.client.create_multipart_upload(
+            Bucket=settings.minio_bucket, Key=self.key, ContentType=self.content_type
+        )
+        self.upload_id = resp["UploadId"]
+
+    def _flush_part(self, data: bytes) -> None:
+        part_number = len(self.parts) + 1
+        resp = self.client.upload_part(
+            Bucket=settings.minio_bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        self.parts.append({"PartNumber": part_number, "ETag": resp["ETag"]})
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        self._start()
+        self._buffer.extend(data)
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            self._flush_part(part)
+
+    def close(self) -> str:
+        if self.uri is not None:
+            return self.uri
+        self._start()
+        if self._buffer or not self.parts:
+            self._flush_part(bytes(self._buffer))
+            self._buffer = bytearray()
+        self.client.complete_multipart_upload(
+            Bucket=settings.minio_bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+        self.uri = object_uri(self.key)
+        return self.uri
+
+    def abort(self) -> None:
+        if self.upload_id is None or self.uri is not None:
+            return
+        try:
+            self.client.abort_multipart_upload(
+                Bucket=settings.minio_bucket, Key=self.key, UploadId=self.upload_id
+            )
+        finally:
+            self._buffer = bytearray()
+
+
+def upload_stream(
+    key: str,
+    stream: BinaryIO,
+    content_type: str = "application/octet-stream",
+    part_size: Optional[int] = None,
+    client=None,
+) -> Tuple[str, str, int]:
+    digest = hashlib.sha256()
+    with MultipartUploadWriter(key, content_type=content_type, part_size=part_size, client=client) as writer:
+        while True:
+            chunk = stream.read(writer.part_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            writer.write(chunk)
+    return writer.uri, digest.hexdigest(), writer.bytes_written
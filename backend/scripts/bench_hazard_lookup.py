@@ -0,0 +1,110 @@
+import os
+import random
+import statistics
+import sys
+import time
+
+from sqlalchemy import func, select
+
+from app.db import SessionLocal
+from app.models import HazardDatasetVersion, HazardFeaturePolygon
+from app.services.hazard_lookup import feature_contains_point, lookup_feature_ids
+
+TENANT_ID = os.getenv("BENCH_TENANT_ID", "demo")
+VERSION_ID = os.getenv("BENCH_HAZARD_VERSION_ID")
+POINTS = int(os.getenv("BENCH_POINTS", "1000"))
+SEED = int(os.getenv("BENCH_SEED", "7"))
+
+
+def _fail(message: str) -> None:
+    print(f"FAIL: {message}")
+    sys.exit(1)
+
+
+def _point(lon: float, lat: float):
+    return func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)
+
+
+def _raw_lookup(session, version_id: int, lon: float, lat: float):
+    point = _point(lon, lat)
+    return session.execute(
+        select(HazardFeaturePolygon.id).where(
+            HazardFeaturePolygon.tenant_id == TENANT_ID,
+            HazardFeaturePolygon.hazard_dataset_version_id == version_id,
+            func.ST_Contains(HazardFeaturePolygon.geom, point),
+        )
+    ).scalars().all()
+
+
+def _subdivided_lookup(session, version_id: int, lon: float, lat: float):
+    point = _point(lon, lat)
+    return session.execute(
+        select(HazardFeaturePolygon.id).where(
+            HazardFeaturePolygon.tenant_id == TENANT_ID,
+            HazardFeaturePolygon.hazard_dataset_version_id == version_id,
+            feature_contains_point(TENANT_ID, [version_id], point),
+        )
+    ).scalars().all()
+
+
+def _cell_index_lookup(session, version_id: int, lon: float, lat: float):
+    return lookup_feature_ids(session, TENANT_ID, [version_id], [(lon, lat)])[0]
+
+
+def _time(session, lookup, version_id: int, points):
+    timings = []
+    results = []
+    for lon, lat in points:
+        started = time.perf_counter()
+        results.append(set(lookup(session, version_id, lon, lat)))
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return timings, results
+
+
+def main() -> None:
+    session = SessionLocal()
+    try:
+        if VERSION_ID:
+            version_id = int(VERSION_ID)
+        else:
+            version_id = session.execute(
+                select(HazardDatasetVersion.id)
+                .where(HazardDatasetVersion.tenant_id == TENANT_ID, HazardDatasetVersion.feature_count > 0)
+                .order_by(HazardDatasetVersion.created_at.desc())
+                .limit(1)
+            ).scalar_one_or_none()
+        if version_id is None:
+            _fail(f"no ingested hazard dataset version for tenant {TENANT_ID}")
+        extent = session.execute(
+            select(
+                func.ST_XMin(func.ST_Extent(HazardFeaturePolygon.geom)),
+                func.ST_YMin(func.ST_Extent(HazardFeaturePolygon.geom)),
+                func.ST_XMax(func.ST_Extent(HazardFeaturePolygon.geom)),
+                func.ST_YMax(func.ST_Extent(HazardFeaturePolygon.geom)),
+            ).where(HazardFeaturePolygon.hazard_dataset_version_id == version_id)
+        ).one()
+        if extent[0] is None:
+            _fail(f"hazard dataset version {version_id} has no features")
+        rng = random.Random(SEED)
+        points = [(rng.uniform(extent[0], extent[2]), rng.uniform(extent[1], extent[3])) for _ in range(POINTS)]
+        # Warm every path so the first measured lookups don't pay for plan caching and page faults.
+        lookups = (("raw", _raw_lookup), ("subdivided", _subdivided_lookup), ("cell_index", _cell_index_lookup))
+        for _, lookup in lookups:
+            _time(session, lookup, version_id, points[:10])
+        measured = {name: _time(session, lookup, version_id, points) for name, lookup in lookups}
+        raw_ms, raw_hits = measured["raw"]
+        for name, (timings, hits) in measured.items():
+            ordered = sorted(timings)
+            mismatched = sum(1 for a, b in zip(raw_hits, hits) if a != b)
+            print(
+                f"{name:>10} version={version_id} points={len(points)} "
+                f"mean_ms={statistics.mean(timings):8.3f} p50_ms={ordered[len(ordered) // 2]:8.3f} "
+                f"p95_ms={ordered[int(len(ordered) * 0.95) - 1]:8.3f} "
+                f"speedup={statistics.mean(raw_ms) / statistics.mean(timings):6.2f}x mismatched_points={mismatched}"
+            )
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+
+from sqlalchemy import delete
+
+from app.db import SessionLocal, engine
+from app.models import ExposureVersion, Location, Tenant
+from app.services.bulk_load import copy_locations
+from app.services.commit import location_values
+
+TENANT_ID = os.getenv("BENCH_TENANT_ID", "demo")
+SIZES = [int(s) for s in os.getenv("BENCH_SIZES", "100000,1000000,5000000").split(",") if s]
+ENGINES = [e for e in os.getenv("BENCH_ENGINES", "orm,copy").split(",") if e]
+ORM_MAX_ROWS = int(os.getenv("BENCH_ORM_MAX_ROWS", "1000000"))
+
+
+def _fail(message: str) -> None:
+    print(f"FAIL: {message}")
+    sys.exit(1)
+
+
+def _synthetic_rows(count: int):
+    for i in range(count):
+        yield {
+            "external_location_id": f"BENCH-{i:09d}",
+            "address_line1": f"{i} Main St",
+            "city": "Springfield",
+            "state_region": "IL",
+            "postal_code": "62701",
+            "country": "US",
+            "latitude": str(39.0 + (i % 1000) / 1000.0),
+            "longitude": str(-89.0 - (i % 1000) / 1000.0),
+            "currency": "USD" if i % 10 else "",
+            "lob": "PROP",
+            "product_code": "",
+            "tiv": str(100000 + i),
+            "limit": str(50000 + i),
+            "premium": "1250.5",
+        }
+
+
+def _values(count: int, default_currency):
+    for mapped in _synthetic_rows(count):
+        loc = location_values(mapped, default_currency)
+        if loc is not None:
+            yield loc
+
+
+def _commit_orm(session, exposure_version_id: int, count: int, default_currency) -> None:
+    session.bulk_save_objects(
+        [
+            Location(tenant_id=TENANT_ID, exposure_version_id=exposure_version_id, **loc)
+            for loc in _values(count, default_currency)
+        ]
+    )
+    session.commit()
+
+
+def _commit_copy(exposure_version_id: int, count: int, default_currency) -> None:
+    raw_conn = engine.raw_connection()
+    try:
+        copy_locations(raw_conn, TENANT_ID, exposure_version_id, _values(count, default_currency))
+    finally:
+        raw_conn.close()
+
+
+def main() -> None:
+    session = SessionLocal()
+    try:
+        tenant = session.get(Tenant, TENANT_ID)
+        if not tenant:
+            _fail(f"tenant {TENANT_ID} not found (run seed first)")
+        for size in SIZES:
+            for engine_name in ENGINES:
+                if engine_name == "orm" and size > ORM_MAX_ROWS:
+                    print(f"SKIP: orm rows={size} (BENCH_ORM_MAX_ROWS={ORM_MAX_ROWS})")
+                    continue
+                exposure_version = ExposureVersion(tenant_id=TENANT_ID, name=f"bench-{engine_name}-{size}")
+                session.add(exposure_version)
+                session.commit()
+                started = time.perf_counter()
+                try:
+                    if engine_name == "copy":
+                        _commit_copy(exposure_version.id, size, tenant.default_currency)
+                    else:
+                        _commit_orm(session, exposure_version.id, size, tenant.default_currency)
+                    elapsed = time.perf_counter() - started
+                    print(f"{engine_name:>4} rows={size:>9} seconds={elapsed:8.2f} rows_per_sec={size / elapsed:10.0f}")
+                finally:
+                    session.rollback()
+                    session.execute(delete(Location).where(Location.exposure_version_id == exposure_version.id))
+                    session.delete(exposure_version)
+                    session.commit()
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+from app.services.bulk_load import (
+    LOCATION_COPY_COLUMNS,
+    CopyRowReader,
+    copy_locations,
+    copy_text_value,
+    encode_copy_row,
+)
+from app.services.commit import location_values
+
+
+def test_copy_text_value_escapes_and_nulls():
+    assert copy_text_value(None) == "\\N"
+    assert copy_text_value(1.5) == "1.5"
+    assert copy_text_value(0.1 + 0.2) == repr(0.1 + 0.2)
+    assert copy_text_value("a\tb\nc\\d\re") == "a\\tb\\nc\\\\d\\re"
+    assert encode_copy_row([1, None, "x"]) == b"1\t\\N\tx\n"
+
+
+def test_copy_row_reader_serves_sized_reads():
+    reader = CopyRowReader(iter([b"abc\n", b"de\n", b"f\n"]))
+    assert reader.read(2) == b"ab"
+    assert reader.read(5) == b"c\nde\n"
+    assert reader.read() == b"f\n"
+    assert reader.read(4) == b""
+
+
+def test_location_values_matches_orm_rules():
+    assert location_values({"external_location_id": "A", "tiv": "1"}) is None
+    loc = location_values({"external_location_id": 7, "lob": "PROP", "tiv": "10", "lat": "1.5"}, "EUR")
+    assert loc["external_location_id"] == "7"
+    assert loc["currency"] == "EUR"
+    assert loc["latitude"] == 1.5
+    assert loc["tiv"] == 10.0
+    assert set(loc) == {name for name, _ in LOCATION_COPY_COLUMNS}
+
+
+class FakeCursor:
+    def __init__(self):
+        self.statements = []
+        self.copied = []
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+        if sql.startswith("INSERT"):
+            self.rowcount = sum(len(batch) for batch in self.copied)
+
+    def copy_expert(self, sql, file):
+        data = file.read(8192)
+        chunks = []
+        while data:
+            chunks.append(data)
+            data = file.read(8192)
+        self.copied.append([line for line in b"".join(chunks).split(b"\n") if line])
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.cur = FakeCursor()
+        self.committed = False
+        self.rolled_back = False
+
+    def cursor(self):
+        return self.cur
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def test_copy_locations_batches_and_reports_progress():
+    conn = FakeConnection()
+    rows = [location_values({"external_location_id": f"L{i}", "lob": "PROP", "tiv": str(i)}, "USD") for i in range(5)]
+    seen = []
+    inserted = copy_locations(conn, "t1", 3, iter(rows), on_progress=seen.append, batch_rows=2)
+    assert inserted == 5
+    assert seen == [2, 4, 5]
+    assert [len(batch) for batch in conn.cur.copied] == [2, 2, 1]
+    first = conn.cur.copied[0][0].split(b"\t")
+    assert first[0] == b"0"
+    assert first[1] == b"L0"
+    assert conn.cur.statements[0][0].startswith("CREATE TEMP TABLE location_stage")
+    insert_sql, params = conn.cur.statements[-1]
+    assert "ORDER BY seq" in insert_sql
+    assert params == {"tenant_id": "t1", "exposure_version_id": 3}
+    assert conn.committed
@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.services import geoapify
+from app.services.providers.base import ProviderError
+from app.services.providers.circuit_breaker import CircuitBreaker
+from app.services.providers.http_geocoder import HttpGeocoder
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock):
+    return CircuitBreaker(
+        "geocoder", failure_rate_threshold=0.5, minimum_calls=4, window_seconds=10, open_seconds=5, clock=clock
+    )
+
+
+def test_breaker_opens_on_failure_rate_and_recovers_through_half_open():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for ok in (True, False, True, False):
+        breaker.before_call()
+        breaker.record_success() if ok else breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(ProviderError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.code == "circuit_open"
+    clock.now += 5
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    with pytest.raises(ProviderError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 5
+    breaker.before_call()
+    breaker.record_success()
+    snapshot = breaker.snapshot()
+    assert snapshot["state"] == "closed"
+    assert snapshot["rejected"] == 2
+    assert snapshot["window_calls"] == 1
+
+
+def test_breaker_needs_minimum_calls_and_ignores_old_failures():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    clock.now += 11
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_error(ProviderError(code="bad_request", message="x"))
+    assert breaker.snapshot()["window_failures"] == 1
+
+
+def test_http_geocoder_fails_fast_when_circuit_open():
+    calls = {"count": 0}
+
+    def handler(request):
+        calls["count"] += 1
+        return httpx.Response(503)
+
+    breaker = CircuitBreaker("geocoder", minimum_calls=2, open_seconds=60)
+    geocoder = HttpGeocoder(
+        base_url="https://example/geocode",
+        api_key=None,
+        api_key_header="Authorization",
+        mapping={"lat": "/lat", "lon": "/lon"},
+        timeout_seconds=5.0,
+        connect_timeout_seconds=1.0,
+        max_retries=3,
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        breaker=breaker,
+    )
+    with pytest.raises(ProviderError) as excinfo:
+        geocoder.forward_geocode({"address_line1": "1 Main"})
+    assert excinfo.value.code == "circuit_open"
+    assert calls["count"] == 2
+    with pytest.raises(ProviderError):
+        geocoder.forward_geocode({"address_line1": "1 Main"})
+    assert calls["count"] == 2
+
+
+def test_unrecorded_half_open_probe_times_out_back_to_open():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 5
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    clock.now += 5
+    with pytest.raises(ProviderError):
+        breaker.before_call()
+    assert breaker.state == "open"
+    clock.now += 5
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_geoapify_records_outcome_for_unparseable_response(monkeypatch):
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 5
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"not json")))
+    settings = SimpleNamespace(geoapify_api_key="k", geoapify_autocomplete_url="https://example/ac")
+    monkeypatch.setattr(geoapify, "get_settings", lambda: settings)
+    monkeypatch.setattr(geoapify, "get_circuit_breaker", lambda name: breaker)
+    monkeypatch.setattr(geoapify, "get_http_client", lambda name: client)
+    with pytest.raises(ValueError):
+        geoapify.geoapify_autocomplete("1 Main")
+    assert breaker.state == "closed"
+    breaker.before_call()
@@ -0,0 +1,56 @@
+import gzip
+
+import pytest
+
+from app.services.commit import canonicalize_rows
+from app.services.compression import (
+    ENCODING_GZIP,
+    ENCODING_ZSTD,
+    declared_encoding,
+    decompress_bytes,
+    iter_decompressed,
+    sniff_encoding,
+)
+from app.services.validation import iter_text_lines, read_csv_bytes
+
+CSV_BYTES = b"external_location_id,tiv,lob\n" + b"".join(b"L%d,%d,PROP\n" % (i, i) for i in range(2000))
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def test_detects_encoding_from_headers_and_magic_bytes():
+    assert declared_encoding(None, "application/gzip") == ENCODING_GZIP
+    assert declared_encoding("zstd", "text/csv") == ENCODING_ZSTD
+    assert declared_encoding("identity", "text/csv; charset=utf-8") is None
+    assert sniff_encoding(gzip.compress(b"x")[:4]) == ENCODING_GZIP
+    assert sniff_encoding(b"\x28\xb5\x2f\xfd") == ENCODING_ZSTD
+    assert sniff_encoding(b"exte") is None
+
+
+def test_gzip_stream_decompresses_across_chunks_and_members():
+    data = gzip.compress(CSV_BYTES[:5000]) + gzip.compress(CSV_BYTES[5000:])
+    for size in (1, 13, 4096, len(data)):
+        assert b"".join(iter_decompressed(_chunks(data, size), ENCODING_GZIP)) == CSV_BYTES
+    lines = list(iter_text_lines(iter_decompressed(_chunks(data, 100), ENCODING_GZIP)))
+    assert "".join(lines).encode() == CSV_BYTES
+
+
+def test_truncated_gzip_is_rejected():
+    with pytest.raises(ValueError):
+        list(iter_decompressed([gzip.compress(CSV_BYTES)[:-8]], ENCODING_GZIP))
+
+
+def test_one_shot_readers_accept_compressed_bytes():
+    compressed = gzip.compress(CSV_BYTES)
+    assert decompress_bytes(CSV_BYTES) == CSV_BYTES
+    assert read_csv_bytes(compressed) == read_csv_bytes(CSV_BYTES)
+    assert canonicalize_rows(compressed, {}) == canonicalize_rows(CSV_BYTES, {})
+
+
+def test_zstd_stream_decompresses():
+    zstandard = pytest.importorskip("zstandard")
+    data = zstandard.ZstdCompressor().compress(CSV_BYTES)
+    assert sniff_encoding(data) == ENCODING_ZSTD
+    assert b"".join(iter_decompressed(_chunks(data, 7), ENCODING_ZSTD)) == CSV_BYTES
@@ -0,0 +1,87 @@
+import pytest
+
+from app.core.config import get_settings
+from app.jobs import celery_app
+from app.models import ExposureUpload, ExposureVersion, Run, RunStatus, RunType
+from app.services.content_dedup import content_key, reuse_refs
+
+settings = get_settings()
+
+MAPPING = {"external_location_id": "id", "tiv": "value"}
+
+
+def test_content_key_is_stable_and_scoped():
+    key = content_key("abc", MAPPING, "v1")
+    assert key == content_key("abc", dict(reversed(list(MAPPING.items()))), "v1")
+    assert key != content_key("abd", MAPPING, "v1")
+    assert key != content_key("abc", {**MAPPING, "tiv": "tiv"}, "v1")
+    assert key != content_key("abc", MAPPING, "v2")
+    assert content_key("abc", None, "v1") == content_key("abc", {}, "v1")
+
+
+def test_content_key_requires_checksum():
+    assert content_key(None, MAPPING, "v1") is None
+    assert content_key("", MAPPING, "v1") is None
+
+
+def test_reuse_refs_records_source():
+    refs = reuse_refs("exposure_version", 7, "u1", "k")
+    assert refs == {
+        "exposure_version_id": 7,
+        "reused_exposure_version_id": 7,
+        "reused_from_upload_id": "u1",
+        "content_key": "k",
+    }
+
+
+class _FakeSession:
+    def __init__(self, objects):
+        self.objects = objects
+        self.added = []
+
+    def get(self, model, key):
+        return self.objects.get((model, key))
+
+    def add(self, obj):
+        self.added.append(obj)
+        if getattr(obj, "id", None) is None:
+            obj.id = len(self.added)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _commit_fixture(monkeypatch, insert_locations):
+    run = Run(id=1, tenant_id="t1", run_type=RunType.COMMIT, status=RunStatus.QUEUED, config_refs_json={})
+    upload = ExposureUpload(
+        id="u1", tenant_id="t1", object_uri=f"s3://{settings.minio_bucket}/u1.csv", checksum="abc"
+    )
+    session = _FakeSession({(Run, 1): run, (ExposureUpload, "u1"): upload})
+    monkeypatch.setattr(celery_app, "SessionLocal", lambda: session)
+    monkeypatch.setattr(celery_app, "_upload_chunks", lambda upload, key: [b"external_location_id,tiv\nA,1\n"])
+    monkeypatch.setattr(celery_app, "_insert_locations", insert_locations)
+    monkeypatch.setattr(celery_app, "_write_exposure_snapshot", lambda *args: None)
+    return run, session
+
+
+def test_failed_commit_leaves_exposure_version_unreusable(monkeypatch):
+    def fail(*args):
+        raise RuntimeError("copy failed")
+
+    run, session = _commit_fixture(monkeypatch, fail)
+    with pytest.raises(RuntimeError):
+        celery_app.commit_upload(1, "u1", "t1")
+    (version,) = [obj for obj in session.added if isinstance(obj, ExposureVersion)]
+    assert run.status == RunStatus.FAILED
+    assert version.content_key is None
+
+
+def test_succeeded_commit_publishes_content_key(monkeypatch):
+    run, session = _commit_fixture(monkeypatch, lambda *args: None)
+    celery_app.commit_upload(1, "u1", "t1")
+    (version,) = [obj for obj in session.added if isinstance(obj, ExposureVersion)]
+    assert run.status == RunStatus.SUCCEEDED
+    assert version.content_key == content_key("abc", {}, settings.code_version)
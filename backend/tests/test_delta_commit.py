@@ -0,0 +1,49 @@
+from app.models import Location
+from app.services.commit import location_values
+from app.services.delta_commit import (
+    CARRIED_COLUMNS,
+    DELTA_COPY_COLUMNS,
+    annotate_delta,
+    carry_forward_sql,
+    location_row_hash,
+    new_delta_stats,
+)
+
+
+def _loc(external_id: str, tiv: str):
+    return location_values({"external_location_id": external_id, "lob": "PROP", "tiv": tiv}, "USD")
+
+
+def test_row_hash_tracks_committed_values_only():
+    assert location_row_hash(_loc("A", "10")) == location_row_hash(_loc("A", "10.0"))
+    assert location_row_hash(_loc("A", "10")) != location_row_hash(_loc("A", "11"))
+    assert location_row_hash({**_loc("A", "10"), "source_location_id": 5}) == location_row_hash(_loc("A", "10"))
+
+
+def test_annotate_delta_links_unchanged_rows_to_base():
+    base_index = {
+        "A": (101, location_row_hash(_loc("A", "10"))),
+        "B": (102, location_row_hash(_loc("B", "20"))),
+        "C": (103, None),
+        "D": (104, location_row_hash(_loc("D", "40"))),
+    }
+    stats = new_delta_stats()
+    values = [_loc("A", "10"), _loc("B", "21"), _loc("C", "30"), _loc("E", "50")]
+    rows = list(annotate_delta(values, base_index, stats))
+    assert [row["source_location_id"] for row in rows] == [101, None, None, None]
+    assert all(row["row_hash"] == location_row_hash(row) for row in rows)
+    assert stats == {"new": 1, "changed": 2, "unchanged": 1, "removed": 1}
+
+
+def test_full_commit_still_records_row_hashes():
+    stats = new_delta_stats()
+    rows = list(annotate_delta([_loc("A", "1")], None, stats))
+    assert rows[0]["row_hash"] and rows[0]["source_location_id"] is None
+    assert stats == {"new": 1, "changed": 0, "unchanged": 0, "removed": 0}
+
+
+def test_delta_columns_exist_on_location():
+    columns = set(Location.__table__.columns.keys())
+    assert {name for name, _ in DELTA_COPY_COLUMNS} <= columns
+    assert set(CARRIED_COLUMNS) <= columns
+    assert all(f'"{name}" = base."{name}"' in carry_forward_sql() for name in CARRIED_COLUMNS)
@@ -20,3 +20,11 @@ def test_commit_ordering_stable():
     csv_bytes = b"external_location_id,latitude,longitude,tiv\nB,1,1,10\nA,2,2,20\n"
     rows = canonicalize_rows(csv_bytes, {})
     assert [r["external_location_id"] for r in rows] == ["A", "B"]
+
+
+def test_commit_ordering_stable_with_external_sort():
+    csv_bytes = b"external_location_id,tiv\nB,1\nA,2\nB,3\nA,4\nC,5\nA,6\n"
+    in_memory = canonicalize_rows(csv_bytes, {})
+    spilled = list(canonicalize_rows(csv_bytes, {}, buffer_rows=2))
+    assert spilled == in_memory
+    assert [r["tiv"] for r in spilled] == ["2", "4", "6", "1", "3", "5"]
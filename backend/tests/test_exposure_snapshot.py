@@ -0,0 +1,105 @@
+import hashlib
+import io
+import json
+import math
+
+import numpy as np
+
+from app.jobs import celery_app
+from app.services.exposure_snapshot import (
+    MANIFEST_NAME,
+    SNAPSHOT_COLUMNS,
+    ExposureSnapshot,
+    local_file_fetcher,
+    snapshot_prefix,
+    write_exposure_snapshot,
+)
+
+ROWS = [
+    (1, "A", "1 Main", "Austin", "TX", "78701", "US", 30.1, -97.7, "USD", "PROP", None, "A", 100.0, None, 5.5),
+    (2, "B", None, None, None, None, "US", None, None, "USD", None, "P1", None, 0.0, 10.0, None),
+    (3, "C", "2 Main", "Austin", "TX", "78701", "US", 30.2, float("nan"), "EUR", "PROP", None, "B", 50.0, 1.0, 0.0),
+]
+
+
+def _write(tmp_path):
+    tmp_path.mkdir(parents=True, exist_ok=True)
+    store = {}
+
+    def put(key, stream, content_type):
+        store[key] = stream.read()
+        return f"s3://bucket/{key}", hashlib.sha256(store[key]).hexdigest()
+
+    uri, checksum = write_exposure_snapshot(
+        "t1", 9, iter(ROWS), put, chunk_rows=2, tmp_dir=str(tmp_path), source_version="3:2026-10-01T00:00:00"
+    )
+
+    def download(key, handle):
+        handle.write(store[key])
+
+    prefix = snapshot_prefix("t1", 9)
+    return store, uri, checksum, local_file_fetcher(str(tmp_path / "cache"), download, prefix)
+
+
+def test_snapshot_round_trip(tmp_path):
+    store, uri, checksum, fetch = _write(tmp_path)
+    assert uri.endswith(f"{snapshot_prefix('t1', 9)}/{MANIFEST_NAME}")
+    manifest = json.loads(store[f"{snapshot_prefix('t1', 9)}/{MANIFEST_NAME}"])
+    snapshot = ExposureSnapshot(manifest, fetch)
+    assert snapshot.row_count == 3
+    assert snapshot.column_names == [name for name, _ in SNAPSHOT_COLUMNS]
+    assert isinstance(snapshot.array("tiv"), np.memmap)
+    assert snapshot.array("id").tolist() == [1, 2, 3]
+    assert snapshot.values("lob") == ["PROP", None, "PROP"]
+    assert snapshot.values("limit") == [None, 10.0, 1.0]
+    longitude = snapshot.values("longitude")
+    assert longitude[0] == -97.7 and longitude[1] is None and math.isnan(longitude[2])
+    codes, dictionary = snapshot.codes("currency")
+    assert dictionary == ["USD", "EUR"]
+    assert codes.tolist() == [0, 0, 1]
+    records = list(snapshot.iter_records(["external_location_id", "tiv"]))
+    assert records == [
+        {"external_location_id": "A", "tiv": 100.0},
+        {"external_location_id": "B", "tiv": 0.0},
+        {"external_location_id": "C", "tiv": 50.0},
+    ]
+
+
+def test_snapshot_is_deterministic(tmp_path):
+    first = _write(tmp_path / "a")
+    second = _write(tmp_path / "b")
+    assert first[0] == second[0]
+    assert first[2] == second[2]
+    assert list(first[0])[-1].endswith(MANIFEST_NAME)
+
+
+def test_streamed_columns_match_np_save(tmp_path):
+    store = _write(tmp_path)[0]
+    prefix = snapshot_prefix("t1", 9)
+    buf = io.BytesIO()
+    np.save(buf, np.array([100.0, 0.0, 50.0]), allow_pickle=False)
+    assert store[f"{prefix}/tiv.npy"] == buf.getvalue()
+    buf = io.BytesIO()
+    np.save(buf, np.array([True, False, True]), allow_pickle=False)
+    assert store[f"{prefix}/latitude.valid.npy"] == buf.getvalue()
+    assert f"{prefix}/tiv.valid.npy" not in store
+    manifest = json.loads(store[f"{prefix}/{MANIFEST_NAME}"])
+    tiv = next(entry for entry in manifest["columns"] if entry["name"] == "tiv")
+    assert tiv["checksums"]["tiv.npy"] == hashlib.sha256(store[f"{prefix}/tiv.npy"]).hexdigest()
+
+
+def test_rollup_reads_snapshot_only_while_it_matches_locations(tmp_path, monkeypatch):
+    store, _, _, fetch = _write(tmp_path)
+    snapshot = ExposureSnapshot(json.loads(store[f"{snapshot_prefix('t1', 9)}/{MANIFEST_NAME}"]), fetch)
+    assert snapshot.source_version == "3:2026-10-01T00:00:00"
+    assert list(snapshot.iter_records(["id", "quality_tier"]))[0] == {"id": 1, "quality_tier": "A"}
+    monkeypatch.setattr(celery_app, "open_exposure_snapshot", lambda tenant_id, version_id: snapshot)
+    monkeypatch.setattr(celery_app, "_exposure_source_version", lambda session, tenant_id, version_id: stamp)
+    stamp = "3:2026-10-01T00:00:00"
+    assert celery_app._open_exposure_snapshot(None, "t1", 9) is snapshot
+    # Geocoding moved updated_at after the snapshot was written.
+    stamp = "3:2026-10-02T00:00:00"
+    assert celery_app._open_exposure_snapshot(None, "t1", 9) is None
+    monkeypatch.setattr(celery_app.settings, "exposure_snapshots", False)
+    stamp = "3:2026-10-01T00:00:00"
+    assert celery_app._open_exposure_snapshot(None, "t1", 9) is None
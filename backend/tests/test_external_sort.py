@@ -0,0 +1,30 @@
+import random
+
+from app.services.external_sort import ExternalSorter
+
+
+def test_external_sort_spills_and_merges_stably():
+    rng = random.Random(3)
+    items = [(rng.randint(0, 20), idx) for idx in range(1000)]
+    sorter = ExternalSorter(lambda item: item[0], buffer_rows=64)
+    sorter.extend(items)
+    assert len(sorter) == 1000
+    assert sorter.spilled_runs == 1000 // 64
+    assert list(sorter.sorted()) == sorted(items, key=lambda item: item[0])
+
+
+def test_external_sort_without_budget_stays_in_memory():
+    sorter = ExternalSorter(str, buffer_rows=0)
+    sorter.extend(["b", "a", "c"])
+    assert list(sorter.sorted()) == ["a", "b", "c"]
+    assert sorter.spilled_runs == 0
+
+
+def test_external_sort_closes_runs_when_merge_is_abandoned():
+    with ExternalSorter(lambda item: item, buffer_rows=4) as sorter:
+        sorter.extend(range(20, 0, -1))
+        merged = sorter.sorted()
+        assert next(merged) == 1
+        handles = list(sorter._merging)
+    assert len(handles) == 5
+    assert all(handle.closed for handle in handles)
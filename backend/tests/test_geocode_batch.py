@@ -0,0 +1,143 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.geocode_batch import geocode_many
+from app.services.geocode_cache import GeocodeCache
+from app.services.providers.base import ProviderError, backoff_delay, retry_after_seconds
+from app.services.providers.rate_limit import TokenBucket, get_rate_limiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class RecordingGeocoder:
+    name = "recording"
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    def forward_geocode(self, address):
+        with self.lock:
+            self.calls.append(address["address_line1"])
+            self.threads.add(threading.get_ident())
+        if address["address_line1"] == "bad":
+            raise ProviderError(code="bad_request", message="no match")
+        return {"lat": 1.0, "lon": 2.0, "confidence": 0.8, "provider": self.name}
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(2.0, burst=2, clock=clock, sleep=clock.sleep)
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.slept == [0.5, 0.5]
+    assert get_rate_limiter("x", 0) is None
+    assert get_rate_limiter("x", 5) is get_rate_limiter("x", 5)
+
+
+def test_backoff_delay_is_jittered_exponential_and_capped():
+    assert backoff_delay(0, 0.0, 10.0) == 0.0
+    assert backoff_delay(0, 0.5, 10.0, rand=lambda: 1.0) == 0.5
+    assert backoff_delay(3, 0.5, 10.0, rand=lambda: 1.0) == 4.0
+    assert backoff_delay(10, 0.5, 10.0, rand=lambda: 1.0) == 10.0
+    assert backoff_delay(2, 0.5, 10.0, rand=lambda: 0.5) == 1.0
+    assert backoff_delay(0, 0.5, 10.0, retry_after=30) == 10.0
+    assert retry_after_seconds({"retry-after": "3"}) == 3.0
+    assert retry_after_seconds({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) is None
+    assert retry_after_seconds({}) is None
+
+
+def test_geocode_many_uses_cache_then_pool():
+    geocoder = RecordingGeocoder()
+    cache = GeocodeCache(100, 60, "1")
+    addresses = {f"fp{i}": {"address_line1": f"{i} Main"} for i in range(20)}
+    addresses["fp-bad"] = {"address_line1": "bad"}
+    cache.store(None, "t1", "recording", "fp0", {"lat": 9.0, "lon": 9.0})
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = geocode_many(addresses, "t1", None, geocoder, executor, cache=cache)
+    assert results["fp0"]["lat"] == 9.0
+    assert len(geocoder.calls) == 20
+    assert isinstance(results["fp-bad"], ProviderError)
+    assert results["fp5"]["lat"] == 1.0
+    again = geocode_many(addresses, "t1", None, geocoder, cache=cache)
+    assert again["fp5"] == results["fp5"]
+    assert geocoder.calls[20:] == ["bad"]
+
+
+class BatchGeocoder(RecordingGeocoder):
+    batch_size = 3
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def forward_geocode_batch(self, addresses):
+        self.batches.append(len(addresses))
+        results = []
+        for address in addresses:
+            try:
+                results.append(self.forward_geocode(address))
+            except ProviderError as exc:
+                results.append(exc)
+        return results
+
+
+def test_geocode_many_sends_batches_when_supported():
+    geocoder = BatchGeocoder()
+    addresses = {f"fp{i}": {"address_line1": f"{i} Main"} for i in range(7)}
+    addresses["fp-bad"] = {"address_line1": "bad"}
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = geocode_many(addresses, None, None, geocoder, executor, cache=GeocodeCache(0, 60, "1"))
+    assert sorted(geocoder.batches) == [2, 3, 3]
+    assert isinstance(results["fp-bad"], ProviderError)
+    assert all(results[f"fp{i}"]["lat"] == 1.0 for i in range(7))
+
+
+class CountingSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        rows = self.rows
+        self.rows = []
+
+        class _Result:
+            def all(self):
+                return rows
+
+        return _Result()
+
+
+def test_geocode_many_batches_cache_queries(monkeypatch):
+    import app.services.geocode_cache as geocode_cache
+
+    monkeypatch.setattr(geocode_cache, "DB_BATCH_SIZE", 4)
+    geocoder = RecordingGeocoder()
+    cache = GeocodeCache(0, 60, "1")
+    expires_at = cache.now() + cache.ttl
+    hit = type("Row", (), {"address_fingerprint": "fp1", "result_json": {"lat": 5.0, "lon": 5.0}, "expires_at": expires_at})
+    session = CountingSession([hit])
+    addresses = {f"fp{i}": {"address_line1": f"{i} Main"} for i in range(10)}
+    results = geocode_many(addresses, "t1", session, geocoder, cache=cache)
+    assert results["fp1"]["lat"] == 5.0
+    assert len(geocoder.calls) == 9
+    selects = [stmt for stmt in session.statements if stmt.is_select]
+    inserts = [stmt for stmt in session.statements if stmt.is_insert]
+    assert len(selects) == 3
+    assert len(inserts) == 3
+    assert cache.stats()["db_hits"] == 1
+    assert cache.stats()["misses"] == 9
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.geocode_cache import GeocodeCache, cached_forward_geocode
+from app.services.providers.base import ProviderError
+from app.services.property_enrichment import address_fingerprint, normalize_address
+
+ADDRESS = normalize_address({"address_line1": "1 Main St", "city": "Springfield", "country": "us"})
+FINGERPRINT = address_fingerprint(ADDRESS)
+
+
+class CountingGeocoder:
+    name = "counting"
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    def forward_geocode(self, address):
+        self.calls += 1
+        if self.fail:
+            raise ProviderError(code="upstream", message="down", retryable=True)
+        return {"lat": 1.0, "lon": 2.0, "confidence": 0.9, "provider": self.name}
+
+
+class Clock:
+    def __init__(self):
+        self.value = datetime(2024, 1, 1)
+
+    def __call__(self):
+        return self.value
+
+
+def test_cached_forward_geocode_hits_memory_tier():
+    cache = GeocodeCache(10, 60, "1")
+    geocoder = CountingGeocoder()
+    first = cached_forward_geocode(ADDRESS, FINGERPRINT, "t1", geocoder=geocoder, cache=cache)
+    second = cached_forward_geocode(ADDRESS, FINGERPRINT, "t1", geocoder=geocoder, cache=cache)
+    assert first == second
+    assert geocoder.calls == 1
+    cached_forward_geocode(ADDRESS, FINGERPRINT, "t2", geocoder=geocoder, cache=cache)
+    assert geocoder.calls == 2
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"], stats["stores"]) == (1, 2, 2)
+
+
+def test_cache_entries_expire_and_evict():
+    clock = Clock()
+    cache = GeocodeCache(2, 60, "1", now=clock)
+    result = {"lat": 1.0, "lon": 2.0}
+    cache.store(None, "t1", "p", "a", result)
+    assert cache.lookup(None, "t1", "p", "a") == result
+    clock.value += timedelta(seconds=61)
+    assert cache.lookup(None, "t1", "p", "a") is None
+    assert cache.stats()["expired"] == 1
+    for key in ("a", "b", "c"):
+        cache.store(None, "t1", "p", key, result)
+    assert cache.stats()["memory_entries"] == 2
+    assert cache.lookup(None, "t1", "p", "a") is None
+    assert cache.lookup(None, "t1", "other", "c") is None
+
+
+def test_provider_errors_and_untenanted_calls_are_not_cached():
+    cache = GeocodeCache(10, 60, "1")
+    failing = CountingGeocoder(fail=True)
+    with pytest.raises(ProviderError):
+        cached_forward_geocode(ADDRESS, FINGERPRINT, "t1", geocoder=failing, cache=cache)
+    assert cache.stats()["stores"] == 0
+    geocoder = CountingGeocoder()
+    cached_forward_geocode(ADDRESS, FINGERPRINT, None, geocoder=geocoder, cache=cache)
+    cached_forward_geocode(ADDRESS, FINGERPRINT, None, geocoder=geocoder, cache=cache)
+    assert geocoder.calls == 2
@@ -0,0 +1,123 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+from sqlalchemy.dialects import postgresql
+
+from app.services import hazard_lookup
+from app.services.hazard_ingest import copy_hazard_features, feature_rows, iter_geojson_features
+from app.services.hazard_lookup import build_cell_index_params, cell_size, cell_xy, iter_location_hazard_entries
+from app.services.hazard_raster import HazardRaster
+from tests.test_bulk_load import FakeConnection
+
+
+def test_cell_xy_lands_inside_the_envelope_the_index_builds():
+    zoom = 12
+    width, height = cell_size(zoom)
+    assert (width, height) == (360.0 / 4096, 180.0 / 4096)
+    for lon, lat in [(-180.0, -90.0), (-73.98, 40.75), (151.2, -33.87), (0.0, 0.0), (179.999, 89.999)]:
+        x, y = cell_xy(lon, lat, zoom)
+        assert x * width - 180 <= lon < (x + 1) * width - 180
+        assert y * height - 90 <= lat < (y + 1) * height - 90
+    assert build_cell_index_params("t1", 3, zoom) == {
+        "tenant_id": "t1",
+        "hazard_dataset_version_id": 3,
+        "width": width,
+        "height": height,
+    }
+
+
+def test_copy_hazard_features_builds_cell_index_when_zoom_set():
+    collection = {"features": [{"geometry": {"type": "Point", "coordinates": [0, 0]}, "properties": {}}]}
+    conn = FakeConnection()
+    rows = feature_rows(iter_geojson_features([json.dumps(collection).encode()]), {"skipped": 0})
+    copy_hazard_features(conn, "t1", 9, rows, cell_zoom=10)
+    index_sql, params = conn.cur.statements[-1]
+    assert index_sql.startswith("INSERT INTO hazard_cell_index")
+    assert "FROM hazard_feature_part AS p" in index_sql
+    assert "bool_or(ST_ContainsProperly(p.geom, e.env))" in index_sql
+    assert "ST_Covers" not in index_sql
+    assert conn.cur.statements[-2][0].startswith("INSERT INTO hazard_feature_part")
+    assert params["width"] == 360.0 / 1024
+    conn = FakeConnection()
+    rows = feature_rows(iter_geojson_features([json.dumps(collection).encode()]), {"skipped": 0})
+    copy_hazard_features(conn, "t1", 9, rows, cell_zoom=None)
+    assert not any(sql.startswith("INSERT INTO hazard_cell_index") for sql, _ in conn.cur.statements)
+
+
+def test_iter_location_hazard_entries_merges_vector_and_raster_per_chunk(monkeypatch):
+    calls = []
+
+    def fake_lookup(session, tenant_id, version_ids, points, stats=None):
+        calls.append(list(points))
+        return [[11] if lon < 1 else [] for lon, _ in points]
+
+    def fake_worst(session, tenant_id, ids_per_point):
+        return [[({"peril": "flood", "score": 0.4}, i) for i in ids] for ids in ids_per_point]
+
+    monkeypatch.setattr(hazard_lookup, "lookup_feature_ids", fake_lookup)
+    monkeypatch.setattr(hazard_lookup, "worst_hazard_entries", fake_worst)
+    tiles = np.full((1, 1, 2, 2), 0.7)
+    raster = HazardRaster(tiles, {"transform": [0.0, 1.0, 0.0, 2.0, 0.0, -1.0], "width": 2, "height": 2, "tile_size": 2})
+    locations = [
+        SimpleNamespace(id=1, longitude=0.5, latitude=1.5),
+        SimpleNamespace(id=2, longitude=None, latitude=None),
+        SimpleNamespace(id=3, longitude=1.5, latitude=0.5),
+        SimpleNamespace(id=4, longitude=0.5, latitude=0.5),
+    ]
+    results = list(
+        iter_location_hazard_entries(
+            None,
+            "t1",
+            locations,
+            [5],
+            [(raster, "wildfire", "Grid", "v2")],
+            wanted=lambda loc: loc.id != 4,
+            chunk_size=2,
+        )
+    )
+    assert [loc.id for loc, _ in results] == [1, 2, 3, 4]
+    assert calls == [[(0.5, 1.5)], [(1.5, 0.5)]]
+    first = results[0][1]
+    assert [(entry["peril"], feature_id) for entry, feature_id in first] == [("flood", 11), ("wildfire", None)]
+    assert results[1][1] == []
+    assert [entry["peril"] for entry, _ in results[2][1]] == ["wildfire"]
+    assert results[3][1] == []
+
+
+def test_worst_hazard_entries_reduces_per_point_and_peril_in_sql():
+    statements = []
+    row = SimpleNamespace(
+        point=1,
+        id=7,
+        peril="flood",
+        score=0.9,
+        band="HIGH",
+        percentile=97.0,
+        properties_json=None,
+        name="Zones",
+        version_label="v3",
+    )
+
+    class FakeSession:
+        def execute(self, statement):
+            statements.append(str(statement.compile(dialect=postgresql.dialect())))
+            return SimpleNamespace(all=lambda: [row])
+
+    assert hazard_lookup.worst_hazard_entries(FakeSession(), "t1", [[], []]) == [[], []]
+    assert statements == []
+    results = hazard_lookup.worst_hazard_entries(FakeSession(), "t1", [[3], [7, 8]])
+    assert results[0] == []
+    assert results[1] == [
+        (
+            {"peril": "flood", "score": 0.9, "band": "HIGH", "percentile": 97.0, "source": "Zones:v3", "raw": {}},
+            7,
+        )
+    ]
+    (sql,) = statements
+    assert (
+        "row_number() OVER (PARTITION BY anon_2.point, hazard_feature_polygon.peril "
+        "ORDER BY hazard_feature_polygon.score DESC NULLS LAST, hazard_feature_polygon.id ASC)"
+    ) in sql
+    assert "WHERE anon_1.rank = " in sql
+    assert "hazard_feature_polygon.peril IS NOT NULL" in sql
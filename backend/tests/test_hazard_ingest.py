@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+
+from app.models import HazardFeaturePolygon
+from app.services import hazard_ingest
+from app.services.hazard_ingest import copy_hazard_features, feature_rows, iter_geojson_features
+from app.services.hazard_lookup import feature_contains_point
+from tests.test_bulk_load import FakeConnection
+
+
+def _collection(count):
+    return {
+        "type": "FeatureCollection",
+        "name": "flood",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]} if i % 3 else None,
+                "properties": {"peril": "flood", "score": i * 1.25, "label": "zone é"},
+            }
+            for i in range(count)
+        ],
+        "crs": {"type": "name", "properties": {"name": "EPSG:4326"}},
+    }
+
+
+def _chunked(data, size):
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 1 << 20])
+def test_iter_geojson_features_matches_json_loads_for_any_chunking(size):
+    doc = _collection(10)
+    data = json.dumps(doc, indent=1, ensure_ascii=False).encode()
+    assert list(iter_geojson_features(_chunked(data, size))) == doc["features"]
+
+
+def test_iter_geojson_features_handles_empty_and_missing_features():
+    assert list(iter_geojson_features([b'{"type": "FeatureCollection", "features": []}'])) == []
+    assert list(iter_geojson_features([b"{}"])) == []
+
+
+@pytest.mark.parametrize("payload", [b'{"features": [{"type": "Feature"}', b'{"features": [1 2]}', b"[]", b'{"a": 1} x'])
+def test_iter_geojson_features_rejects_invalid_documents(payload):
+    with pytest.raises(ValueError):
+        list(iter_geojson_features(_chunked(payload, 3)))
+
+
+def test_copy_hazard_features_stages_rows_and_skips_missing_geometry():
+    conn = FakeConnection()
+    stats = {"skipped": 0}
+    features = iter_geojson_features([json.dumps(_collection(6)).encode()])
+    seen = []
+    inserted = copy_hazard_features(
+        conn, "t1", 9, feature_rows(features, stats, "Flood"), on_progress=seen.append, batch_rows=2
+    )
+    assert inserted == 4
+    assert stats["skipped"] == 2
+    assert seen == [2, 4]
+    assert conn.cur.statements[0][0].startswith("CREATE TEMP TABLE hazard_feature_stage")
+    first = conn.cur.copied[0][0].split(b"\t")
+    assert json.loads(first[1])["type"] == "Polygon"
+    assert json.loads(first[2])["score"] == 1.25
+    assert first[3:] == [b"flood", b"1.25", b"\\N", b"\\N"]
+    insert_sql, params = conn.cur.statements[-2]
+    assert "ST_GeomFromGeoJSON(geom_json)" in insert_sql
+    assert "ORDER BY seq" in insert_sql
+    assert "peril, score, band, percentile FROM hazard_feature_stage" in insert_sql
+    assert params == {"tenant_id": "t1", "hazard_dataset_version_id": 9}
+    assert conn.committed
+
+
+def test_copy_hazard_features_subdivides_in_the_same_transaction():
+    conn = FakeConnection()
+    rows = feature_rows(iter_geojson_features([json.dumps(_collection(3)).encode()]), {"skipped": 0})
+    copy_hazard_features(conn, "t1", 9, rows, max_vertices=2)
+    subdivide_sql, params = conn.cur.statements[-1]
+    assert subdivide_sql.startswith("INSERT INTO hazard_feature_part")
+    assert "ST_Subdivide(geom, %(max_vertices)s)" in subdivide_sql
+    assert params == {"tenant_id": "t1", "hazard_dataset_version_id": 9, "max_vertices": 5}
+    assert conn.committed
+
+
+def test_feature_contains_point_probes_subdivided_parts():
+    point = func.ST_SetSRID(func.ST_MakePoint(1.0, 2.0), 4326)
+    stmt = select(HazardFeaturePolygon.id).where(feature_contains_point("t1", [4, 5], point))
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "hazard_feature_part" in sql
+    assert "ST_Intersects(hazard_feature_part.geom" in sql
+    # Boundary points stay misses: the parts found by the probe must contain the point, not just touch it.
+    assert "GROUP BY hazard_feature_part.hazard_feature_polygon_id" in sql
+    assert "HAVING ST_Contains(ST_Union(hazard_feature_part.geom), ST_SetSRID(ST_MakePoint(" in sql
+    assert "ST_Covers" not in sql
+
+
+def test_large_feature_reads_ahead_geometrically(monkeypatch):
+    feature = {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [[[i, i] for i in range(20000)]]}}
+    data = json.dumps({"features": [feature]}).encode()
+    decoder = json.JSONDecoder()
+    decode = decoder.raw_decode
+    attempts = []
+
+    def raw_decode(text, index=0):
+        attempts.append(index)
+        return decode(text, index)
+
+    decoder.raw_decode = raw_decode
+    monkeypatch.setattr(hazard_ingest.json, "JSONDecoder", lambda: decoder)
+    assert list(iter_geojson_features(_chunked(data, 64))) == [feature]
+    # One chunk per retry would re-parse the feature thousands of times.
+    assert len(data) // 64 > 3000
+    assert len(attempts) < 40
@@ -1,4 +1,4 @@
-from app.services.hazard_query import coerce_float, extract_hazard_entry, merge_worst_in_peril
+from app.services.hazard_query import coerce_float, extract_hazard_entry, hazard_columns, merge_worst_in_peril
 
 
 def test_merge_worst_in_peril_selects_higher_score():
@@ -40,3 +40,19 @@ def test_extract_hazard_entry_prefers_hazard_category():
 def test_coerce_float_handles_strings_and_invalid():
     assert coerce_float("0.7") == 0.7
     assert coerce_float("nope") is None
+
+
+def test_hazard_columns_types_properties_for_ingest():
+    assert hazard_columns({"Score": "0.7", "Band": 3, "percentile": "88"}, " Flood ") == {
+        "peril": "flood",
+        "score": 0.7,
+        "band": "3",
+        "percentile": 88.0,
+    }
+    assert hazard_columns({"score": "n/a", "band": ""}, None) == {
+        "peril": None,
+        "score": None,
+        "band": None,
+        "percentile": None,
+    }
+    assert hazard_columns({"hazard_category": "  "}, "flood")["peril"] is None
@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.hazard_query import merge_worst_in_peril
+import app.services.hazard_raster as hazard_raster
+from app.services.hazard_raster import (
+    HazardRaster,
+    cache_hazard_raster,
+    load_cached_hazard_rasters,
+    parse_transform,
+    raster_properties,
+    sample_hazard_entries,
+    warm_hazard_raster,
+    write_tiled_raster,
+)
+
+
+def _raster(tmp_path, grid, transform, tile_size=4, **meta):
+    source = tmp_path / "source.npy"
+    tiles = tmp_path / "tiles.npy"
+    np.save(source, grid)
+    info = write_tiled_raster(str(source), str(tiles), tile_size, meta.get("nodata"))
+    return HazardRaster(np.load(tiles, mmap_mode="r"), {**meta, **info, "transform": transform}), info
+
+
+def test_parse_transform_rejects_rotation_and_bad_input():
+    assert parse_transform("-10,0.5,0,50,0,-0.5") == [-10.0, 0.5, 0.0, 50.0, 0.0, -0.5]
+    for value in ("1,2,3", "a,b,c,d,e,f", "0,1,0.1,0,0,-1", "0,0,0,0,0,-1", "0,1,0,nan,0,-1"):
+        with pytest.raises(ValueError):
+            parse_transform(value)
+
+
+def test_tiled_sampling_matches_direct_grid_indexing(tmp_path):
+    rng = np.random.default_rng(3)
+    grid = rng.random((11, 9)).astype("float32")
+    transform = [-10.0, 0.5, 0.0, 50.0, 0.0, -0.5]
+    raster, info = _raster(tmp_path, grid, transform)
+    assert info["width"] == 9 and info["height"] == 11 and info["valid_cells"] == 99
+    assert raster.tiles.shape == (3, 3, 4, 4)
+    rows = rng.integers(0, 11, 200)
+    cols = rng.integers(0, 9, 200)
+    lons = -10.0 + (cols + rng.random(200)) * 0.5
+    lats = 50.0 - (rows + rng.random(200)) * 0.5
+    np.testing.assert_array_equal(raster.sample(lons, lats), grid[rows, cols].astype(np.float64))
+
+
+def test_sampling_outside_grid_and_nodata_is_nan(tmp_path):
+    grid = np.array([[1.0, -9999.0], [3.0, 4.0]])
+    raster, info = _raster(tmp_path, grid, [0.0, 1.0, 0.0, 2.0, 0.0, -1.0], tile_size=2, nodata=-9999.0)
+    assert info["valid_cells"] == 3
+    values = raster.sample([0.5, 1.5, 1.5, -0.1, 2.5, float("nan")], [1.5, 1.5, 0.5, 1.0, 1.0, 1.0])
+    assert values[0] == 1.0 and values[2] == 4.0
+    assert np.isnan(values[[1, 3, 4, 5]]).all()
+
+
+def test_sampled_entries_follow_extract_hazard_entry_contract(tmp_path):
+    grid = np.array([[0.2, 0.9]])
+    meta = {"value_property": "score", "properties": {"band": "B"}}
+    raster, _ = _raster(tmp_path, grid, [0.0, 1.0, 0.0, 1.0, 0.0, -1.0], tile_size=2, **meta)
+    assert raster_properties(raster.meta, 0.5) == {"band": "B", "score": 0.5}
+    entries = sample_hazard_entries(
+        [(raster, "Flood", "Depth grid", "v1"), (raster, "flood", "Depth grid", "v2")],
+        [0.5, 1.5, 5.0],
+        [0.5, 0.5, 0.5],
+    )
+    assert [len(point) for point in entries] == [2, 2, 0]
+    first = entries[0][0]
+    assert first["peril"] == "flood"
+    assert first["score"] == pytest.approx(0.2)
+    assert first["source"] == "Depth grid:v1"
+    hazards = {}
+    for entry in entries[1]:
+        merge_worst_in_peril(hazards, entry)
+    assert hazards["flood"]["score"] == pytest.approx(0.9)
+    assert hazards["flood"]["band"] == "B"
+
+
+class _RasterSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, stmt):
+        return SimpleNamespace(all=lambda: self.rows)
+
+
+def test_cold_raster_cache_is_reported_pending_then_warmed(tmp_path, monkeypatch):
+    _, info = _raster(tmp_path, np.array([[0.4, 0.7]]), [0.0, 1.0, 0.0, 1.0, 0.0, -1.0], tile_size=2)
+    meta = {**info, "transform": [0.0, 1.0, 0.0, 1.0, 0.0, -1.0], "tiles_key": "hazards/t1/1/rasters/7/tiles.npy"}
+    meta["checksum"] = "abc"
+    version = SimpleNamespace(id=7, raster_json=meta, version_label="v1")
+    session = _RasterSession([(version, SimpleNamespace(peril="flood", name="Depth grid"))])
+    downloads = []
+
+    def download(key, handle):
+        downloads.append(key)
+        handle.write((tmp_path / "tiles.npy").read_bytes())
+
+    monkeypatch.setattr(hazard_raster, "download_object", download)
+    cache_dir = str(tmp_path / "cache")
+    rasters, pending = load_cached_hazard_rasters(session, "t1", [7], cache_dir)
+    assert rasters == [] and pending == {7: meta}
+    assert downloads == []
+    warm_hazard_raster(meta, cache_dir)
+    warm_hazard_raster(meta, cache_dir)
+    assert downloads == ["hazards/t1/1/rasters/7/tiles.npy"]
+    rasters, pending = load_cached_hazard_rasters(session, "t1", [7], cache_dir)
+    assert pending == {}
+    assert rasters[0][0].sample([1.5], [0.5])[0] == pytest.approx(0.7)
+    seeded = {**meta, "checksum": "def"}
+    cache_hazard_raster(seeded, str(tmp_path / "tiles.npy"), cache_dir)
+    session.rows[0][0].raster_json = seeded
+    assert load_cached_hazard_rasters(session, "t1", [7], cache_dir)[1] == {}
+    assert len(downloads) == 1
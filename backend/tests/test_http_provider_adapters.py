@@ -1,3 +1,5 @@
+import json
+
 import httpx
 import pytest
 
@@ -154,3 +156,104 @@ def test_http_geocoder_timeout_retries():
     result = geocoder.forward_geocode({"address_line1": "123 Main"})
     assert call_count["count"] == 2
     assert result["lat"] == 1.0
+
+
+def test_http_geocoder_backs_off_on_rate_limit(monkeypatch):
+    calls = {"count": 0}
+    slept = []
+    mapping = {"lat": "/data/lat", "lon": "/data/lon"}
+
+    def handler(request):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            return httpx.Response(429, headers={"Retry-After": "2"})
+        if calls["count"] == 2:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"data": {"lat": 1, "lon": 2}})
+
+    monkeypatch.setattr("app.services.providers.base.time.sleep", slept.append)
+    geocoder = HttpGeocoder(
+        base_url="https://example/geocode",
+        api_key=None,
+        api_key_header="Authorization",
+        mapping=mapping,
+        timeout_seconds=5.0,
+        connect_timeout_seconds=1.0,
+        max_retries=2,
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        backoff_base_seconds=0.5,
+        backoff_max_seconds=10.0,
+    )
+    result = geocoder.forward_geocode({"address_line1": "123 Main"})
+    assert result["lat"] == 1.0
+    assert calls["count"] == 3
+    assert slept[0] == 2.0
+    assert 0.0 <= slept[1] <= 1.0
+
+
+def test_http_geocoder_batch_mode_reports_per_item_errors():
+    requests = []
+    mapping = {"lat": "/lat", "lon": "/lon", "confidence": "/score"}
+    batch_mapping = {
+        "request_key": "addresses",
+        "items": "/results",
+        "item_id": "/ref",
+        "item_error": "/error",
+        "url": "https://example/geocode/batch",
+    }
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append((str(request.url), body))
+        if any(item["address"]["address_line1"] == "boom" for item in body["addresses"]):
+            return httpx.Response(500)
+        results = []
+        for item in reversed(body["addresses"]):
+            line = item["address"]["address_line1"]
+            if line == "nowhere":
+                results.append({"ref": item["id"], "error": "no match"})
+            elif line != "dropped":
+                results.append({"ref": item["id"], "lat": 1, "lon": 2, "score": 0.9})
+        return httpx.Response(200, json={"results": results})
+
+    geocoder = HttpGeocoder(
+        base_url="https://example/geocode",
+        api_key=None,
+        api_key_header="Authorization",
+        mapping=mapping,
+        timeout_seconds=5.0,
+        connect_timeout_seconds=1.0,
+        max_retries=0,
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        batch_size=3,
+        batch_mapping=batch_mapping,
+    )
+    lines = ["1 Main", "nowhere", "dropped", "2 Main", "boom"]
+    results = geocoder.forward_geocode_batch([{"address_line1": line} for line in lines])
+    assert [url for url, _ in requests] == ["https://example/geocode/batch"] * 2
+    assert [item["id"] for item in requests[0][1]["addresses"]] == ["0", "1", "2"]
+    assert results[0]["lat"] == 1.0 and results[0]["standardized_address"] == {"address_line1": "1 Main"}
+    assert isinstance(results[1], ProviderError) and results[1].message == "no match"
+    assert isinstance(results[2], ProviderError) and results[2].code == "parse"
+    assert isinstance(results[3], ProviderError) and results[3].code == "upstream"
+    assert isinstance(results[4], ProviderError) and results[4].code == "upstream"
+
+
+def test_http_parcel_batch_mode_matches_by_position():
+    def handler(request):
+        body = json.loads(request.content)
+        return httpx.Response(200, json=[{"pid": f"P{item['lat']}"} for item in body["items"]])
+
+    provider = HttpParcelProvider(
+        base_url="https://example/parcel",
+        api_key=None,
+        api_key_header="Authorization",
+        mapping={"parcel_id": "/pid"},
+        timeout_seconds=5.0,
+        connect_timeout_seconds=1.0,
+        max_retries=0,
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        batch_size=10,
+    )
+    results = provider.parcel_lookup_batch([(1.0, 2.0), (3.0, 4.0)])
+    assert [result["parcel_id"] for result in results] == ["P1.0", "P3.0"]
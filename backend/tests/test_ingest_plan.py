@@ -0,0 +1,71 @@
+import io
+import random
+
+from app.services.commit import canonicalize_rows, location_values
+from app.services.ingest_plan import IngestPlan, get_ingest_plan, read_location_records, record_sorter
+from app.services.validation import iter_text_lines
+
+HEADER = ["external_location_id", "lat", "longitude", "city", "tiv", "currency", "lob", "product_code", "premium"]
+VALUES = ["", " ", "B", "A", "1", "-2.5", "1e3", "abc", "nan", "PROP"]
+MAPPINGS = [
+    {},
+    {"external_location_id": "external_location_id", "lob": "lob", "tiv": "tiv", "lat": "latitude"},
+    {"city": "external_location_id", "missing": "lob", "tiv": "limit", "longitude": "lon"},
+    {"lob": "lob", "product_code": "product_code", "tiv": "tiv"},
+]
+
+
+def _random_csv(rng: random.Random, header, count: int) -> bytes:
+    lines = [",".join(header)]
+    for _ in range(count):
+        if rng.random() < 0.05:
+            lines.append("")
+            continue
+        width = len(header) if rng.random() > 0.1 else rng.randint(1, len(header) + 2)
+        lines.append(",".join(rng.choice(VALUES) for _ in range(width)))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _expected(data: bytes, mapping, default_currency):
+    rows = canonicalize_rows(data, mapping)
+    return [loc for loc in (location_values(row, default_currency) for row in rows) if loc is not None]
+
+
+def _planned(data: bytes, mapping, default_currency, buffer_rows=0):
+    sorter = record_sorter(buffer_rows)
+    sorter.extend(read_location_records(iter_text_lines(iter([data])), IngestPlan(mapping)))
+    return [loc for loc in (r.location_values(default_currency) for r in sorter.sorted()) if loc is not None]
+
+
+def test_plan_matches_canonicalize_and_location_values():
+    rng = random.Random(11)
+    for trial in range(40):
+        header = list(HEADER)
+        if trial % 3 == 0:
+            header.append("lob")
+        if trial % 4 == 0:
+            header.remove("tiv")
+        data = _random_csv(rng, header, rng.randint(0, 60))
+        for mapping in MAPPINGS:
+            expected = repr(_expected(data, mapping, "GBP"))
+            assert repr(_planned(data, mapping, "GBP")) == expected
+            assert repr(_planned(data, mapping, "GBP", buffer_rows=7)) == expected
+
+
+def test_record_types_are_coerced_once():
+    data = b"external_location_id,lat,lon,tiv,lob\n7,1.5,x,10,PROP\n"
+    (record,) = read_location_records(io.StringIO(data.decode()), IngestPlan({}))
+    assert record.external_location_id == "7"
+    assert record.latitude == 1.5
+    assert record.longitude is None
+    assert record.tiv == 10.0
+    assert not hasattr(record, "__dict__")
+
+
+def test_plan_cache_keys_on_template_id_and_checksum():
+    template = {"loc": "external_location_id"}
+    plan = get_ingest_plan(5, template)
+    assert get_ingest_plan(5, dict(template)) is plan
+    assert get_ingest_plan(6, template) is not plan
+    assert get_ingest_plan(5, {"id": "external_location_id"}) is not plan
+    assert plan.bind(["loc"]) is plan.bind(["loc"])
@@ -0,0 +1,56 @@
+import json
+from datetime import datetime
+
+from app.services.geocode import geocode_address
+from app.services.location_geocode import bulk_update_params, bulk_update_sql, geocode_location, location_address
+from app.services.providers.geocoder import StubGeocoder
+
+ROW = {
+    "id": 5,
+    "address_line1": "1 Main St",
+    "city": "Springfield",
+    "country": "US",
+    "tiv": 100.0,
+    "latitude": None,
+    "longitude": None,
+    "geocode_method": None,
+    "geocode_confidence": None,
+}
+
+
+def test_geocode_location_fills_missing_coordinates():
+    address = location_address(ROW)
+    assert address == {"address_line1": "1 Main St", "city": "Springfield", "country": "US"}
+    geocoded = StubGeocoder().forward_geocode(address)
+    update = geocode_location(ROW, geocoded)
+    lat, lon, conf, method = geocode_address("1 Main St", "Springfield", "US")
+    assert (update["latitude"], update["longitude"], update["geocode_confidence"]) == (lat, lon, conf)
+    assert update["geocode_method"] == method
+    assert update["quality_tier"] == "B"
+    assert update["id"] == 5
+    failed = geocode_location(ROW, None)
+    assert failed["latitude"] is None and failed["quality_tier"] == "C"
+
+
+def test_geocode_location_marks_provided_coordinates():
+    update = geocode_location({**ROW, "latitude": 1.0, "longitude": 2.0})
+    assert update["geocode_method"] == "PROVIDED"
+    assert update["geocode_confidence"] == 1.0
+    assert update["quality_tier"] == "A"
+    kept = geocode_location({**ROW, "latitude": 1.0, "longitude": 2.0, "geocode_method": "X", "geocode_confidence": 0.3})
+    assert (kept["geocode_method"], kept["geocode_confidence"]) == ("X", 0.3)
+    assert "LOW_GEOCODE_CONFIDENCE" in kept["quality_reasons_json"]
+
+
+def test_bulk_update_sql_binds_one_values_row_per_location():
+    sql = bulk_update_sql(2)
+    assert sql.count("CAST(:id_") == 2
+    assert "CAST(:quality_reasons_json_1 AS json)" in sql
+    assert "AS v(id, latitude, longitude, geocode_method, geocode_confidence, quality_tier, quality_reasons_json)" in sql
+    updates = [geocode_location(ROW, {"lat": 3.0, "lon": 4.0, "confidence": 0.9, "provider": "http"}), geocode_location({**ROW, "id": 6, "latitude": 1.0, "longitude": 2.0})]
+    now = datetime(2024, 1, 1)
+    params = bulk_update_params(updates, "t1", now)
+    assert params["tenant_id"] == "t1" and params["updated_at"] == now
+    assert params["id_1"] == 6
+    assert json.loads(params["quality_reasons_json_0"]) == updates[0]["quality_reasons_json"]
+    assert set(params) - {"tenant_id", "updated_at"} == {f"{n}_{i}" for i in (0, 1) for n in updates[0]}
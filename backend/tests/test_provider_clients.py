@@ -0,0 +1,35 @@
+import os
+
+from app.core.config import get_settings
+from app.services.providers import clients
+from app.services.providers.clients import close_http_clients, get_http_client
+from app.services.providers.geocoder import get_geocoder
+
+
+def test_clients_are_reused_per_provider_and_closed():
+    close_http_clients()
+    first = get_http_client("geocoder")
+    assert get_http_client("geocoder") is first
+    assert get_http_client("parcel") is not first
+    close_http_clients()
+    assert first.is_closed
+    assert get_http_client("geocoder") is not first
+    close_http_clients()
+
+
+def test_forked_process_gets_fresh_clients(monkeypatch):
+    close_http_clients()
+    parent = get_http_client("geoapify")
+    monkeypatch.setattr(clients, "_owner_pid", os.getpid() + 1)
+    child = get_http_client("geoapify")
+    assert child is not parent
+    assert not parent.is_closed
+    parent.close()
+    close_http_clients()
+
+
+def test_http_geocoder_uses_pooled_client(monkeypatch):
+    monkeypatch.setattr(get_settings(), "geocoder_provider", "http")
+    close_http_clients()
+    assert get_geocoder().client is get_geocoder().client
+    close_http_clients()
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+import app.api.routes as routes
+from app.core.auth import TokenData, get_current_user
+from app.db import get_db
+from app.main import app
+from app.services.policy_resolver import DEFAULT_CONFIG, DEFAULT_POLICY
+
+
+class _Session:
+    def __init__(self, version_ids=()):
+        self.version_ids = list(version_ids)
+
+    def execute(self, stmt):
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: self.version_ids))
+
+
+def _client(monkeypatch, session):
+    monkeypatch.setattr(
+        routes,
+        "resolve_policy_version",
+        lambda db, tenant_id, version_id: (dict(DEFAULT_CONFIG), dict(DEFAULT_POLICY), {"policy_pack_id": None}),
+    )
+    monkeypatch.setattr(routes, "build_hazard_versions", lambda db, tenant_id, version_ids: [])
+    monkeypatch.setitem(app.dependency_overrides, get_current_user, lambda: TokenData("t1", "ANALYST", "u1"))
+    monkeypatch.setitem(app.dependency_overrides, get_db, lambda: session)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_underwriting_packet_scores_through_resilience_route(monkeypatch):
+    client = _client(monkeypatch, _Session())
+    body = {"lat": 30.0, "lon": -90.0, "hazard_dataset_version_ids": [], "include_decision": True}
+    response = client.post("/underwriting/packet", json=body)
+    assert response.status_code == 200, response.text
+    packet = response.json()
+    assert packet["resilience"] == client.post("/resilience/score", json=body).json()["result"]
+    assert packet["quality"]["peril_missing"]
+    assert packet["decision"] is not None
+
+
+def test_cold_raster_cache_asks_caller_to_retry(monkeypatch):
+    warmed = []
+    monkeypatch.setattr(routes, "load_cached_hazard_rasters", lambda db, tenant_id, ids: ([], {7: {"tiles_key": "k"}}))
+    monkeypatch.setattr(routes, "warm_hazard_raster_in_background", warmed.append)
+    client = _client(monkeypatch, _Session([7]))
+    response = client.post("/resilience/score", json={"lat": 30.0, "lon": -90.0, "hazard_dataset_version_ids": [7]})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(routes.RASTER_WARM_RETRY_SECONDS)
+    assert response.json()["detail"]["hazard_dataset_version_ids"] == [7]
+    assert warmed == [{"tiles_key": "k"}]
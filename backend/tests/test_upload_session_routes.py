@@ -0,0 +1,146 @@
+import hashlib
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy as sa
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.api.routes as routes
+from app.core.auth import TokenData, get_current_user
+from app.db import get_db
+from app.main import app
+from app.core.config import get_settings
+from app.models import Base, ExposureUpload, ValidationResult
+from app.services.content_dedup import content_key
+
+MB = 1024 * 1024
+TABLES = ["tenant", "user", "audit_event", "run", "exposure_upload", "mapping_template", "validation_result"]
+
+
+class _ObjectStore:
+    def __init__(self):
+        self.objects = {}
+        self.parts = {}
+        self.completed = 0
+        self.fail_checksum = 0
+
+    def create_multipart_upload(self, key, content_type=None):
+        self.parts[key] = {}
+        return f"mp-{key}"
+
+    def upload_part(self, key, multipart_upload_id, part_number, data):
+        self.parts[key][part_number] = data
+        return f"etag-{part_number}"
+
+    def complete_multipart_upload(self, key, multipart_upload_id, parts):
+        self.completed += 1
+        self.objects[key] = b"".join(self.parts[key][part["PartNumber"]] for part in parts)
+        return routes.object_uri(key)
+
+    def object_checksum(self, key):
+        if self.fail_checksum:
+            self.fail_checksum -= 1
+            raise ConnectionError("connection reset")
+        return hashlib.sha256(self.objects[key]).hexdigest()
+
+    def upload_stream(self, key, stream, content_type=None):
+        data = stream.read()
+        self.objects[key] = data
+        return routes.object_uri(key), hashlib.sha256(data).hexdigest(), len(data)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    engine = sa.create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[Base.metadata.tables[name] for name in TABLES])
+    make_session = sessionmaker(bind=engine)
+    store = _ObjectStore()
+    for name in ("create_multipart_upload", "upload_part", "complete_multipart_upload", "upload_stream"):
+        monkeypatch.setattr(routes, name, getattr(store, name))
+    monkeypatch.setattr(routes, "object_checksum", store.object_checksum)
+    monkeypatch.setattr(routes, "read_object_head", lambda key, size: store.objects[key][:size])
+    monkeypatch.setattr(routes, "delete_object", lambda key: store.objects.pop(key))
+
+    def db():
+        session = make_session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setitem(app.dependency_overrides, get_current_user, lambda: TokenData("t1", "OPS", "u1"))
+    monkeypatch.setitem(app.dependency_overrides, get_db, db)
+    client = TestClient(app, raise_server_exceptions=False)
+    client.store = store
+    client.session = make_session
+    return client
+
+
+def _session_upload(client, data, part_size):
+    session = client.post("/uploads/sessions", json={"filename": "locations.csv", "part_size": part_size}).json()
+    for number, start in enumerate(range(0, len(data), part_size), start=1):
+        url = f"/uploads/{session['upload_id']}/parts/{number}"
+        response = client.put(url, content=data[start : start + part_size])
+        assert response.status_code == 200, response.text
+    return session["upload_id"]
+
+
+def test_finalize_stores_file_sha256_for_any_part_layout(api):
+    data = b"external_location_id,tiv\n" + b"1,100\n" * (2 * MB)
+    two_parts = _session_upload(api, data, 5 * MB + 1)
+    finalized = api.post(f"/uploads/{two_parts}/finalize").json()
+    assert finalized["status"] == "COMPLETE"
+    assert finalized["checksum"] == hashlib.sha256(data).hexdigest()
+    assert finalized["parts_checksum"].endswith("-3")
+
+    one_part = _session_upload(api, data, 16 * MB)
+    finalized = api.post(f"/uploads/{one_part}/finalize").json()
+    assert finalized["checksum"] == hashlib.sha256(data).hexdigest()
+    assert finalized["duplicate_of_upload_id"] == two_parts
+
+
+def test_finalize_resumes_hashing_after_a_failure(api):
+    data = b"external_location_id,tiv\n1,100\n"
+    upload_id = _session_upload(api, data, 5 * MB)
+    api.store.fail_checksum = 1
+    assert api.post(f"/uploads/{upload_id}/finalize").status_code == 500
+    with api.session() as session:
+        assert session.get(ExposureUpload, upload_id).status == "FINALIZING"
+    assert api.put(f"/uploads/{upload_id}/parts/2", content=b"more").status_code == 400
+    assert api.post(f"/uploads/{upload_id}/abort").status_code == 400
+    finalized = api.post(f"/uploads/{upload_id}/finalize").json()
+    assert finalized["status"] == "COMPLETE"
+    assert finalized["checksum"] == hashlib.sha256(data).hexdigest()
+    assert api.store.completed == 1
+
+
+def test_session_and_direct_uploads_of_same_bytes_share_validation(api, monkeypatch):
+    queued = []
+    monkeypatch.setattr(routes.validate_task, "delay", lambda *args: queued.append(args) or SimpleNamespace(id="task"))
+    data = b"external_location_id,tiv\n" + b"1,100\n" * MB
+    direct = api.post("/uploads", files={"file": ("locations.csv", data, "text/csv")}).json()["upload_id"]
+    assert api.post(f"/uploads/{direct}/validate").json()["status"] == "QUEUED"
+    checksum = hashlib.sha256(data).hexdigest()
+    with api.session() as session:
+        # What the queued validate_upload task records for the direct upload.
+        original = ValidationResult(
+            tenant_id="t1",
+            upload_id=direct,
+            summary_json={"total_rows": MB},
+            row_errors_uri="s3://bucket/row_errors.json",
+            checksum="errors-sha",
+            content_key=content_key(checksum, None, get_settings().code_version),
+        )
+        session.add(original)
+        session.commit()
+        original_id = original.id
+
+    resumable = _session_upload(api, data, 5 * MB)
+    assert api.post(f"/uploads/{resumable}/finalize").json()["duplicate_of_upload_id"] == direct
+    reused = api.post(f"/uploads/{resumable}/validate").json()
+    assert reused["note"] == "validation_result_reused"
+    assert len(queued) == 1
+    with api.session() as session:
+        assert session.get(ValidationResult, reused["validation_result_id"]).source_validation_result_id == original_id
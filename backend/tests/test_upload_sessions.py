@@ -0,0 +1,98 @@
+import hashlib
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.services.upload_sessions import (
+    UploadSessionError,
+    completion_parts,
+    expected_total_parts,
+    missing_parts,
+    parts_checksum,
+    received_parts,
+    received_ranges,
+    record_part,
+    validate_part,
+)
+from app.storage.s3 import abort_multipart_upload, complete_multipart_upload
+
+MB = 1024 * 1024
+
+
+def _parts(*specs):
+    parts = {}
+    for number, size in specs:
+        parts = record_part(parts, number, f"etag-{number}", size, f"sha-{number}")
+    return parts
+
+
+def test_record_part_overwrites_retried_part():
+    parts = _parts((2, 5 * MB), (1, 5 * MB))
+    parts = record_part(parts, 2, "etag-retry", 3, "sha-retry")
+    assert [p["part_number"] for p in received_parts(parts)] == [1, 2]
+    assert received_parts(parts)[1] == {"part_number": 2, "etag": "etag-retry", "size": 3, "sha256": "sha-retry"}
+
+
+def test_received_ranges_and_missing_parts():
+    parts = _parts((1, 5 * MB), (2, 5 * MB), (4, 100))
+    assert received_ranges(parts, 5 * MB) == [(0, 10 * MB - 1), (15 * MB, 15 * MB + 99)]
+    assert missing_parts(parts) == [3]
+    assert missing_parts(parts, total_parts=6) == [3, 5, 6]
+    assert expected_total_parts(15 * MB + 100, 5 * MB) == 4
+    assert expected_total_parts(None, 5 * MB) is None
+
+
+def test_completion_parts_requires_contiguous_full_parts():
+    assert completion_parts(_parts((1, 5 * MB), (2, 7)), 5 * MB) == [
+        {"PartNumber": 1, "ETag": "etag-1"},
+        {"PartNumber": 2, "ETag": "etag-2"},
+    ]
+    with pytest.raises(UploadSessionError):
+        completion_parts({}, 5 * MB)
+    with pytest.raises(UploadSessionError):
+        completion_parts(_parts((1, 5 * MB), (3, 7)), 5 * MB)
+    with pytest.raises(UploadSessionError):
+        completion_parts(_parts((1, 4 * MB), (2, 7)), 5 * MB)
+
+
+def test_validate_part_bounds():
+    validate_part(1, 10, 5 * MB, 64 * MB)
+    for number, size in ((0, 10), (10001, 10), (1, 0), (1, 5 * MB + 1)):
+        with pytest.raises(UploadSessionError):
+            validate_part(number, size, 5 * MB, 64 * MB)
+
+
+def test_parts_checksum_matches_whole_file_for_one_part():
+    first, second = b"a" * 10, b"b" * 4
+    one = record_part({}, 1, "e1", len(first), hashlib.sha256(first).hexdigest())
+    assert parts_checksum(one) == hashlib.sha256(first).hexdigest()
+    two = record_part(one, 2, "e2", len(second), hashlib.sha256(second).hexdigest())
+    digests = hashlib.sha256(first).digest() + hashlib.sha256(second).digest()
+    assert parts_checksum(two) == f"{hashlib.sha256(digests).hexdigest()}-2"
+
+
+class _MultipartClient:
+    def __init__(self, exists):
+        self.exists = exists
+
+    def _missing(self, code, operation):
+        return ClientError({"Error": {"Code": code}}, operation)
+
+    def complete_multipart_upload(self, **kwargs):
+        raise self._missing("NoSuchUpload", "CompleteMultipartUpload")
+
+    def abort_multipart_upload(self, **kwargs):
+        raise self._missing("NoSuchUpload", "AbortMultipartUpload")
+
+    def head_object(self, **kwargs):
+        if not self.exists:
+            raise self._missing("404", "HeadObject")
+        return {"ContentLength": 14}
+
+
+def test_retried_completion_succeeds_once_object_exists():
+    parts = [{"PartNumber": 1, "ETag": "e1"}]
+    assert complete_multipart_upload("k", "mp", parts, client=_MultipartClient(True)).endswith("/k")
+    with pytest.raises(ClientError):
+        complete_multipart_upload("k", "mp", parts, client=_MultipartClient(False))
+    abort_multipart_upload("k", "mp", client=_MultipartClient(False))
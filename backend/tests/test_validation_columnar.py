@@ -0,0 +1,87 @@
+import io
+import random
+
+from app.services.validation import read_csv_bytes, validate_rows
+from app.services.validation_columnar import validate_csv_streaming
+from app.services.validation_shards import validate_file_sharded
+
+HEADER = [
+    "external_location_id",
+    "latitude",
+    "lon",
+    "address_line1",
+    "city",
+    "state_region",
+    "postal_code",
+    "country",
+    "tiv",
+    "currency",
+    "lob",
+    "product_code",
+    "limit",
+    "premium",
+]
+VALUES = ["", " ", "A1", "1", "-2.5", "1e3", "abc", "nan", "-inf", " 7 ", "1_000", "0x10", "1\x00", "\x00", "é"]
+
+
+def _random_csv(rng: random.Random, count: int) -> bytes:
+    lines = [",".join(HEADER)]
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.05:
+            lines.append("")
+            continue
+        width = len(HEADER) if roll > 0.1 else rng.randint(1, len(HEADER) + 2)
+        fields = [rng.choice(VALUES) for _ in range(width)]
+        lines.append(",".join(f'"{f}"' if rng.random() < 0.1 else f for f in fields))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _columnar(data: bytes, mapping):
+    out = bytearray()
+    summary, checksum = validate_csv_streaming(io.StringIO(data.decode()), mapping, out.extend, batch_rows=17)
+    return summary, bytes(out), checksum
+
+
+def test_columnar_matches_row_engine_on_random_files():
+    rng = random.Random(1234)
+    mappings = [
+        {},
+        {"external_location_id": "external_location_id", "tiv": "tiv", "lob": "lob", "lon": "longitude"},
+        {h: h for h in HEADER} | {"missing_src": "latitude", "limit": "premium"},
+    ]
+    for _ in range(20):
+        data = _random_csv(rng, rng.randint(0, 120))
+        for mapping in mappings:
+            summary, _, artifact, checksum = validate_rows(read_csv_bytes(data), mapping)
+            assert _columnar(data, mapping) == (summary, artifact, checksum)
+
+
+def test_columnar_clean_file_has_no_issues():
+    data = b"external_location_id,latitude,longitude,tiv,currency,lob\nA,1,2,10,USD,PROP\nB,3,4,0,EUR,CAS\n"
+    summary, artifact, _ = _columnar(data, {})
+    assert artifact == b"[]"
+    assert summary == {"ERROR": 0, "WARN": 0, "INFO": 0, "total_rows": 2}
+
+
+def test_columnar_progress_and_duplicate_headers():
+    data = b"tiv,tiv,lob,external_location_id,lat,lon\n" + b"x,5,P,E,1,2\n" * 25
+    seen = []
+    out = bytearray()
+    summary, checksum = validate_csv_streaming(
+        io.StringIO(data.decode()), {}, out.extend, on_progress=seen.append, progress_every=10, batch_rows=7
+    )
+    expected = validate_rows(read_csv_bytes(data), {})
+    assert (summary, bytes(out), checksum) == (expected[0], expected[2], expected[3])
+    assert seen == [14, 21]
+
+
+def test_sharded_columnar_matches_row_engine(tmp_path):
+    data = _random_csv(random.Random(99), 400)
+    path = tmp_path / "upload.csv"
+    path.write_bytes(data)
+    summary, _, artifact, checksum = validate_rows(read_csv_bytes(data), {})
+    for engine in ("columnar", "rows"):
+        out = bytearray()
+        assert validate_file_sharded(str(path), {}, out.extend, 3, engine=engine) == (summary, checksum)
+        assert bytes(out) == artifact
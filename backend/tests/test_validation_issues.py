@@ -0,0 +1,58 @@
+import json
+
+from app.services.validation import validate_rows
+from app.services.validation_issues import copy_validation_issues, filter_issues, iter_issue_artifact
+from tests.test_bulk_load import FakeConnection
+
+ROWS = [
+    {"external_location_id": "A", "latitude": "1", "longitude": "2", "tiv": "100", "lob": "PROP"},
+    {"external_location_id": "", "latitude": "", "longitude": "", "tiv": "-1", "limit": "x"},
+    {"external_location_id": "C", "latitude": "1", "longitude": "2", "tiv": "abc", "city": "Café"},
+]
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def test_issue_artifact_decodes_incrementally():
+    _, issues, artifact, _ = validate_rows(ROWS, {})
+    assert issues
+    for size in (1, 3, 7, len(artifact)):
+        assert list(iter_issue_artifact(_chunks(artifact, size))) == issues
+    assert list(iter_issue_artifact([b"[]"])) == []
+
+
+def test_issue_artifact_rejects_truncated_input():
+    _, _, artifact, _ = validate_rows(ROWS, {})
+    try:
+        list(iter_issue_artifact([artifact[:-10]]))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_filter_issues_matches_keyset_order():
+    _, issues, _, _ = validate_rows(ROWS, {})
+    errors = filter_issues(issues, severity="ERROR")
+    assert [seq for seq, _ in errors] == [i for i, issue in enumerate(issues) if issue["severity"] == "ERROR"]
+    first = filter_issues(issues, limit=2)
+    rest = filter_issues(issues, after_seq=first[-1][0])
+    assert [issue for _, issue in first + rest] == issues
+    assert filter_issues(issues, offset=1, limit=1) == [(1, issues[1])]
+    assert all(issue["code"] == "INVALID_TIV" for _, issue in filter_issues(issues, code="INVALID_TIV"))
+
+
+def test_copy_validation_issues_numbers_rows_in_artifact_order():
+    _, issues, artifact, _ = validate_rows(ROWS, {})
+    conn = FakeConnection()
+    copied = copy_validation_issues(conn, "t1", 9, iter_issue_artifact([artifact]), batch_rows=2)
+    assert copied == len(issues)
+    assert conn.committed
+    lines = [line for batch in conn.cur.copied for line in batch]
+    first = lines[0].decode().split("\t")
+    assert first[:3] == ["0", "t1", "9"]
+    assert first[3:] == [str(issues[0][field]) for field in ("row_number", "severity", "field", "code", "message")]
+    assert [int(line.split(b"\t")[0]) for line in lines] == list(range(len(issues)))
+    assert json.loads(artifact) == issues
@@ -0,0 +1,60 @@
+from app.services.validation import read_csv_bytes, validate_rows
+from app.services.validation_shards import plan_shards, validate_file_sharded
+
+
+def _csv_bytes(count: int) -> bytes:
+    lines = ["external_location_id,latitude,longitude,tiv,currency,lob,limit,premium,address_line1"]
+    for i in range(count):
+        if i % 7 == 0:
+            lines.append(f'L{i},1,2,{i},USD,PROP,10,1,"{i} Main St\nUnit ""{i}"""')
+        elif i % 11 == 0:
+            lines.append("")
+        elif i % 5 == 0:
+            lines.append(f",,,-{i},,,abc,-5,Café {i}")
+        else:
+            lines.append(f"L{i},1,2,x{i},,CAS,,,€ {i}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+def test_plan_shards_cuts_on_record_boundaries(tmp_path):
+    data = _csv_bytes(200)
+    path = tmp_path / "upload.csv"
+    path.write_bytes(data)
+    fieldnames, shards, total_rows = plan_shards(str(path), 4)
+    assert fieldnames[0] == "external_location_id"
+    assert len(shards) == 4
+    assert shards[0][0] == data.index(b"\n") + 1
+    assert shards[-1][1] == len(data)
+    assert total_rows == len(read_csv_bytes(data))
+    for (_, end, _), (start, _, _) in zip(shards, shards[1:]):
+        assert end == start
+        assert data[start - 1 : start] == b"\n"
+        assert data[:start].count(b'"') % 2 == 0
+
+
+def test_sharded_artifact_matches_serial(tmp_path):
+    data = _csv_bytes(500)
+    path = tmp_path / "upload.csv"
+    path.write_bytes(data)
+    mapping = {}
+    summary, _, artifact, checksum = validate_rows(read_csv_bytes(data), mapping)
+    for workers in (1, 3, 8):
+        out = bytearray()
+        seen = []
+        shard_summary, shard_checksum = validate_file_sharded(
+            str(path), mapping, out.extend, workers, on_progress=seen.append
+        )
+        assert bytes(out) == artifact
+        assert shard_checksum == checksum
+        assert shard_summary == summary
+        assert seen[-1] == summary["total_rows"]
+
+
+def test_sharded_header_only(tmp_path):
+    path = tmp_path / "upload.csv"
+    path.write_bytes(b"external_location_id,tiv\n")
+    out = bytearray()
+    summary, checksum = validate_file_sharded(str(path), {}, out.extend, 4)
+    assert bytes(out) == b"[]"
+    assert summary["total_rows"] == 0
+    assert checksum == validate_rows([], {})[3]
@@ -0,0 +1,120 @@
+import hashlib
+import io
+
+from app.services.validation import (
+    iter_csv_rows,
+    iter_text_lines,
+    read_csv_bytes,
+    validate_rows,
+    validate_rows_streaming,
+)
+from app.storage.s3 import MultipartUploadWriter, upload_stream
+
+CSV_BYTES = (
+    "external_location_id,latitude,longitude,tiv,currency,lob,limit,premium,address_line1\n"
+    "A,1,2,100,USD,PROP,10,1,\"12 Main St\nUnit 4\"\n"
+    ",,,-1,,,abc,-5,\n"
+    "C,1,2,xyz,EUR,,,,Café Row\n"
+    "D,,,,,PROP,,,\n"
+).encode()
+
+
+def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def test_streaming_matches_batch_artifact():
+    mapping = {}
+    summary, _, artifact, checksum = validate_rows(read_csv_bytes(CSV_BYTES), mapping)
+    for chunk_size in (1, 7, 64, len(CSV_BYTES)):
+        out = bytearray()
+        stream_summary, stream_checksum = validate_rows_streaming(
+            iter_csv_rows(_chunks(CSV_BYTES, chunk_size)), mapping, out.extend
+        )
+        assert bytes(out) == artifact
+        assert stream_checksum == checksum
+        assert stream_summary == summary
+
+
+def test_streaming_with_mapping_and_progress():
+    mapping = {"external_location_id": "external_location_id", "tiv": "tiv", "lob": "lob"}
+    summary, _, artifact, checksum = validate_rows(read_csv_bytes(CSV_BYTES), mapping)
+    seen = []
+    out = bytearray()
+    stream_summary, stream_checksum = validate_rows_streaming(
+        iter_csv_rows(_chunks(CSV_BYTES, 5)), mapping, out.extend, on_progress=seen.append, progress_every=2
+    )
+    assert bytes(out) == artifact
+    assert stream_checksum == checksum
+    assert stream_summary["total_rows"] == 4
+    assert seen == [2, 4]
+
+
+def test_streaming_empty_file():
+    out = bytearray()
+    summary, checksum = validate_rows_streaming(iter_csv_rows(iter([b"external_location_id\n"])), {}, out.extend)
+    assert bytes(out) == b"[]"
+    assert summary["total_rows"] == 0
+    assert checksum == validate_rows([], {})[3]
+
+
+def test_iter_text_lines_splits_multibyte_chars_across_chunks():
+    data = "a,é\nb,€".encode()
+    lines = list(iter_text_lines(_chunks(data, 1)))
+    assert lines == ["a,é\n", "b,€"]
+
+
+class FakeS3Client:
+    def __init__(self):
+        self.parts = []
+        self.completed = None
+        self.aborted = False
+
+    def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "up-1"}
+
+    def upload_part(self, **kwargs):
+        self.parts.append(kwargs["Body"])
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.completed = kwargs["MultipartUpload"]["Parts"]
+
+    def abort_multipart_upload(self, **kwargs):
+        self.aborted = True
+
+
+def test_multipart_writer_flushes_fixed_size_parts():
+    client = FakeS3Client()
+    part_size = 5 * 1024 * 1024
+    with MultipartUploadWriter("k", part_size=part_size, client=client) as writer:
+        writer.write(b"x" * (part_size + 10))
+        writer.write(b"y" * 5)
+    assert [len(p) for p in client.parts] == [part_size, 15]
+    assert [p["PartNumber"] for p in client.completed] == [1, 2]
+    assert writer.uri.endswith("/k")
+
+
+def test_multipart_writer_aborts_on_error():
+    client = FakeS3Client()
+    try:
+        with MultipartUploadWriter("k", client=client) as writer:
+            writer.write(b"data")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert client.aborted
+    assert client.completed is None
+
+
+def test_upload_stream_hashes_while_uploading_parts():
+    client = FakeS3Client()
+    part_size = 5 * 1024 * 1024
+    data = b"abc" * (part_size // 2)
+    uri, checksum, size = upload_stream("k", io.BytesIO(data), part_size=part_size, client=client)
+    assert checksum == hashlib.sha256(data).hexdigest()
+    assert size == len(data)
+    assert b"".join(client.parts) == data
+    assert [len(p) for p in client.parts] == [part_size, len(data) - part_size]
+    assert uri.endswith("/k")